@@ -1,5 +1,7 @@
+from contextlib import asynccontextmanager
+from time import perf_counter
+
 import uvicorn
-from azure.monitor.opentelemetry import configure_azure_monitor
 from fastapi import APIRouter, FastAPI, Security
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
@@ -10,13 +12,23 @@ from starlette.responses import RedirectResponse
 
 from config import config
 from features.jobs import jobs
-from job_handler_plugins.azure_container_instances import (
+from middleware.store_headers import StoreHeadersMiddleware
+from restful.responses import responses
+from services.azure_errors import (
     AzureHandlerAuthError,
     AzureHandlerConfigError,
     AzureHandlerProvisionError,
 )
-from middleware.store_headers import StoreHeadersMiddleware
-from restful.responses import responses
+from services.job_handler_registry import job_handler_registry
+from services.job_queue import get_job_queue
+from services.job_scheduler import stop_scheduler
+from services.job_service import (
+    load_cron_jobs,
+    migrate_job_store,
+    schedule_job_reconciliation,
+    schedule_job_status_refresh,
+    schedule_job_store_compaction,
+)
 from utils.exception_handlers import (
     azure_auth_exception_handler,
     azure_config_exception_handler,
@@ -34,6 +46,29 @@ def auth_with_jwt(jwt_token: str = Security(oauth2_scheme)):
     pass
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    started = perf_counter()
+    if config.JOB_QUEUE:
+        get_job_queue()  # Refuses a job store that is not shared with the workers
+    migrate_job_store()
+    job_handler_registry.load()
+    load_cron_jobs()
+    schedule_job_store_compaction()
+    schedule_job_reconciliation()
+    schedule_job_status_refresh()
+    if config.AZURE_JOB_SUBSCRIPTION:
+        # The Azure job handler is only imported at startup if Azure jobs are configured
+        from job_handler_plugins.azure_container_instances import (
+            schedule_container_group_maintenance,
+        )
+
+        schedule_container_group_maintenance()
+    logger.info(f"Job API startup completed in {perf_counter() - started:.2f} seconds")
+    yield
+    stop_scheduler()
+
+
 def create_app():
     all_routes = APIRouter(tags=["DMJobs"])
     authenticated_routes = APIRouter()
@@ -44,6 +79,7 @@ def create_app():
         responses=responses,
         version="1.7.0",  # x-release-please-version
         description="REST API used with the Data Modelling framework to schedule jobs",
+        lifespan=lifespan,
         exception_handlers={
             RequestValidationError: validation_exception_handler,
             AzureHandlerConfigError: azure_config_exception_handler,
@@ -75,6 +111,9 @@ def create_app():
     app.include_router(all_routes)
 
     if config.APPINSIGHTS_BE_CONNECTION_STRING:
+        # Imported here, as it is slow to import and only used when telemetry is enabled
+        from azure.monitor.opentelemetry import configure_azure_monitor
+
         configure_azure_monitor(connection_string=config.APPINSIGHTS_BE_CONNECTION_STRING, logger_name="API")
         FastAPIInstrumentor.instrument_app(app)
 
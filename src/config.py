@@ -1,3 +1,4 @@
+import json
 import os
 
 
@@ -14,6 +15,33 @@ class Config:
     # Where to run jobs in Azure
     AZURE_JOB_SUBSCRIPTION = os.getenv("AZURE_JOB_SUBSCRIPTION")
     AZURE_JOB_RESOURCE_GROUP = os.getenv("AZURE_JOB_RESOURCE_GROUP", "common")
+    # How many of the last lines of a container's log to download when polling a job whose log has been downloaded
+    # before. Set to 0 to always download the whole log
+    AZURE_LOG_TAIL_LINES = int(os.getenv("AZURE_LOG_TAIL_LINES", 1000))
+    # The listing of container groups has the state of their provisioning, but not of their containers. Refreshing
+    # the status of Azure jobs gets at most this many container groups with the state of their containers
+    AZURE_REFRESH_MAX_REQUESTS = int(os.getenv("AZURE_REFRESH_MAX_REQUESTS", 50))
+    # Container groups to keep provisioned ahead of jobs, as a JSON list of pools like
+    # {"image": "<registry>/<image>:<version>", "cpu": 2, "memory": 2, "size": 1}. A job with the same image and
+    # compute resources is started in a warm container group, which saves provisioning it and pulling the image
+    # The pools are kept by each process that starts jobs: the scheduler's leader, or the workers if jobs are queued
+    AZURE_WARM_POOL = json.loads(os.getenv("AZURE_WARM_POOL", "[]"))
+    # How long a warm container group waits for a job before it exits and is replaced
+    AZURE_WARM_POOL_IDLE_SECONDS = int(os.getenv("AZURE_WARM_POOL_IDLE_SECONDS", 3600))
+    AZURE_WARM_POOL_REFILL_SECONDS = int(os.getenv("AZURE_WARM_POOL_REFILL_SECONDS", 30))
+    # Up to AZURE_JOB_BATCH_SIZE Azure jobs with the same image, started within AZURE_JOB_BATCH_WAIT_SECONDS, are
+    # run as separate containers in one container group, within the resource limits of a group. 1 disables it
+    AZURE_JOB_BATCH_SIZE = int(os.getenv("AZURE_JOB_BATCH_SIZE", 1))
+    AZURE_JOB_BATCH_WAIT_SECONDS = float(os.getenv("AZURE_JOB_BATCH_WAIT_SECONDS", 2))
+    # Return from starting an Omnia classic Azure job once its ARM deployment is submitted, instead of when it is done
+    OMNIA_CLASSIC_ASYNC_DEPLOY = os.getenv("OMNIA_CLASSIC_ASYNC_DEPLOY", "False").lower() == "true"
+    # Container groups of jobs are deleted in the background, at most AZURE_REAPER_MAX_WORKERS at a time.
+    # The ones of jobs that are never removed are deleted AZURE_CONTAINER_GROUP_RETENTION_SECONDS after all their
+    # containers have ended, so the logs can be read until then. They are swept by the scheduler's leader
+    AZURE_REAPER_MAX_WORKERS = int(os.getenv("AZURE_REAPER_MAX_WORKERS", 8))
+    AZURE_REAPER_INTERVAL_SECONDS = int(os.getenv("AZURE_REAPER_INTERVAL_SECONDS", 10))
+    AZURE_REAPER_SWEEP_SECONDS = int(os.getenv("AZURE_REAPER_SWEEP_SECONDS", 300))
+    AZURE_CONTAINER_GROUP_RETENTION_SECONDS = int(os.getenv("AZURE_CONTAINER_GROUP_RETENTION_SECONDS", 3600))
 
     IMAGE_REGISTRY_USERNAME = os.getenv("IMAGE_REGISTRY_USERNAME")
     IMAGE_REGISTRY_PASSWORD = os.getenv("IMAGE_REGISTRY_PASSWORD")
@@ -28,11 +56,79 @@ class Config:
         os.getenv("SCHEDULER_ENVS_TO_EXPORT", "").split(",") if os.getenv("SCHEDULER_ENVS_TO_EXPORT") else []
     )
 
+    # The job handlers to enable, by the name of their folder (e.g. "radix,local_shell"), or entry point.
+    # All are enabled if not set. Jobs of other types can not be run.
+    ENABLED_JOB_HANDLERS = (
+        os.getenv("ENABLED_JOB_HANDLERS", "").split(",") if os.getenv("ENABLED_JOB_HANDLERS") else []
+    )
+
+    # How many job handlers to keep for reuse when polling the progress of jobs, per process
+    JOB_HANDLER_CACHE_SIZE = int(os.getenv("JOB_HANDLER_CACHE_SIZE", 1000))
+
+    # Threads running scheduled jobs, like the start of jobs and cron jobs
+    SCHEDULER_MAX_WORKERS = int(os.getenv("SCHEDULER_MAX_WORKERS", 10))
+    # Separate thread pools for starting the jobs of some runner types, so a slow backend can not hold up the others,
+    # as a JSON object of runner type or handler folder name -> the max number of jobs starting at the same time.
+    # E.g. {"azure_container_instances": 4}. Jobs of other runner types are started by the SCHEDULER_MAX_WORKERS
+    # threads
+    SCHEDULER_RUNNER_EXECUTORS = json.loads(os.getenv("SCHEDULER_RUNNER_EXECUTORS", "{}"))
+
+    # With the job store in Redis, one process out of all the replicas of the API is elected to run the scheduled
+    # jobs, by holding a lease in Redis. Another process takes over within the lease after the leader stops.
+    SCHEDULER_LEADER_LEASE_SECONDS = int(os.getenv("SCHEDULER_LEADER_LEASE_SECONDS", 10))
+    # How often the lease is renewed, and how often the leader looks for jobs added by the other processes
+    SCHEDULER_LEADER_RENEW_SECONDS = int(os.getenv("SCHEDULER_LEADER_RENEW_SECONDS", 1))
+
+    # Start jobs in worker processes (python worker.py) reading a queue in Redis, instead of in the threads of the
+    # API processes. Requires the redis job store
+    JOB_QUEUE = os.getenv("JOB_QUEUE", "False").lower() == "true"
+    # Jobs each worker process starts at the same time
+    JOB_QUEUE_WORKER_THREADS = int(os.getenv("JOB_QUEUE_WORKER_THREADS", 4))
+    # How many times a worker tries to start a job, when starting it fails for other reasons than the job itself
+    JOB_QUEUE_MAX_ATTEMPTS = int(os.getenv("JOB_QUEUE_MAX_ATTEMPTS", 3))
+    # A job taken by a worker that stopped is retried by another worker once it has been idle for this long.
+    # A worker keeps the job it is starting every third of this time, so slow starts are not retried.
+    JOB_QUEUE_CLAIM_IDLE_SECONDS = int(os.getenv("JOB_QUEUE_CLAIM_IDLE_SECONDS", 300))
+
     # Redis stuff
     SCHEDULER_REDIS_PASSWORD = os.getenv("SCHEDULER_REDIS_PASSWORD")
     SCHEDULER_REDIS_HOST = os.getenv("SCHEDULER_REDIS_HOST", "job-store")
     SCHEDULER_REDIS_PORT = int(os.getenv("SCHEDULER_REDIS_PORT", 6379))
     SCHEDULER_REDIS_SSL = os.getenv("SCHEDULER_REDIS_SSL", "False").lower() == "true"
+    # Connections are pooled per process and Redis database
+    SCHEDULER_REDIS_MAX_CONNECTIONS = int(os.getenv("SCHEDULER_REDIS_MAX_CONNECTIONS", 50))
+    SCHEDULER_REDIS_POOL_TIMEOUT = int(os.getenv("SCHEDULER_REDIS_POOL_TIMEOUT", 5))
+    SCHEDULER_REDIS_HEALTH_CHECK_INTERVAL = int(os.getenv("SCHEDULER_REDIS_HEALTH_CHECK_INTERVAL", 30))
+
+    # Where jobs are stored: redis, or memory for single node deployments and tests.
+    # Jobs, and the scheduled runs of jobs, in memory are lost when the process stops.
+    JOB_STORE_BACKEND = os.getenv("JOB_STORE_BACKEND", "redis")
+    # How the fields of jobs are encoded in the job store: json, orjson or msgpack.
+    # Jobs written with any of them can be read, so the codec can be changed at any time.
+    JOB_STORE_CODEC = os.getenv("JOB_STORE_CODEC", "json")
+    # In-process cache of jobs read from the job store. Set JOB_CACHE_SIZE to 0 to disable it.
+    # Jobs with longer logs than JOB_CACHE_MAX_LOG_LINES are not cached.
+    JOB_CACHE_SIZE = int(os.getenv("JOB_CACHE_SIZE", 1000))
+    JOB_CACHE_TTL_SECONDS = float(os.getenv("JOB_CACHE_TTL_SECONDS", 30))
+    JOB_CACHE_MAX_LOG_LINES = int(os.getenv("JOB_CACHE_MAX_LOG_LINES", 5000))
+    # Retention of finished (completed or failed) jobs in the job store. Set to 0 to keep finished jobs.
+    # The final state of a job is kept in its job entity in DMSS.
+    JOB_RETENTION_SECONDS = int(os.getenv("JOB_RETENTION_SECONDS", 30 * 24 * 60 * 60))
+    JOB_RETENTION_MAX_JOBS = int(os.getenv("JOB_RETENTION_MAX_JOBS", 0))
+    # How often expired jobs are removed from the job store. Set to 0 to disable
+    JOB_COMPACTION_INTERVAL_SECONDS = int(os.getenv("JOB_COMPACTION_INTERVAL_SECONDS", 600))
+    # How often started jobs that are still starting are polled, so they move on to running or failed.
+    # Set to 0 to disable
+    JOB_RECONCILE_INTERVAL_SECONDS = int(os.getenv("JOB_RECONCILE_INTERVAL_SECONDS", 15))
+    # Jobs that are still starting this long after they were handed to their job handler are failed and removed,
+    # for the job handlers with a start timeout, like the Azure Container Instances handler
+    JOB_START_TIMEOUT_SECONDS = int(os.getenv("JOB_START_TIMEOUT_SECONDS", 600))
+    # How often the status of active jobs is refreshed, for job handlers that can get the status of many jobs
+    # in one call. Set to 0 to disable
+    JOB_REFRESH_INTERVAL_SECONDS = int(os.getenv("JOB_REFRESH_INTERVAL_SECONDS", 30))
+    # Bulk job status
+    BULK_STATUS_MAX_JOBS = int(os.getenv("BULK_STATUS_MAX_JOBS", 500))
+    BULK_STATUS_MAX_WORKERS = int(os.getenv("BULK_STATUS_MAX_WORKERS", 16))
 
     # Swagger auth
     OAUTH_CLIENT_ID: str | None = os.getenv("OAUTH_CLIENT_ID")
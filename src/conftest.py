@@ -3,7 +3,8 @@ import json
 import pytest
 
 from services.dmss import dmss_api
-from services.job_service import get_job_store
+from services.job_cache import get_job_cache
+from services.job_store import get_job_store
 
 
 def pytest_addoption(parser):
@@ -17,8 +18,9 @@ def pytest_runtest_setup(item):
 
 @pytest.fixture(scope="class", autouse=True)
 def nuke_job_store():
-    redis = get_job_store()
-    redis.flushdb()
+    get_job_store().flush()
+    if job_cache := get_job_cache():
+        job_cache.clear()
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -1,14 +1,21 @@
+from datetime import datetime
 from uuid import UUID
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 from starlette.responses import JSONResponse
 
 from domain_classes.progress import Progress
+from features.jobs.use_cases.bulk_status_job import (
+    BulkStatusJobRequest,
+    BulkStatusJobResponse,
+    bulk_status_job_use_case,
+)
 from features.jobs.use_cases.delete_job import DeleteJobResponse, delete_job_use_case
 from features.jobs.use_cases.get_result_job import (
     GetJobResultResponse,
     get_job_result_use_case,
 )
+from features.jobs.use_cases.list_jobs import ListJobsResponse, list_jobs_use_case
 from features.jobs.use_cases.start_job import StartJobResponse, start_job_use_case
 from features.jobs.use_cases.status_job import StatusJobResponse, status_job_use_case
 from features.jobs.use_cases.update_job_progress import (
@@ -16,10 +23,59 @@ from features.jobs.use_cases.update_job_progress import (
     update_job_progress_use_case,
 )
 from restful.responses import create_response
+from services.job_handler_interface import JobStatus
 
 router = APIRouter()
 
 
+# Must be added before the 'start_job' route, which matches any path
+@router.post("/jobs/status", operation_id="bulk_job_status", response_model=BulkStatusJobResponse)
+@create_response(JSONResponse)
+def bulk_status(request: BulkStatusJobRequest, tail: int = Query(default=0, ge=0)):
+    """Get the status for several existing jobs.
+
+    Each job in the response has either a status or an error, so one failing job does not fail the whole request.
+
+    - **job_uids**: the job API's internal uids for the jobs.
+    - **tail**: number of log lines to return for each job, counted from the end of the log.
+    """
+    return bulk_status_job_use_case(job_uids=request.job_uids, tail=tail).model_dump(mode="json")
+
+
+# Must be added before the 'job_status' route, which matches any job uid
+@router.get("/jobs", operation_id="list_jobs", response_model=ListJobsResponse)
+@create_response(JSONResponse)
+def list_jobs(
+    status: JobStatus | None = None,
+    runner_type: str | None = None,
+    data_source: str | None = None,
+    started_after: datetime | None = None,
+    started_before: datetime | None = None,
+    cursor: str | None = None,
+    limit: int = Query(default=50, ge=1, le=500),
+):
+    """List registered jobs, most recently started first.
+
+    All given filters must match. The response includes a cursor for the next page, which is null on the last page.
+
+    - **status**: only jobs with this status.
+    - **runner_type**: only jobs with a runner of this type.
+    - **data_source**: only jobs whose job entity is stored in this data source.
+    - **started_after**, **started_before**: only jobs started within this time range.
+    - **cursor**: the 'next_cursor' of the previous page.
+    - **limit**: maximum number of jobs in the page.
+    """
+    return list_jobs_use_case(
+        status=status,
+        runner_type=runner_type,
+        data_source=data_source,
+        started_after=started_after,
+        started_before=started_before,
+        cursor=cursor,
+        limit=limit,
+    ).model_dump(mode="json")
+
+
 @router.post("/{job_dmss_id:path}", operation_id="start_job", response_model=StartJobResponse)
 @create_response(JSONResponse)
 def start(job_dmss_id: str):
@@ -40,33 +96,44 @@ def start(job_dmss_id: str):
 
 @router.get("/{job_uid}", operation_id="job_status", response_model=StatusJobResponse)
 @create_response(JSONResponse)
-def status(job_uid: UUID):
+async def status(
+    job_uid: UUID,
+    offset: int = Query(default=0, ge=0),
+    limit: int | None = Query(default=None, ge=1),
+    tail: int | None = Query(default=None, ge=1),
+):
     """Get the status for an existing job.
 
+    The response includes the index of the first returned log line ('log_offset') and the total number of
+    log lines ('log_length'). Use 'log_length' as the next 'offset' to only fetch new log lines.
+
     - **job_uid**: the job API's internal uid for the job.
+    - **offset**: index of the first log line to return.
+    - **limit**: maximum number of log lines to return.
+    - **tail**: return only the last 'tail' log lines. Takes precedence over 'offset' and 'limit'.
     """
-    return status_job_use_case(job_id=job_uid).model_dump()
+    return (await status_job_use_case(job_id=job_uid, offset=offset, limit=limit, tail=tail)).model_dump()
 
 
 @router.delete("/{job_uid}", operation_id="remove_job", response_model=DeleteJobResponse)
 @create_response(JSONResponse)
-def remove(job_uid: UUID):
+async def remove(job_uid: UUID):
     """Remove an existing job by calling the remove() function in the job handler for a given job.
     The job will then be deleted from the redis database used for storing jobs.
 
     - **job_uid**: the job API's internal uid for the job.
     """
-    return delete_job_use_case(job_id=job_uid).model_dump()
+    return (await delete_job_use_case(job_id=job_uid)).model_dump()
 
 
 @router.get("/{job_uid}/result", operation_id="job_result", response_model=GetJobResultResponse)
 @create_response(JSONResponse)
-def result(job_uid: UUID):
+async def result(job_uid: UUID):
     """Get the results from a completed job, by calling the result() function in the job handler for a given job.
 
     - **job_uid**: the job API's internal uid for the job.
     """
-    return get_job_result_use_case(job_uid=job_uid).model_dump()
+    return (await get_job_result_use_case(job_uid=job_uid)).model_dump()
 
 
 @router.put("/{job_uid}", operation_id="update_job_progress", response_model=UpdateJobProgressResponse)
@@ -0,0 +1,62 @@
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, Field
+from requests import HTTPError
+
+from config import config
+from restful.exceptions import ApplicationException
+from restful.responses import ErrorResponse
+from services.job_handler_interface import JobStatus
+from services.job_service import status_jobs
+
+
+class BulkStatusJobRequest(BaseModel):
+    job_uids: list[UUID] = Field(max_length=config.BULK_STATUS_MAX_JOBS)
+
+
+class BulkJobStatus(BaseModel):
+    model_config = ConfigDict(use_enum_values=True)
+
+    uid: UUID
+    status: JobStatus | None = None
+    log: list[str] | None = None
+    percentage: float | None = None
+    log_offset: int = 0
+    log_length: int = 0
+    error: ErrorResponse | None = None
+
+
+class BulkStatusJobResponse(BaseModel):
+    jobs: list[BulkJobStatus]
+
+
+def _error_response(error: Exception) -> ErrorResponse:
+    if isinstance(error, ApplicationException):
+        return ErrorResponse(**error.dict())
+    if isinstance(error, HTTPError) and error.response is not None:
+        return ErrorResponse(
+            status=error.response.status_code,
+            message=error.response.text,
+            debug=f"The HTTP call to '{error.response.url}' failed",
+        )
+    return ErrorResponse(type=type(error).__name__, debug=str(error))
+
+
+def bulk_status_job_use_case(job_uids: list[UUID], tail: int = 0) -> BulkStatusJobResponse:
+    jobs = []
+    for job_uid, result in status_jobs(job_uids, tail).items():
+        if isinstance(result, Exception):
+            jobs.append(BulkJobStatus(uid=job_uid, error=_error_response(result)))
+            continue
+        status, log, percentage, log_offset, log_length = result
+        jobs.append(
+            BulkJobStatus(
+                uid=job_uid,
+                status=status,
+                log=log,
+                percentage=percentage,
+                log_offset=log_offset,
+                log_length=log_length,
+            )
+        )
+    return BulkStatusJobResponse(jobs=jobs)
@@ -3,7 +3,7 @@ from uuid import UUID
 from pydantic import BaseModel
 
 from services.job_handler_interface import JobStatus
-from services.job_service import remove_job
+from services.job_service import remove_job_async
 
 
 class DeleteJobResponse(BaseModel):
@@ -11,6 +11,6 @@ class DeleteJobResponse(BaseModel):
     response: str
 
 
-def delete_job_use_case(job_id: UUID) -> DeleteJobResponse:
-    status, res = remove_job(job_id)
+async def delete_job_use_case(job_id: UUID) -> DeleteJobResponse:
+    status, res = await remove_job_async(job_id)
     return DeleteJobResponse(status=status, response=res)
@@ -2,7 +2,7 @@ from uuid import UUID
 
 from pydantic import BaseModel
 
-from services.job_service import get_job_result
+from services.job_service import get_job_result_async
 
 
 class GetJobResultResponse(BaseModel):
@@ -10,6 +10,6 @@ class GetJobResultResponse(BaseModel):
     result: str
 
 
-def get_job_result_use_case(job_uid: UUID) -> GetJobResultResponse:
-    message, bytesvalue = get_job_result(job_uid)
+async def get_job_result_use_case(job_uid: UUID) -> GetJobResultResponse:
+    message, bytesvalue = await get_job_result_async(job_uid)
     return GetJobResultResponse(message=message, result=bytesvalue)
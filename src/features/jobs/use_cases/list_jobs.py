@@ -0,0 +1,57 @@
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+from services.job_handler_interface import JobStatus
+from services.job_service import list_jobs
+
+
+class JobSummary(BaseModel):
+    model_config = ConfigDict(use_enum_values=True)
+
+    uid: UUID
+    dmss_id: str
+    name: str | None = None
+    label: str | None = None
+    type: str
+    status: JobStatus
+    runner_type: str | None = None
+    started: datetime | None = None
+    ended: datetime | None = None
+    percentage: float | None = None
+
+
+class ListJobsResponse(BaseModel):
+    jobs: list[JobSummary]
+    next_cursor: str | None = None
+
+
+def list_jobs_use_case(
+    status: JobStatus | None = None,
+    runner_type: str | None = None,
+    data_source: str | None = None,
+    started_after: datetime | None = None,
+    started_before: datetime | None = None,
+    cursor: str | None = None,
+    limit: int = 50,
+) -> ListJobsResponse:
+    jobs, next_cursor = list_jobs(status, runner_type, data_source, started_after, started_before, cursor, limit)
+    return ListJobsResponse(
+        jobs=[
+            JobSummary(
+                uid=job["job_uid"],
+                dmss_id=job["dmss_id"],
+                name=job.get("name"),
+                label=job.get("label"),
+                type=job["type"],
+                status=job["status"],
+                runner_type=(job.get("runner") or {}).get("type"),
+                started=job.get("started"),
+                ended=job.get("ended"),
+                percentage=job.get("percentage"),
+            )
+            for job in jobs
+        ],
+        next_cursor=next_cursor,
+    )
@@ -3,7 +3,7 @@ from uuid import UUID
 from pydantic import BaseModel, ConfigDict
 
 from services.job_handler_interface import JobStatus
-from services.job_service import status_job
+from services.job_service import status_job_async
 
 
 class StatusJobResponse(BaseModel):
@@ -12,8 +12,14 @@ class StatusJobResponse(BaseModel):
     status: JobStatus
     log: list[str] | None
     percentage: float | None
+    log_offset: int = 0
+    log_length: int = 0
 
 
-def status_job_use_case(job_id: UUID) -> StatusJobResponse:
-    status, log, percentage = status_job(job_id)
-    return StatusJobResponse(status=status, log=log, percentage=percentage)
+async def status_job_use_case(
+    job_id: UUID, offset: int = 0, limit: int | None = None, tail: int | None = None
+) -> StatusJobResponse:
+    status, log, percentage, log_offset, log_length = await status_job_async(job_id, offset, limit, tail)
+    return StatusJobResponse(
+        status=status, log=log, percentage=percentage, log_offset=log_offset, log_length=log_length
+    )
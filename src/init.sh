@@ -30,6 +30,9 @@ if [ "$1" = 'api' ]; then
   service_is_ready
   cat version.txt || true
   python ./app.py run
+elif [ "$1" = 'worker' ]; then
+  service_is_ready
+  python ./worker.py
 else
   exec "$@"
 fi
@@ -1,9 +1,11 @@
 import logging
 import os
+import socket
+import threading
 import uuid
 from collections import namedtuple
-from time import sleep
-from typing import Tuple
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Hashable, Tuple
 
 from azure.core.exceptions import (
     ClientAuthenticationError,
@@ -22,10 +24,26 @@ from azure.mgmt.containerinstance.models import (
     ResourceRequests,
     ResourceRequirements,
 )
+from opentelemetry import metrics
 
 from config import config
+from job_handler_plugins.azure_container_instances.batching import BATCH_TAG, JobBatcher
+from job_handler_plugins.azure_container_instances.warm_pool import (
+    WARM_POOL_CREATED_TAG,
+    WARM_POOL_OWNER_TAG,
+    WARM_POOL_TAG,
+    WarmPool,
+    pool_key,
+)
 from restful.exceptions import NotFoundException
-from services.job_handler_interface import JobHandlerInterface, JobStatus
+from services.azure_errors import (  # noqa: F401 - imported from here by older code
+    AzureHandlerAuthError,
+    AzureHandlerConfigError,
+    AzureHandlerProvisionError,
+)
+from services.azure_reaper import get_container_group_reaper
+from services.job_handler_interface import Job, JobHandlerInterface, JobStatus
+from services.job_scheduler import leader_only, scheduler, starts_jobs
 from utils.logging import logger
 
 AccessToken = namedtuple("AccessToken", ["token", "expires_on"])
@@ -33,6 +51,31 @@ logging.getLogger("azure").setLevel(logging.WARNING)
 
 _SUPPORTED_TYPE = "dmss://WorkflowDS/Blueprints/AzureContainer"
 
+# Tag with the job uid on the container groups of single jobs
+JOB_TAG = "dm-job-uid"
+
+# ACI Norway East limits (per container group, at time of writing):
+#   CPU:    0.5 .. 4.0 cores
+#   Memory: 0.5 .. 16.0 GB
+# See: https://learn.microsoft.com/en-us/azure/container-instances/container-instances-region-availability
+_CPU_MIN, _CPU_MAX = 0.5, 4.0
+_MEM_MIN, _MEM_MAX = 0.5, 16.0
+
+_meter = metrics.get_meter(__name__)
+# Size of the container logs downloaded from Azure, per download
+_log_bytes = _meter.create_histogram(
+    "aci.container_log.fetched", unit="By", description="Bytes of container log fetched per poll"
+)
+# Jobs started with the image and size of a warm pool, by whether a warm container group was claimed ("hit")
+_warm_pool_requests = _meter.create_counter(
+    "aci.warm_pool.requests", description="Jobs started with the image and size of a warm pool"
+)
+# Time from requesting the container group of a job until it runs the job. Comparing the jobs started in
+# warm container groups ("warm_pool") with the others gives the time saved by the warm pools.
+_provisioning_time = _meter.create_histogram(
+    "aci.container_group.provisioning", unit="s", description="Time until the container group of a job ran it"
+)
+
 # Settings that must be present on job-api for this handler to run.
 # Only enforced when an AzureContainer job is actually submitted, so deployments
 # that use other backends (Radix, LocalContainer, ...) do not need Azure secrets.
@@ -47,34 +90,6 @@ _REQUIRED_CONFIG = (
 )
 
 
-class AzureHandlerConfigError(RuntimeError):
-    """Missing or invalid Azure configuration.
-
-    Only raised when an AzureContainer job is actually acted on. Other job
-    handlers are unaffected, so a deployment that never uses this backend can
-    run without any Azure secrets being set.
-    """
-
-
-class AzureHandlerAuthError(RuntimeError):
-    """Azure credentials are present but rejected by AAD (expired secret, etc.)."""
-
-
-class AzureHandlerProvisionError(RuntimeError):
-    """ARM rejected the container-group create/update call.
-
-    Covers quota exhaustion, invalid image references, region capacity,
-    name collisions, and other non-auth ARM failures. Carries the ARM
-    status code and error code so the FastAPI boundary can render a
-    meaningful upstream response.
-    """
-
-    def __init__(self, message: str, status_code: int | None = None, error_code: str | None = None):
-        super().__init__(message)
-        self.status_code = status_code
-        self.error_code = error_code
-
-
 def _check_required_config() -> None:
     missing = [name for name in _REQUIRED_CONFIG if not getattr(config, name, None)]
     if missing:
@@ -106,6 +121,302 @@ def _check_required_config() -> None:
         )
 
 
+def _container_name(job: Job) -> str:
+    """The name of the job's container group. Unless the group runs several jobs, it is also the name of the
+    job's container.
+    """
+    if container_group := (job.state or {}).get("container_group"):  # Started in a warm or a shared group
+        return str(container_group)
+    return str(job.runner["name"]).lower().replace(".", "-").replace("_", "-")  # type: ignore[index]
+
+
+def _in_shared_group(job: Job) -> bool:
+    """Whether the job's container group also runs the containers of other jobs."""
+    state = job.state or {}
+    return "container" in state and "warm_pool" not in state
+
+
+def _not_ready(error: HttpResponseError) -> bool:
+    return "ContainerGroupDeploymentNotReady" in str(error) or "not ready" in str(error).lower()
+
+
+def _container_status(status: str | None, exit_code: int | None) -> JobStatus | None:
+    """The status of a job from the state of its container, or None if the state is not mapped."""
+    # Flake8 does not have support for match case syntax. Using noqa to disable warnings.
+    match (status, exit_code):  # noqa
+        case ("Running", None):  # noqa
+            return JobStatus.RUNNING
+        case ("Terminated", 0):  # noqa
+            return JobStatus.COMPLETED
+        case ("Terminated", exit_code) if exit_code is not None and exit_code != 0:  # noqa
+            # Includes negative exit codes (SIGKILL, OOM = -9, SIGSEGV = -11, ...)
+            return JobStatus.FAILED
+        case ("Waiting", None):  # noqa
+            return JobStatus.STARTING
+        case ("Succeeded", _):  # noqa - ACI provisioning succeeded, container not yet Running
+            return JobStatus.STARTING
+        case ("Pending", _):  # noqa
+            return JobStatus.STARTING
+        case ("Failed", _) | ("Canceled", _):  # noqa - ACI-side failures (image pull, quota, ...)
+            return JobStatus.FAILED
+    return None
+
+
+def _group_status(container_group: ContainerGroup) -> JobStatus | None:
+    """The status of a job from the state of its container group, or None if it is not known."""
+    match container_group.provisioning_state:  # noqa
+        case "Failed":  # noqa
+            return JobStatus.FAILED
+        case "Pending" | "Creating":  # noqa - the containers have not been created yet
+            return JobStatus.STARTING
+    match getattr(container_group.instance_view, "state", None):  # noqa
+        case "Running":  # noqa
+            return JobStatus.RUNNING
+        case "Succeeded":  # noqa - all containers exited with code 0
+            return JobStatus.COMPLETED
+        case "Failed":  # noqa
+            return JobStatus.FAILED
+        case "Pending":  # noqa
+            return JobStatus.STARTING
+    return None
+
+
+def _recently_refreshed(job: Job) -> bool:
+    """Whether the stored status of a job was got by JobHandler.refresh() recently, in any process."""
+    if not job.refreshed:
+        return False
+    refreshed = job.refreshed.replace(tzinfo=job.refreshed.tzinfo or timezone.utc)
+    age: timedelta = datetime.now(timezone.utc) - refreshed
+    return age < timedelta(seconds=2 * config.JOB_REFRESH_INTERVAL_SECONDS)
+
+
+# The warm pools of this process by pool key
+_warm_pools = {
+    pool.key: pool
+    for pool in (WarmPool(**spec, idle_seconds=config.AZURE_WARM_POOL_IDLE_SECONDS) for spec in config.AZURE_WARM_POOL)
+}
+
+
+def _container_group(containers: list[Container], registry: str, tags: dict[str, str] | None = None) -> ContainerGroup:
+    return ContainerGroup(
+        location="norwayeast",
+        containers=containers,
+        os_type=OperatingSystemTypes.linux,
+        restart_policy=ContainerGroupRestartPolicy.never,
+        image_registry_credentials=[
+            ImageRegistryCredential(
+                server=registry, username=config.IMAGE_REGISTRY_USERNAME, password=config.IMAGE_REGISTRY_PASSWORD
+            )
+        ],
+        tags=tags,
+    )
+
+
+def _get_container_group(client: ContainerInstanceManagementClient, name: str) -> ContainerGroup | None:
+    """Get a container group with the state of its containers, or None if it does not exist."""
+    try:
+        return client.container_groups.get(config.AZURE_JOB_RESOURCE_GROUP, name)
+    except ResourceNotFoundError:
+        return None
+
+
+def _warm_pool_owner() -> str:
+    """The name of this process on the warm container groups it creates. API processes are forked after the
+    import, so it is not kept in a module variable.
+    """
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def _abandoned(tags: dict[str, str], owner: str, now: datetime) -> bool:
+    """Whether a warm container group that this process does not track can no longer be claimed by any process."""
+    if tags.get(WARM_POOL_OWNER_TAG) == owner or WARM_POOL_CREATED_TAG not in tags:
+        return True
+    # The groups of other processes are left to them, until they are too old to be claimed, with a margin for
+    # the claims that are being made
+    age: timedelta = now - datetime.fromisoformat(tags[WARM_POOL_CREATED_TAG])
+    return age > timedelta(seconds=2 * config.AZURE_WARM_POOL_IDLE_SECONDS)
+
+
+def refill_warm_pools() -> None:
+    """Create container groups for the warm pools that are not full, and track the ones being provisioned.
+
+    Called periodically in the background. The warm container groups that no process can claim are deleted,
+    also the ones created by other processes. The pools are only filled in processes that start jobs.
+    """
+    if not starts_jobs():
+        return
+    client = _get_aci_client()
+    warm_groups = {
+        str(group.name): group
+        for group in client.container_groups.list_by_resource_group(config.AZURE_JOB_RESOURCE_GROUP)
+        if group.name and WARM_POOL_TAG in (group.tags or {})
+    }
+    for pool in _warm_pools.values():
+        for name in pool.claimed():
+            if name not in warm_groups:  # The group has been updated with the container of the job
+                pool.discard(name)
+        for name in pool.provisioning() + pool.idle():
+            if name not in warm_groups:  # Groups that are not listed yet are still being created
+                continue
+            if (status := _group_status(warm_groups[name])) is None:
+                # The listing of the container groups does not include the state of their containers
+                group = _get_container_group(client, name)
+                status = _group_status(group) if group else JobStatus.REMOVED
+            if status == JobStatus.RUNNING:
+                pool.ready(name)
+            elif status in (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.REMOVED):
+                pool.discard(name)
+
+    owner = _warm_pool_owner()
+    now = datetime.now(timezone.utc)
+    for name, group in warm_groups.items():
+        if (
+            group.provisioning_state != "Deleting"
+            and not any(pool.tracks(name) for pool in _warm_pools.values())
+            and _abandoned(group.tags or {}, owner, now)
+        ):
+            logger.info(f"Deleting the warm container group '{name}', which is no longer waiting for a job")
+            get_container_group_reaper().delete(client, config.AZURE_JOB_RESOURCE_GROUP, name)
+
+    for pool in _warm_pools.values():
+        try:
+            _fill_warm_pool(client, pool)
+        except HttpResponseError as error:
+            logger.warning(f"Failed to create a warm container group for '{pool.key}': {error}")
+
+
+def _fill_warm_pool(client: ContainerInstanceManagementClient, pool: WarmPool) -> None:
+    tags = {
+        WARM_POOL_TAG: pool.key,
+        WARM_POOL_OWNER_TAG: _warm_pool_owner(),
+        WARM_POOL_CREATED_TAG: datetime.now(timezone.utc).isoformat(),
+    }
+    for _ in range(pool.missing()):
+        name = f"warm-{uuid.uuid4().hex[:16]}"
+        container = Container(
+            name=name,
+            image=pool.image,
+            resources=ResourceRequirements(requests=ResourceRequests(memory_in_gb=pool.memory_in_gb, cpu=pool.cpu)),
+            command=["sleep", str(config.AZURE_WARM_POOL_IDLE_SECONDS)],
+        )
+        group = _container_group([container], pool.image.split("/", 1)[0], tags=tags)
+        client.container_groups.begin_create_or_update(config.AZURE_JOB_RESOURCE_GROUP, name, group, polling=False)
+        pool.add(name)
+
+
+def sweep_ended_container_groups() -> int:
+    """Delete the container groups where every container ended more than AZURE_CONTAINER_GROUP_RETENTION_SECONDS
+    ago, for jobs that were never removed. Returns the number of container groups queued for deletion.
+
+    Only the container groups created by this handler for jobs are deleted. They are deleted by the container
+    group reaper, at most AZURE_REAPER_MAX_WORKERS at a time.
+    """
+    client = _get_aci_client()
+    reaper = get_container_group_reaper()
+    now = datetime.now(timezone.utc)
+    swept = 0
+    for group in client.container_groups.list_by_resource_group(config.AZURE_JOB_RESOURCE_GROUP):
+        if not group.name or not {JOB_TAG, BATCH_TAG} & set(group.tags or {}):
+            continue
+        try:
+            # The listing of the container groups does not include the state of their containers
+            containers = client.container_groups.get(config.AZURE_JOB_RESOURCE_GROUP, group.name).containers
+        except ResourceNotFoundError:
+            continue
+        ended = [time for container in containers if (time := _ended(container))]
+        if (
+            containers
+            and len(ended) == len(containers)
+            and (now - max(ended)).total_seconds() > config.AZURE_CONTAINER_GROUP_RETENTION_SECONDS
+        ):
+            reaper.delete(client, config.AZURE_JOB_RESOURCE_GROUP, group.name)
+            swept += 1
+    if swept:
+        logger.info(f"Deleting {swept} container groups of ended jobs")
+    return swept
+
+
+def schedule_container_group_maintenance() -> None:
+    """Keep the warm pools filled, and delete the container groups of ended jobs, in the background.
+
+    Called once at startup. The container groups of all processes are swept by the scheduler's leader, and the
+    warm pools are filled by the processes that start jobs.
+    """
+    jobs: list[tuple[Callable, str, int]] = [
+        (leader_only(sweep_ended_container_groups), "sweep-container-groups", config.AZURE_REAPER_SWEEP_SECONDS)
+    ]
+    if _warm_pools:
+        jobs.append((refill_warm_pools, "refill-warm-pools", config.AZURE_WARM_POOL_REFILL_SECONDS))
+    for function, job_id, seconds in jobs:
+        scheduler.add_job(
+            function,
+            trigger="interval",
+            seconds=seconds,
+            id=job_id,
+            replace_existing=True,
+            coalesce=True,
+            max_instances=1,
+        )
+
+
+def _new_log_lines(log: list[str], tail: list[str], tail_size: int) -> list[str] | None:
+    """The lines of 'tail', the last lines of a container log, that come after 'log', all the lines of the same
+    log fetched earlier. Returns None if 'tail' does not continue 'log', or if it is ambiguous where it does.
+
+    If the tail is shorter than 'tail_size', it is the whole log, so the new lines start after the lines fetched
+    earlier. Otherwise the tail must overlap the end of the log. When the log repeats lines, it can overlap in
+    several ways, and the number of new lines is unknown.
+    """
+    if len(tail) < tail_size:  # The tail is the whole log
+        return tail[len(log) :] if tail[: len(log)] == log else None
+    overlaps = [
+        length for length in range(1, min(len(tail), len(log)) + 1) if tail[:length] == log[len(log) - length :]
+    ]
+    if len(overlaps) != 1:
+        return None
+    return tail[overlaps[0] :]
+
+
+def _submit_batch(name: str, key: Hashable, containers: list[Container]) -> None:
+    """Create a container group with the containers of several jobs."""
+    registry = str(key[0])  # type: ignore[index]
+    group = _container_group(containers, registry, tags={BATCH_TAG: str(len(containers))})
+    _get_aci_client().container_groups.begin_create_or_update(
+        config.AZURE_JOB_RESOURCE_GROUP, name, group, polling=False
+    )
+
+
+# Collects the containers of jobs with the same image into shared container groups, if AZURE_JOB_BATCH_SIZE > 1
+_job_batcher = JobBatcher(
+    config.AZURE_JOB_BATCH_SIZE, config.AZURE_JOB_BATCH_WAIT_SECONDS, _CPU_MAX, _MEM_MAX, _submit_batch
+)
+
+
+def _find_container(container_group: ContainerGroup, name: str) -> Container:
+    """The container with the given name. Container groups of one job have a single container."""
+    for container in container_group.containers:
+        if container.name == name:
+            return container
+    return container_group.containers[0]
+
+
+def _ended(container: Container) -> datetime | None:
+    """When the container terminated, or None if it has not."""
+    current_state = getattr(container.instance_view, "current_state", None)
+    if getattr(current_state, "state", None) != "Terminated":
+        return None
+    return getattr(current_state, "finish_time", None) or datetime.now(timezone.utc)
+
+
+def _last_event(container: Container) -> str | None:
+    """The message of the last Container Instance event of the job's container, if any."""
+    try:
+        message = container.instance_view.events[-1].message  # type: ignore[union-attr]
+    except (AttributeError, TypeError, IndexError):
+        return None
+    return str(message) if message else None
+
+
 class _JobLoggerAdapter(logging.LoggerAdapter):
     """LoggerAdapter that prepends '[job_uid=<uid>]' to every message.
 
@@ -117,6 +428,31 @@ class _JobLoggerAdapter(logging.LoggerAdapter):
         return f"[job_uid={self.extra['job_uid']}] {msg}", kwargs
 
 
+_aci_client: ContainerInstanceManagementClient | None = None
+_aci_client_lock = threading.Lock()
+
+
+def _get_aci_client() -> ContainerInstanceManagementClient:
+    """Get the ContainerInstanceManagementClient shared by all Azure container jobs.
+
+    The credential caches the AAD token until it expires, so jobs do not fetch a token each.
+    """
+    global _aci_client
+    with _aci_client_lock:
+        if _aci_client is None:
+            _check_required_config()
+            try:
+                credentials = ClientSecretCredential(
+                    client_id=config.AZURE_JOB_SP_CLIENT_ID,
+                    client_secret=config.AZURE_JOB_SP_SECRET,
+                    tenant_id=config.AZURE_JOB_SP_TENANT_ID,
+                )
+            except ValueError as exc:  # e.g. tenant_id not a valid GUID
+                raise AzureHandlerConfigError(f"Invalid Azure credential configuration: {exc}") from exc
+            _aci_client = ContainerInstanceManagementClient(credentials, subscription_id=config.AZURE_JOB_SUBSCRIPTION)
+        return _aci_client
+
+
 # Interface for Azure
 
 
@@ -126,39 +462,74 @@ class JobHandler(JobHandlerInterface):
     Support both executable jobs and job services
     """
 
+    reusable = True
+    # A container group that is not running within the timeout is stuck provisioning
+    start_timeout = True
+
     def __init__(self, job, data_source: str):
         super().__init__(job, data_source)
         # No config access or SDK construction here. This constructor runs
         # whenever the dispatcher touches a job whose runner.type happens to be
         # 'AzureContainer' - including status polls for completed jobs - and
         # would otherwise crash deployments that only use other backends.
-        self.azure_valid_container_name = self.job.runner["name"].lower().replace(".", "-").replace("_", "-")
         self._aci_client: ContainerInstanceManagementClient | None = None
         self._log = _JobLoggerAdapter(logger, {"job_uid": self.job.job_uid})
 
+    @property
+    def azure_valid_container_name(self) -> str:
+        """The name of the job's container group. The handler is reused, so it is derived from the current job."""
+        return _container_name(self.job)
+
+    @property
+    def container_name(self) -> str:
+        """The name of the job's container, which is the name of its container group unless the group is shared."""
+        return str((self.job.state or {}).get("container") or self.azure_valid_container_name)
+
     @property
     def aci_client(self) -> ContainerInstanceManagementClient:
-        """ContainerInstanceManagementClient built on first use.
+        """The shared ContainerInstanceManagementClient, built on first use.
 
         Config validation and credential construction are deferred until an
         Azure operation is actually needed, so a job-api without Azure secrets
         can still service Radix/LocalContainer jobs.
         """
         if self._aci_client is None:
-            _check_required_config()
-            try:
-                credentials = ClientSecretCredential(
-                    client_id=config.AZURE_JOB_SP_CLIENT_ID,
-                    client_secret=config.AZURE_JOB_SP_SECRET,
-                    tenant_id=config.AZURE_JOB_SP_TENANT_ID,
-                )
-            except ValueError as exc:  # e.g. tenant_id not a valid GUID
-                raise AzureHandlerConfigError(f"Invalid Azure credential configuration: {exc}") from exc
-            self._aci_client = ContainerInstanceManagementClient(
-                credentials, subscription_id=config.AZURE_JOB_SUBSCRIPTION
-            )
+            self._aci_client = _get_aci_client()
         return self._aci_client
 
+    @classmethod
+    def refresh(cls, jobs: list[Job]) -> dict[uuid.UUID, JobStatus]:
+        """Get the status of all jobs by listing the container groups in the resource group, in one paginated
+        ARM call instead of one call per job. The statuses are stored with the jobs, so progress() can use them.
+
+        The listing has the state of the provisioning of each group, but not the state of its containers. Those
+        are got for at most AZURE_REFRESH_MAX_REQUESTS groups, of the jobs that were refreshed the longest ago.
+        """
+        client = _get_aci_client()
+        container_groups = {
+            str(group.name): group
+            for group in client.container_groups.list_by_resource_group(config.AZURE_JOB_RESOURCE_GROUP)
+            if group.name
+        }
+        statuses = {}
+        unknown = []
+        for job in jobs:
+            if _in_shared_group(job):  # The state of a shared container group is not the job's
+                continue
+            container_group = container_groups.get(_container_name(job))
+            if not container_group:
+                continue
+            if status := _group_status(container_group):
+                statuses[job.job_uid] = cls(job, job.dmss_id.split("/", 1)[0])._provisioned(status)
+            else:
+                unknown.append(job)
+        unknown.sort(key=lambda job: job.refreshed.timestamp() if job.refreshed else 0.0)
+        for job in unknown[: config.AZURE_REFRESH_MAX_REQUESTS]:
+            container_group = _get_container_group(client, _container_name(job))
+            if container_group and (status := _group_status(container_group)):
+                statuses[job.job_uid] = cls(job, job.dmss_id.split("/", 1)[0])._provisioned(status)
+        return statuses
+
     def teardown_service(self, service_id: str) -> str:
         raise NotImplementedError
 
@@ -210,12 +581,6 @@ class JobHandler(JobHandlerInterface):
         )
         memory_in_gb = 2.0
         cpu = 2.0
-        # ACI Norway East limits (per container group, at time of writing):
-        #   CPU:    0.5 .. 4.0 cores
-        #   Memory: 0.5 .. 16.0 GB
-        # See: https://learn.microsoft.com/en-us/azure/container-instances/container-instances-region-availability
-        _CPU_MIN, _CPU_MAX = 0.5, 4.0
-        _MEM_MIN, _MEM_MAX = 0.5, 16.0
         if "computeResource" in runner_entity:
             compute_resource = runner_entity["computeResource"]
             requested_memory = compute_resource.get("memory", memory_in_gb)
@@ -229,42 +594,48 @@ class JobHandler(JobHandlerInterface):
                     f"(cpu={cpu}, memory={memory_in_gb} GB)."
                 )
 
+        # Claim a container group from the warm pool of the image and size, if there is one. The group is updated
+        # with the job's container, which is started on the host where the group was provisioned
+        warm_pool = _warm_pools.get(pool_key(full_image_name, cpu, memory_in_gb))
+        warm_group = warm_pool.claim() if warm_pool else None
+        container_group_name = self.azure_valid_container_name
+        container_name = self.container_name
+        if warm_pool:
+            _warm_pool_requests.add(1, {"hit": warm_group is not None})
+        if warm_pool and warm_group:
+            self._log.info(f"Starting the job in the warm container group '{warm_group}'")
+            container_group_name = warm_group
+        # Jobs that are not started in a warm container group can share a container group with other jobs
+        batched = config.AZURE_JOB_BATCH_SIZE > 1 and not warm_group
+        if batched:
+            container_name = f"job-{self.job.job_uid}"
+
         command_list = ["/app/main/start.sh"]
         if reference_target:
             command_list.append(f"--reference-target={reference_target}")
         compute_resources = ResourceRequests(memory_in_gb=memory_in_gb, cpu=cpu)
         container = Container(
-            name=self.azure_valid_container_name,
+            name=container_name,
             image=full_image_name,
             resources=ResourceRequirements(requests=compute_resources),
             command=command_list,
             environment_variables=env_vars,
         )
-        image_registry_credential = ImageRegistryCredential(
-            server=runner_entity["image"]["registryName"],
-            username=config.IMAGE_REGISTRY_USERNAME,
-            password=config.IMAGE_REGISTRY_PASSWORD,
-        )
-
-        # Configure the container group
-        group = ContainerGroup(
-            location="norwayeast",
-            containers=[container],
-            os_type=OperatingSystemTypes.linux,
-            restart_policy=ContainerGroupRestartPolicy.never,
-            image_registry_credentials=[image_registry_credential],
-        )
+        registry = runner_entity["image"]["registryName"]
 
-        # Create the container group
+        # Create the container group. Only the creation request is sent, the progress of the provisioning is
+        # polled in progress(), so starting a job does not hold a scheduler thread until the container is running.
         try:
-            result = self.aci_client.container_groups.begin_create_or_update(
-                config.AZURE_JOB_RESOURCE_GROUP, self.azure_valid_container_name, group
-            )
-
-            # Wait for the container group to be created and running
-            # The begin_create_or_update() returns an LROPoller, we need to wait for it to complete
-            logger.info("Waiting for Azure container group to be provisioned...")
-            result.result()  # This blocks until the operation completes
+            if batched:
+                container_group_name = _job_batcher.add((registry, full_image_name), container, cpu, memory_in_gb)
+            else:
+                # The warm pool tag of a warm container group is replaced
+                self.aci_client.container_groups.begin_create_or_update(
+                    config.AZURE_JOB_RESOURCE_GROUP,
+                    container_group_name,
+                    _container_group([container], registry, tags={JOB_TAG: str(self.job.job_uid)}),
+                    polling=False,
+                )
         except ClientAuthenticationError as exc:
             # AADSTS7000215 (invalid secret), 7000222 (expired secret),
             # 700016 (unknown app), etc. Surface as a distinct exception so the
@@ -280,93 +651,45 @@ class JobHandler(JobHandlerInterface):
             error_code = getattr(getattr(exc, "error", None), "code", None)
             raise AzureHandlerProvisionError(
                 f"Azure rejected the container-group provisioning request "
-                f"(container '{self.azure_valid_container_name}'). "
+                f"(container '{container_group_name}'). "
                 f"ARM status={exc.status_code}, code={error_code}: {exc.message}",
                 status_code=exc.status_code,
                 error_code=error_code,
             ) from exc
 
-        # Poll until the container is actually running or has terminated
-        max_wait_seconds = 120 * 5
-        poll_interval = 5
-        waited = 0
-        container_state: str | None = None
-        while waited < max_wait_seconds:
-            try:
-                container_group = self.aci_client.container_groups.get(
-                    config.AZURE_JOB_RESOURCE_GROUP, self.azure_valid_container_name
-                )
-                container_state = container_group.containers[0].instance_view.current_state.state
-                if container_state in ("Running", "Terminated"):
-                    logger.info(f"Container is now in state: {container_state}")
-                    break
-                logger.info(f"Container state: {container_state}, waiting...")
-            except (AttributeError, TypeError):
-                # instance_view may not be available yet
-                logger.info("Container instance view not yet available, waiting...")
-            except HttpResponseError as e:
-                # Handle ContainerGroupDeploymentNotReady and similar errors
-                if "ContainerGroupDeploymentNotReady" in str(e) or "not ready" in str(e).lower():
-                    logger.info(f"Container group not ready yet: {e.message}")
-                else:
-                    raise  # Re-raise if it's a different error
-            sleep(poll_interval)
-            waited += poll_interval
-        else:
-            # Loop exited via the while-condition, not via break: we timed out.
-            raise TimeoutError(
-                f"Azure container '{self.azure_valid_container_name}' did not "
-                f"reach Running/Terminated within {max_wait_seconds}s "
-                f"(last observed state: {container_state!r}). The container "
-                "group has been created but is stuck - inspect ACI events "
-                "(image pull, quota, networking) and remove() when done."
-            )
-
-        logger.info("*** Azure container job started successfully ***")
-
-        return "Azure container started"
+        state = {**(self.job.state or {}), "provisioning_started": datetime.now(timezone.utc).isoformat()}
+        if warm_pool and warm_group:
+            # The container keeps the job's name, which is not the name of the warm container group
+            state.update(container_group=warm_group, container=container_name, warm_pool=warm_pool.key)
+        if batched:
+            state.update(container_group=container_group_name, container=container_name)
+        self.job.state = state
+        logger.info("*** Azure container group creation accepted, provisioning ***")
+        return "Azure container group creation accepted"
 
     def remove(self) -> Tuple[JobStatus, str]:
+        if _in_shared_group(self.job) and self._shared_group_in_use():
+            return JobStatus.REMOVED, (
+                f"The container group '{self.azure_valid_container_name}' is shared with jobs that have not ended. "
+                "It is deleted when they have"
+            )
+        # Deleting a container group takes a while, so only the request is sent, and Azure deletes it in the
+        # background. The request is not queued, as queued deletions are lost if the process stops.
         try:
-            operation = self.aci_client.container_groups.begin_delete(
-                config.AZURE_JOB_RESOURCE_GROUP, self.azure_valid_container_name
+            self.aci_client.container_groups.begin_delete(
+                config.AZURE_JOB_RESOURCE_GROUP, self.azure_valid_container_name, polling=False
             )
         except ResourceNotFoundError:
-            # Idempotent: already gone counts as successfully removed.
-            logger.info(
-                f"Container group '{self.azure_valid_container_name}' already absent; "
-                "treating remove() as completed."
+            return JobStatus.REMOVED, f"The container group '{self.azure_valid_container_name}' does not exist"
+        except HttpResponseError as error:
+            self._log.warning(f"Failed to request the deletion of the container group, it is retried: {error}")
+            get_container_group_reaper().delete(
+                self.aci_client, config.AZURE_JOB_RESOURCE_GROUP, self.azure_valid_container_name
             )
-            return JobStatus.COMPLETED, "already removed"
-        except ClientAuthenticationError as exc:
-            raise AzureHandlerAuthError(
-                "Azure rejected the service principal credentials during remove(). " f"AAD detail: {exc.message}"
-            ) from exc
-        except HttpResponseError as exc:
-            error_code = getattr(getattr(exc, "error", None), "code", None)
-            raise AzureHandlerProvisionError(
-                f"Azure rejected the container-group delete request "
-                f"(container '{self.azure_valid_container_name}'). "
-                f"ARM status={exc.status_code}, code={error_code}: {exc.message}",
-                status_code=exc.status_code,
-                error_code=error_code,
-            ) from exc
-
-        # Poll deletion status
-        status = operation.status()
-        for _ in range(4):
-            status = operation.status()
-            if status in ("Succeeded", "Failed", "Canceled"):
-                break
-            sleep(2)
-
-        if status == "Succeeded":
-            return JobStatus.COMPLETED, status
-        if status in ("Failed", "Canceled"):
-            logger.warning(f"Delete of container '{self.azure_valid_container_name}' ended with status={status}")
-            return JobStatus.FAILED, status
-        # Still InProgress after the polling budget - not an error, just not done.
-        return JobStatus.UNKNOWN, status
+        return (
+            JobStatus.REMOVED,
+            f"The container group '{self.azure_valid_container_name}' is deleted in the background",
+        )
 
     def progress(self) -> Tuple[JobStatus, None | list[str] | str, None | float]:
         """Poll progress from the job instance"""
@@ -374,6 +697,11 @@ class JobHandler(JobHandlerInterface):
             # If setup fails, the container is not started
             return self.job.status, self.job.log, self.job.percentage
 
+        # The status refreshed from the container group is the status of the job's container, unless the group
+        # is shared
+        if not _in_shared_group(self.job) and _recently_refreshed(self.job):
+            return self._refreshed_progress()
+
         # Fetch container group first (cheap, single ARM round-trip). Only pull
         # logs if the container has actually reached a state that produces them.
         try:
@@ -390,62 +718,117 @@ class JobHandler(JobHandlerInterface):
                 "Azure rejected the service principal credentials during progress(). " f"AAD detail: {exc.message}"
             ) from exc
         except HttpResponseError as e:
-            if "ContainerGroupDeploymentNotReady" in str(e) or "not ready" in str(e).lower():
+            if _not_ready(e):
                 logger.info(f"Container group not ready yet: {e}")
                 return JobStatus.STARTING, "Container is still initializing...", self.job.percentage
             raise
 
+        container = _find_container(container_group, self.container_name)
+        if container_group.provisioning_state == "Failed":
+            message = _last_event(container) or "The provisioning of the container group failed"
+            return self._provisioned(JobStatus.FAILED), message, self.job.percentage
+
         try:
-            current_state = container_group.containers[0].instance_view.current_state
+            current_state = container.instance_view.current_state
             status = current_state.state
             exit_code = current_state.exit_code
         except (AttributeError, TypeError):
             # instance_view may not be available yet
             return JobStatus.STARTING, "Container instance view not yet available", self.job.percentage
 
-        # Only request logs once the container has content to produce.
+        # Only request logs once the container has content to produce, and the caller uses them.
         logs: None | list[str] | str = None
-        if status in ("Running", "Terminated"):
+        if status in ("Running", "Terminated") and self.fetch_logs:
             try:
-                logs = self.aci_client.containers.list_logs(
-                    config.AZURE_JOB_RESOURCE_GROUP,
-                    self.azure_valid_container_name,
-                    self.azure_valid_container_name,
-                ).content
-            except ResourceNotFoundError:
-                logs = None
+                logs = self._fetch_log()
             except HttpResponseError as e:
-                if "ContainerGroupDeploymentNotReady" in str(e) or "not ready" in str(e).lower():
-                    logger.info(f"Container group not ready yet for log retrieval: {e}")
-                    return JobStatus.STARTING, "Container is still initializing...", self.job.percentage
-                raise
+                if not _not_ready(e):
+                    raise
+                logger.info(f"Container group not ready yet for log retrieval: {e}")
+                return JobStatus.STARTING, "Container is still initializing...", self.job.percentage
+
+        if not logs and self.fetch_logs:  # Fall back to Container Instance events
+            logs = _last_event(container) or self.job.log
+
+        job_status = _container_status(status, exit_code)
+        if job_status is None:
+            self._log.warning(f"Unmapped ACI container state: status={status!r}, exit_code={exit_code}")
+            job_status = JobStatus.UNKNOWN
+        return self._provisioned(job_status), logs, self.job.percentage
 
-        if not logs:  # Fall back to Container Instance events
+    def _refreshed_progress(self) -> Tuple[JobStatus, None | list[str] | str, None | float]:
+        """The progress of the job with the status stored by the last refresh(). Only the logs are fetched."""
+        status = self.job.status
+        logs = None
+        if self.fetch_logs and status != JobStatus.STARTING:
             try:
-                logs = container_group.containers[0].instance_view.events[-1].message
-            except (AttributeError, TypeError, IndexError):
-                logs = self.job.log
-
-        job_status = self.job.status
-
-        # Flake8 does not have support for match case syntax. Using noqa to disable warnings.
-        match (status, exit_code):  # noqa
-            case ("Running", None):  # noqa
-                job_status = JobStatus.RUNNING
-            case ("Terminated", 0):  # noqa
-                job_status = JobStatus.COMPLETED
-            case ("Terminated", exit_code) if exit_code is not None and exit_code != 0:  # noqa
-                # Includes negative exit codes (SIGKILL, OOM = -9, SIGSEGV = -11, ...)
-                job_status = JobStatus.FAILED
-            case ("Waiting", None):  # noqa
-                job_status = JobStatus.STARTING
-            case ("Succeeded", _):  # noqa - ACI provisioning succeeded, container not yet Running
-                job_status = JobStatus.STARTING
-            case ("Pending", _):  # noqa
-                job_status = JobStatus.STARTING
-            case ("Failed", _) | ("Canceled", _):  # noqa - ACI-side failures (image pull, quota, ...)
-                job_status = JobStatus.FAILED
-            case _:  # noqa - any state we haven't mapped
-                self._log.warning(f"Unmapped ACI container state: status={status!r}, exit_code={exit_code}")
-                job_status = JobStatus.UNKNOWN
-        return job_status, logs, self.job.percentage
+                logs = self._fetch_log()
+            except HttpResponseError as e:
+                if not _not_ready(e):
+                    raise
+        return self._provisioned(status), logs, self.job.percentage
+
+    def _fetch_log(self) -> list[str] | None:
+        """Get the lines of the container's log, or None if the container does not exist.
+
+        Once the job's log has been fetched, only the last AZURE_LOG_TAIL_LINES lines of the container's log are
+        downloaded, and the lines after the end of the job's log are appended to it. The whole log is downloaded
+        if those lines do not continue the job's log, e.g. if more lines than that were written since last time.
+        """
+        log = self.job.log or []
+        if config.AZURE_LOG_TAIL_LINES and log and (self.job.state or {}).get("log_lines") == len(log):
+            tail = self._list_logs(tail=config.AZURE_LOG_TAIL_LINES)
+            if tail is None:
+                return None
+            new_lines = _new_log_lines(log, tail.splitlines(), config.AZURE_LOG_TAIL_LINES)
+            if new_lines is not None:
+                return self._fetched(log + new_lines)
+        content = self._list_logs()
+        return self._fetched(content.splitlines()) if content is not None else None
+
+    def _fetched(self, log: list[str]) -> list[str]:
+        self.job.state = {**(self.job.state or {}), "log_lines": len(log)}
+        return log
+
+    def _list_logs(self, tail: int | None = None) -> str | None:
+        """Download the log of the container, or its last 'tail' lines. None if the container does not exist."""
+        try:
+            logs = self.aci_client.containers.list_logs(
+                config.AZURE_JOB_RESOURCE_GROUP,
+                self.azure_valid_container_name,
+                self.container_name,
+                tail=tail,
+            ).content
+        except ResourceNotFoundError:
+            return None
+        if logs is None:
+            return None
+        _log_bytes.record(len(logs.encode()), {"tail": tail is not None})
+        return str(logs)
+
+    def _shared_group_in_use(self) -> bool:
+        """Whether the containers of other jobs in the job's shared container group have not ended."""
+        try:
+            container_group = self.aci_client.container_groups.get(
+                config.AZURE_JOB_RESOURCE_GROUP, self.azure_valid_container_name
+            )
+        except ResourceNotFoundError:
+            return False
+        return any(
+            container.name != self.container_name and not _ended(container) for container in container_group.containers
+        )
+
+    def _provisioned(self, job_status: JobStatus) -> JobStatus:
+        """Record in the job state how long the container group took to provision, the first time the job
+        is no longer starting.
+        """
+        state = self.job.state or {}
+        if job_status in (JobStatus.STARTING, JobStatus.UNKNOWN) or "provisioning_started" not in state:
+            return job_status
+        if "provisioning_seconds" not in state:
+            provisioned = datetime.now(timezone.utc)
+            seconds = (provisioned - datetime.fromisoformat(state["provisioning_started"])).total_seconds()
+            self.job.state = {**state, "provisioned": provisioned.isoformat(), "provisioning_seconds": seconds}
+            _provisioning_time.record(seconds, {"warm_pool": "warm_pool" in state})
+            self._log.info(f"Container group provisioned in {seconds:.0f} seconds, status: {job_status.value}")
+        return job_status
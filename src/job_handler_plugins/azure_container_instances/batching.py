@@ -0,0 +1,85 @@
+import threading
+import uuid
+from typing import Any, Callable, Hashable
+
+# Tag on the container groups that run several jobs, one container each
+BATCH_TAG = "dm-job-batch"
+
+
+class _Batch:
+    def __init__(self) -> None:
+        self.name = f"batch-{uuid.uuid4().hex[:16]}"
+        self.items: list[Any] = []
+        self.cpu = 0.0
+        self.memory_in_gb = 0.0
+        self.full = threading.Event()
+        self.submitted = threading.Event()
+        self.error: Exception | None = None
+
+
+class JobBatcher:
+    """Collects the containers of jobs that are started at about the same time into batches, so each batch can
+    be submitted as one container group.
+
+    The first job added to a batch waits until the batch is full, or for 'wait_seconds', and then submits it.
+    The other jobs wait until it is submitted. A batch holds at most 'max_size' jobs, and at most 'max_cpu' and
+    'max_memory_in_gb' resources in total. Only jobs with the same key are batched together. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        wait_seconds: float,
+        max_cpu: float,
+        max_memory_in_gb: float,
+        submit: Callable[[str, Hashable, list[Any]], None],
+    ):
+        self.max_size = max_size
+        self.wait_seconds = wait_seconds
+        self.max_cpu = max_cpu
+        self.max_memory_in_gb = max_memory_in_gb
+        # Called with the name of the batch, its key and its items, to create the container group
+        self.submit = submit
+        self._open: dict[Hashable, _Batch] = {}
+        self._lock = threading.Lock()
+
+    def add(self, key: Hashable, item: Any, cpu: float, memory_in_gb: float) -> str:
+        """Add a job's container to a batch, and return the name of the batch once it is submitted.
+
+        The exception raised when submitting the batch is raised for every job in it.
+        """
+        with self._lock:
+            batch = self._open.get(key)
+            if batch and (batch.cpu + cpu > self.max_cpu or batch.memory_in_gb + memory_in_gb > self.max_memory_in_gb):
+                self._close(key, batch)
+                batch = None
+            leader = batch is None
+            if batch is None:
+                batch = self._open[key] = _Batch()
+            batch.items.append(item)
+            batch.cpu += cpu
+            batch.memory_in_gb += memory_in_gb
+            if len(batch.items) >= self.max_size:
+                self._close(key, batch)
+
+        if not leader:
+            batch.submitted.wait()
+        else:
+            batch.full.wait(self.wait_seconds)
+            with self._lock:
+                self._close(key, batch)
+            try:
+                self.submit(batch.name, key, batch.items)
+            except Exception as error:
+                batch.error = error
+            finally:
+                batch.submitted.set()
+        if batch.error:
+            raise batch.error
+        return batch.name
+
+    def _close(self, key: Hashable, batch: _Batch) -> None:
+        """Stop adding jobs to a batch. Must be called with the lock held."""
+        if self._open.get(key) is batch:
+            del self._open[key]
+        batch.full.set()
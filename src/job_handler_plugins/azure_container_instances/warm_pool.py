@@ -0,0 +1,83 @@
+import threading
+from collections import deque
+from time import monotonic
+
+# Tag on the container groups that are kept in a warm pool. Claiming a group for a job replaces its tags,
+# so every container group with this tag is waiting for a job, or has stopped waiting.
+WARM_POOL_TAG = "dm-job-warm-pool"
+# Tags on warm container groups with the process that keeps them, and when their creation was requested
+WARM_POOL_OWNER_TAG = "dm-job-warm-pool-owner"
+WARM_POOL_CREATED_TAG = "dm-job-warm-pool-created"
+
+
+def pool_key(image: str, cpu: float, memory_in_gb: float) -> str:
+    return f"{image};cpu={float(cpu)};memory={float(memory_in_gb)}"
+
+
+class WarmPool:
+    """Bookkeeping of the container groups this process keeps provisioned for one image and size.
+
+    Groups are added while they are provisioning, become idle when their container is running, and are claimed
+    by a job or dropped. A warm container exits after 'idle_seconds', so idle groups older than that are not
+    claimed. Claimed groups are remembered until they are no longer tagged as warm. Thread-safe.
+    """
+
+    def __init__(self, image: str, cpu: float, memory: float, size: int, idle_seconds: float):
+        self.image = image
+        self.cpu = float(cpu)
+        self.memory_in_gb = float(memory)
+        self.size = size
+        self.idle_seconds = idle_seconds
+        self.key = pool_key(image, cpu, memory)
+        # Group name -> when its creation was requested
+        self._provisioning: dict[str, float] = {}
+        self._idle: deque[tuple[str, float]] = deque()
+        self._claimed: set[str] = set()
+        self._lock = threading.Lock()
+
+    def claim(self) -> str | None:
+        """Take the oldest idle group that is still waiting for a job, or None if there is none."""
+        with self._lock:
+            while self._idle:
+                name, created = self._idle.popleft()
+                if monotonic() - created < self.idle_seconds:
+                    self._claimed.add(name)
+                    return name
+            return None
+
+    def missing(self) -> int:
+        """The number of groups to create to fill the pool."""
+        with self._lock:
+            return max(0, self.size - len(self._idle) - len(self._provisioning))
+
+    def provisioning(self) -> list[str]:
+        with self._lock:
+            return list(self._provisioning)
+
+    def idle(self) -> list[str]:
+        with self._lock:
+            return [name for name, _ in self._idle]
+
+    def claimed(self) -> list[str]:
+        with self._lock:
+            return list(self._claimed)
+
+    def tracks(self, name: str) -> bool:
+        """Whether the group is provisioning, idle or claimed in this pool."""
+        with self._lock:
+            return name in self._provisioning or name in self._claimed or any(entry[0] == name for entry in self._idle)
+
+    def add(self, name: str) -> None:
+        with self._lock:
+            self._provisioning[name] = monotonic()
+
+    def ready(self, name: str) -> None:
+        with self._lock:
+            if (created := self._provisioning.pop(name, None)) is not None:
+                self._idle.append((name, created))
+
+    def discard(self, name: str) -> None:
+        with self._lock:
+            self._provisioning.pop(name, None)
+            self._claimed.discard(name)
+            self._idle = deque(entry for entry in self._idle if entry[0] != name)
@@ -1,7 +1,9 @@
 import os
+import threading
 from typing import Tuple
 
 import docker
+from docker import DockerClient
 from docker.errors import APIError, DockerException, ImageNotFound
 
 from config import config
@@ -11,6 +13,28 @@ from utils.logging import logger
 
 _SUPPORTED_TYPE = "dmss://WorkflowDS/Blueprints/LocalContainer"
 
+_client: DockerClient | None = None
+_client_lock = threading.Lock()
+
+
+def _get_client() -> DockerClient:
+    """Get the docker client shared by all local container jobs."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            try:
+                _client = docker.from_env()
+            except DockerException:
+                raise NotImplementedException(
+                    "Support for running local containers has not been configured for this environment",
+                    debug=(
+                        "Failed to get a docker client. Docker must be installed on this host, or "
+                        + "the /var/run/docker.sock must be made available (volume mount)."
+                        + "Make sure you are aware of the serious security risk this entails."
+                    ),
+                )
+        return _client
+
 
 class JobHandler(JobHandlerInterface):
     """
@@ -23,17 +47,7 @@ class JobHandler(JobHandlerInterface):
         super().__init__(job, data_source)
         self.headers = {"Access-Key": job.token}
         self.local_container_name = f"{job.runner['name']}_{str(job.job_uid).split('-')[0]}"
-        try:
-            self.client = docker.from_env()
-        except DockerException:
-            raise NotImplementedException(
-                "Support for running local containers has not been configured for this environment",
-                debug=(
-                    "Failed to get a docker client. Docker must be installed on this host, or "
-                    + "the /var/run/docker.sock must be made available (volume mount)."
-                    + "Make sure you are aware of the serious security risk this entails."
-                ),
-            )
+        self.client = _get_client()
 
     def start(self) -> str:
         runner_entity: dict = self.job.runner
@@ -9,7 +9,8 @@ class Deployer:
 
         self.client = ResourceManagementClient(self.credentials, self.subscription_id)
 
-    def deploy(self, template: dict, deployment_name: str, parameters: dict):
+    def deploy(self, template: dict, deployment_name: str, parameters: dict, wait: bool = True):
+        """Deploy a template. Unless 'wait' is set, only the deployment is submitted, see get_state()."""
         deployment_properties = {
             "mode": "Incremental",
             "template": template,
@@ -17,6 +18,14 @@ class Deployer:
         }
 
         deployment_async_operation = self.client.deployments.begin_create_or_update(
-            self.resource_group, deployment_name, {"properties": deployment_properties}
+            self.resource_group, deployment_name, {"properties": deployment_properties}, polling=wait
         )
+        if not wait:
+            return None
         return deployment_async_operation.wait()
+
+    def get_state(self, deployment_name: str) -> tuple[str | None, str | None]:
+        """Get the provisioning state of a deployment, and the error message if it failed."""
+        properties = self.client.deployments.get(self.resource_group, deployment_name).properties
+        error = getattr(properties, "error", None)
+        return getattr(properties, "provisioning_state", None), getattr(error, "message", None)
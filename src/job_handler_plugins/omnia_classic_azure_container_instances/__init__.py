@@ -1,9 +1,11 @@
+import copy
+import functools
 import json
 import logging
 import os
+import threading
 from collections import namedtuple
 from pathlib import Path
-from time import sleep
 from typing import List, Tuple
 
 from azure.core.exceptions import ResourceNotFoundError
@@ -16,6 +18,7 @@ from job_handler_plugins.omnia_classic_azure_container_instances.ARM_deployer im
     Deployer,
 )
 from restful.exceptions import NotFoundException
+from services.azure_reaper import get_container_group_reaper
 from services.job_handler_interface import Job, JobHandlerInterface, JobStatus
 from utils.logging import logger
 
@@ -26,6 +29,46 @@ logging.getLogger("azure.identity").setLevel(logging.WARNING)
 _SUPPORTED_TYPE = "dmss://DMT-Internal/DMT/AzureContainerInstanceJobClassic"
 
 
+_TEMPLATE_PATH = Path(__file__).parent / "OmniaClassicContainerInstance.json"
+
+
+@functools.cache
+def _read_template() -> dict:
+    with open(_TEMPLATE_PATH, "r") as template_file:
+        return json.load(template_file)  # type: ignore[no-any-return]
+
+
+def _load_template() -> dict:
+    """Get a copy of the ARM template, which is only read once, to modify for one deployment."""
+    return copy.deepcopy(_read_template())
+
+
+_clients: tuple[Deployer, ContainerInstanceManagementClient] | None = None
+_clients_lock = threading.Lock()
+
+
+def _get_clients() -> tuple[Deployer, ContainerInstanceManagementClient]:
+    """Get the ARM deployer and the ContainerInstanceManagementClient shared by all jobs.
+
+    They share one credential, which caches the AAD token until it expires.
+    """
+    global _clients
+    with _clients_lock:
+        if _clients is None:
+            logger.setLevel(logging.WARNING)  # I could not find the correctly named logger for this...
+            azure_credentials = ClientSecretCredential(
+                client_id=config.AZURE_JOB_SP_CLIENT_ID,
+                client_secret=config.AZURE_JOB_SP_SECRET,
+                tenant_id=config.AZURE_JOB_SP_TENANT_ID,
+            )
+            _clients = (
+                Deployer(config.AZURE_JOB_SUBSCRIPTION, config.AZURE_JOB_RESOURCE_GROUP, azure_credentials),
+                ContainerInstanceManagementClient(azure_credentials, subscription_id=config.AZURE_JOB_SUBSCRIPTION),
+            )
+            logger.setLevel(config.LOGGER_LEVEL)
+        return _clients
+
+
 def inject_environment_variables(template: dict, variables: List[EnvironmentVariable]) -> dict:
     template["resources"][1]["properties"]["containers"][0]["properties"]["environmentVariables"] = [
         {"name": e.name, "value": e.value} for e in variables
@@ -39,21 +82,19 @@ class JobHandler(JobHandlerInterface):
     Support both executable jobs and job services
     """
 
-    def __init__(self, data_source: str, job_entity: dict, token: str):
-        new_job = Job(**job_entity)
-        super().__init__(new_job, data_source)
-        logger.setLevel(logging.WARNING)  # I could not find the correctly named logger for this...
-        azure_credentials = ClientSecretCredential(
-            client_id=config.AZURE_JOB_SP_CLIENT_ID,
-            client_secret=config.AZURE_JOB_SP_SECRET,
-            tenant_id=config.AZURE_JOB_SP_TENANT_ID,
-        )
-        self.arm_deployer = Deployer(config.AZURE_JOB_SUBSCRIPTION, config.AZURE_JOB_RESOURCE_GROUP, azure_credentials)
+    reusable = True
+
+    def __init__(self, job: Job, data_source: str):
+        super().__init__(job, data_source)
         self.azure_valid_container_name = self.job.runner["name"].lower()
-        self.aci_client = ContainerInstanceManagementClient(
-            azure_credentials, subscription_id=config.AZURE_JOB_SUBSCRIPTION
-        )
-        logger.setLevel(config.LOGGER_LEVEL)
+
+    @property
+    def arm_deployer(self) -> Deployer:
+        return _get_clients()[0]
+
+    @property
+    def aci_client(self) -> ContainerInstanceManagementClient:
+        return _get_clients()[1]
 
     def teardown_service(self, service_id: str) -> str:
         raise NotImplementedError
@@ -96,32 +137,27 @@ class JobHandler(JobHandlerInterface):
             "subnetId": self.job.runner.get("subnetId"),
             "logAnalyticsWorkspaceResourceId": self.job.runner.get("logAnalyticsWorkspaceResourceId"),
         }
-        with open(f"{Path(__file__).parent}/OmniaClassicContainerInstance.json", "r") as template_file:
-            template = json.load(template_file)
-
-        template = inject_environment_variables(template, env_vars)
+        template = inject_environment_variables(_load_template(), env_vars)
 
         logger.setLevel(logging.WARNING)  # I could not find the correctly named logger for this...
-        result = self.arm_deployer.deploy(template, self.azure_valid_container_name, parameters)
+        result = self.arm_deployer.deploy(
+            template, self.azure_valid_container_name, parameters, wait=not config.OMNIA_CLASSIC_ASYNC_DEPLOY
+        )
         logger.setLevel(config.LOGGER_LEVEL)  # I could not find the correctly named logger for this...
+        if config.OMNIA_CLASSIC_ASYNC_DEPLOY:
+            # The state of the deployment is polled in progress() until the container group exists
+            return "Deployment of the container group submitted"
         return result or "Ok"
 
     def remove(self) -> Tuple[JobStatus, str]:
-        logger.setLevel(logging.WARNING)
-        operation = self.aci_client.container_groups.begin_delete(
-            config.AZURE_JOB_RESOURCE_GROUP, self.azure_valid_container_name
+        # Deleting a container group takes a while, so it is done in the background
+        get_container_group_reaper().delete(
+            self.aci_client, config.AZURE_JOB_RESOURCE_GROUP, self.azure_valid_container_name
+        )
+        return (
+            JobStatus.REMOVED,
+            f"The container group '{self.azure_valid_container_name}' is deleted in the background",
         )
-        logger.setLevel(config.LOGGER_LEVEL)
-        status = operation.status()
-        for i in range(4):
-            status = operation.status()
-            if status == "Succeeded":
-                break
-            sleep(2)
-        job_status = JobStatus.UNKNOWN
-        if status == "Succeeded":
-            job_status = JobStatus.COMPLETED
-        return job_status, status
 
     def progress(self) -> Tuple[JobStatus, None | list[str] | str, None | float]:
         """Poll progress from the job instance"""
@@ -132,6 +168,9 @@ class JobHandler(JobHandlerInterface):
             ).content
             logger.setLevel(config.LOGGER_LEVEL)
         except ResourceNotFoundError:
+            # The container group does not exist until its deployment has succeeded
+            if deployment_progress := self._deployment_progress():
+                return deployment_progress
             raise NotFoundException(
                 f"The container '{self.azure_valid_container_name}' does not exist. "
                 + "Either it has not been created, or it's not ready to accept requests."
@@ -152,3 +191,15 @@ class JobHandler(JobHandlerInterface):
         if status == "Waiting":
             job_status = JobStatus.STARTING
         return job_status, logs, self.job.percentage
+
+    def _deployment_progress(self) -> Tuple[JobStatus, str, None | float] | None:
+        """The progress of the job while its container group is deployed, or None if it is not being deployed."""
+        try:
+            state, error = self.arm_deployer.get_state(self.azure_valid_container_name)
+        except ResourceNotFoundError:
+            return None
+        if state in ("Failed", "Canceled"):
+            return JobStatus.FAILED, error or f"The deployment of the container group ended as {state}", None
+        if state == "Succeeded":  # The container group has been deleted since
+            return None
+        return JobStatus.STARTING, f"The container group is being deployed ({state})", self.job.percentage
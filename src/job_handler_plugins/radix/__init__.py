@@ -9,6 +9,9 @@ from utils.logging import logger
 
 _SUPPORTED_TYPE = "dmss://WorkflowDS/Blueprints/Radix"
 
+# Keeps the connections to the Radix job schedulers open between requests
+_session = requests.Session()
+
 
 def _get_job_url(job: Job) -> str:
     job_name: str = job.runner["jobName"]
@@ -21,6 +24,8 @@ def list_of_env_to_dict(env_vars: list[str]) -> dict:
 
 
 class JobHandler(JobHandlerInterface):
+    reusable = True
+
     def __init__(self, job: Job, data_source: str):
         super().__init__(job, data_source)
 
@@ -45,7 +50,7 @@ class JobHandler(JobHandlerInterface):
         if image_tag := self.job.runner.get("imageTagName"):
             body["imageTagName"] = image_tag
 
-        result = requests.post(
+        result = _session.post(
             _get_job_url(self.job),
             json=body,
             timeout=10,
@@ -61,7 +66,7 @@ class JobHandler(JobHandlerInterface):
         if not self.job.state:
             return JobStatus.REMOVED, "Removed"
 
-        result = requests.delete(
+        result = _session.delete(
             f"{_get_job_url(self.job)}/{self.job.state['job_name']}",
             timeout=10,
         )
@@ -73,7 +78,7 @@ class JobHandler(JobHandlerInterface):
             return JobStatus.FAILED, self.job.log, None
         if not self.job.state:
             return self.job.status, "Radix job is not running yet.", 0
-        result = requests.get(
+        result = _session.get(
             f"{_get_job_url(self.job)}/{self.job.state['job_name']}",
             timeout=10,
         )
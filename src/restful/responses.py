@@ -1,4 +1,5 @@
 import functools
+import inspect
 import logging
 import sys
 import traceback
@@ -58,67 +59,84 @@ If the execution fails, it will return a JSONResponse with a standardized error
 """
 
 
-def create_response(response_class: Type[TResponse]) -> Callable[..., Callable[..., TResponse | JSONResponse]]:
-    def func_wrapper(func) -> Callable[..., TResponse | JSONResponse]:
+def create_response(response_class: Type[TResponse]) -> Callable[[Callable], Callable]:
+    def func_wrapper(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper_decorator(*args, **kwargs) -> TResponse | Response:
+                try:
+                    result = await func(*args, **kwargs)
+                    return response_class(result, status_code=status.HTTP_200_OK)
+                except Exception as error:
+                    return _error_response(error)
+
+            return async_wrapper_decorator
+
         @functools.wraps(func)
-        def wrapper_decorator(*args, **kwargs) -> TResponse | JSONResponse:
+        def wrapper_decorator(*args, **kwargs) -> TResponse | Response:
             try:
                 result = func(*args, **kwargs)
                 return response_class(result, status_code=status.HTTP_200_OK)
-            except HTTPError as http_error:
-                if logger.level <= logging.DEBUG:
-                    traceback.print_exc()
-                error_response = ErrorResponse()
-                # If we check that http_error.response exists before accessing props, it will always fail...
-                if http_error.response.text:  # type: ignore
-                    error_response = ErrorResponse(
-                        status=http_error.response.status_code,  # type: ignore
-                        message=http_error.response.text,  # type: ignore
-                        debug=f"The HTTP call to '{http_error.response.url}' failed",  # type: ignore
-                    )
-                logger.error(error_response)
-                return JSONResponse(error_response.model_dump(), status_code=error_response.status)
-            except ServiceException as dmss_exception:
-                error_id = uuid4()
-                logger.error(dmss_exception, extra={"UUID": str(error_id), "Traceback": get_traceback()})
-                return PlainTextResponse(str(dmss_exception), status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
-            except ValidationException as e:
-                if logger.level <= logging.DEBUG:
-                    traceback.print_exc()
-                logger.debug(e)
-                return JSONResponse(e.dict(), status_code=status.HTTP_422_UNPROCESSABLE_CONTENT)
-            except ValidationError as e:
-                validation_exception = ValidationException(message=str(e))
-                if logger.level <= logging.DEBUG:
-                    traceback.print_exc()
-                return JSONResponse(validation_exception.dict(), status_code=status.HTTP_422_UNPROCESSABLE_CONTENT)
-            except NotFoundException as e:
-                logger.debug(e)
-                return JSONResponse(e.dict(), status_code=status.HTTP_404_NOT_FOUND)
-            except BadRequestException as e:
-                if logger.level <= logging.DEBUG:
-                    traceback.print_exc()
-                logger.debug(e.dict(), extra={"Traceback": get_traceback()})
-                return JSONResponse(e.dict(), status_code=status.HTTP_400_BAD_REQUEST)
-            except MissingPrivilegeException as e:
-                logger.warning(e)
-                return JSONResponse(e.dict(), status_code=status.HTTP_403_FORBIDDEN)
-            except NotImplementedException as e:
-                logger.warning(e)
-                return JSONResponse(e.dict(), status_code=status.HTTP_501_NOT_IMPLEMENTED)
-            except Exception as e:
-                error_id = uuid4()
-                traceback.print_exc()
-                logger.error(
-                    f"Unexpected unhandled exception: {e}", extra={"UUID": str(error_id), "Traceback": get_traceback()}
-                )
-                return JSONResponse(ErrorResponse().model_dump(), status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            except Exception as error:
+                return _error_response(error)
 
         return wrapper_decorator
 
     return func_wrapper
 
 
+def _error_response(error: Exception) -> Response:
+    """Get the error response for an exception raised by a route. Must be called while handling the exception."""
+    if isinstance(error, HTTPError):
+        if logger.level <= logging.DEBUG:
+            traceback.print_exc()
+        error_response = ErrorResponse()
+        # If we check that http_error.response exists before accessing props, it will always fail...
+        if error.response.text:  # type: ignore
+            error_response = ErrorResponse(
+                status=error.response.status_code,  # type: ignore
+                message=error.response.text,  # type: ignore
+                debug=f"The HTTP call to '{error.response.url}' failed",  # type: ignore
+            )
+        logger.error(error_response)
+        return JSONResponse(error_response.model_dump(), status_code=error_response.status)
+    if isinstance(error, ServiceException):
+        error_id = uuid4()
+        logger.error(error, extra={"UUID": str(error_id), "Traceback": get_traceback()})
+        return PlainTextResponse(str(error), status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+    if isinstance(error, ValidationException):
+        if logger.level <= logging.DEBUG:
+            traceback.print_exc()
+        logger.debug(error)
+        return JSONResponse(error.dict(), status_code=status.HTTP_422_UNPROCESSABLE_CONTENT)
+    if isinstance(error, ValidationError):
+        validation_exception = ValidationException(message=str(error))
+        if logger.level <= logging.DEBUG:
+            traceback.print_exc()
+        return JSONResponse(validation_exception.dict(), status_code=status.HTTP_422_UNPROCESSABLE_CONTENT)
+    if isinstance(error, NotFoundException):
+        logger.debug(error)
+        return JSONResponse(error.dict(), status_code=status.HTTP_404_NOT_FOUND)
+    if isinstance(error, BadRequestException):
+        if logger.level <= logging.DEBUG:
+            traceback.print_exc()
+        logger.debug(error.dict(), extra={"Traceback": get_traceback()})
+        return JSONResponse(error.dict(), status_code=status.HTTP_400_BAD_REQUEST)
+    if isinstance(error, MissingPrivilegeException):
+        logger.warning(error)
+        return JSONResponse(error.dict(), status_code=status.HTTP_403_FORBIDDEN)
+    if isinstance(error, NotImplementedException):
+        logger.warning(error)
+        return JSONResponse(error.dict(), status_code=status.HTTP_501_NOT_IMPLEMENTED)
+    error_id = uuid4()
+    traceback.print_exc()
+    logger.error(
+        f"Unexpected unhandled exception: {error}", extra={"UUID": str(error_id), "Traceback": get_traceback()}
+    )
+    return JSONResponse(ErrorResponse().model_dump(), status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
 def get_traceback() -> str:
     """Get traceback as a log-friendly format."""
     exc_info = sys.exc_info()
@@ -0,0 +1,30 @@
+# Errors raised by the Azure job handlers. They are defined outside the handler plugins,
+# so the API can register exception handlers for them without importing the Azure SDK.
+
+
+class AzureHandlerConfigError(RuntimeError):
+    """Missing or invalid Azure configuration.
+
+    Only raised when an AzureContainer job is actually acted on. Other job
+    handlers are unaffected, so a deployment that never uses this backend can
+    run without any Azure secrets being set.
+    """
+
+
+class AzureHandlerAuthError(RuntimeError):
+    """Azure credentials are present but rejected by AAD (expired secret, etc.)."""
+
+
+class AzureHandlerProvisionError(RuntimeError):
+    """ARM rejected the container-group create/update call.
+
+    Covers quota exhaustion, invalid image references, region capacity,
+    name collisions, and other non-auth ARM failures. Carries the ARM
+    status code and error code so the FastAPI boundary can render a
+    meaningful upstream response.
+    """
+
+    def __init__(self, message: str, status_code: int | None = None, error_code: str | None = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.error_code = error_code
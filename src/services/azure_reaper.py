@@ -0,0 +1,92 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from azure.core.exceptions import ResourceNotFoundError
+
+from config import config
+from services.job_scheduler import scheduler
+from utils.logging import logger
+
+
+class ContainerGroupReaper:
+    """Deletes Azure container groups in the background, so sweeping container groups does not wait for them.
+
+    The queue is kept in memory, and is lost if the process stops. Removing a job therefore requests the deletion
+    of its container group right away, and only queues it here to retry a failed request.
+
+    Deletions are queued with delete(), and carried out by reap(), at most 'max_workers' at a time.
+    A deletion that fails is retried by the next reap(), up to 'max_attempts' times. Thread-safe.
+    """
+
+    def __init__(self, max_workers: int, max_attempts: int = 5):
+        self.max_workers = max_workers
+        self.max_attempts = max_attempts
+        # (resource group, container group) -> the ContainerInstanceManagementClient to delete it with, and the
+        # number of failed attempts
+        self._queue: dict[tuple[str, str], tuple[Any, int]] = {}
+        self._lock = threading.Lock()
+
+    def delete(self, client: Any, resource_group: str, name: str) -> None:
+        """Queue the deletion of a container group. Queuing a group that is already queued does nothing."""
+        with self._lock:
+            self._queue.setdefault((resource_group, name), (client, 0))
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._queue)
+
+    def reap(self) -> int:
+        """Delete the queued container groups, and return the number of deleted groups."""
+        with self._lock:
+            queued, self._queue = self._queue, {}
+        if not queued:
+            return 0
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="container-group-reaper") as pool:
+            results = list(pool.map(lambda item: self._delete(*item[0], item[1][0]), queued.items()))
+
+        deleted = 0
+        for (key, (client, attempts)), error in zip(queued.items(), results):
+            if error is None:
+                deleted += 1
+            elif attempts + 1 < self.max_attempts:
+                with self._lock:
+                    self._queue.setdefault(key, (client, attempts + 1))
+            else:
+                logger.error(f"Gave up deleting the container group '{key[1]}' after {self.max_attempts} attempts")
+        if deleted:
+            logger.info(f"Deleted {deleted} container groups")
+        return deleted
+
+    @staticmethod
+    def _delete(resource_group: str, name: str, client: Any) -> Exception | None:
+        try:
+            client.container_groups.begin_delete(resource_group, name).result()
+        except ResourceNotFoundError:
+            pass  # Already deleted
+        except Exception as error:
+            logger.warning(f"Failed to delete the container group '{name}': {error}")
+            return error
+        return None
+
+
+_reaper: ContainerGroupReaper | None = None
+_reaper_lock = threading.Lock()
+
+
+def get_container_group_reaper() -> ContainerGroupReaper:
+    """Get the process-wide container group reaper, which runs every AZURE_REAPER_INTERVAL_SECONDS."""
+    global _reaper
+    with _reaper_lock:
+        if _reaper is None:
+            _reaper = ContainerGroupReaper(config.AZURE_REAPER_MAX_WORKERS)
+            scheduler.add_job(
+                _reaper.reap,
+                trigger="interval",
+                seconds=config.AZURE_REAPER_INTERVAL_SECONDS,
+                id="reap-container-groups",
+                replace_existing=True,
+                coalesce=True,
+                max_instances=1,
+            )
+    return _reaper
@@ -0,0 +1,175 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Sequence
+
+import redis
+
+from config import config
+from services.job_store import (
+    INVALIDATION_CHANNEL,
+    JOB_STORE_DB,
+    get_connection_pool,
+    get_job_store,
+)
+from utils.logging import logger
+
+
+class CachedRecord(NamedTuple):
+    # The encoded fields of the record, so every read decodes its own copy of the job
+    record: dict[str, bytes]
+    # The whole log of the record, or None if it was not read
+    log: tuple[str, ...] | None
+    expires: float
+
+
+class JobCache:
+    """A size bounded, thread-safe LRU cache of job store records, kept in the memory of this process.
+
+    Writes by this process are applied to the cached records the same way they are applied to the job store.
+    Entries are invalidated when another process writes a record, or any process deletes it, and publishes
+    its key on the job store's invalidation channel. Entries also expire after 'ttl' seconds, which bounds
+    how stale a record can be if an invalidation is missed.
+    """
+
+    def __init__(self, max_size: int, ttl: float, max_log_lines: int):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.max_log_lines = max_log_lines
+        self._entries: OrderedDict[str, CachedRecord] = OrderedDict()
+        self._lock = threading.Lock()
+        # Incremented on every invalidation and write, so records read before them are not cached after them
+        self._generation = 0
+        # The number of writes in progress by this process per key, and the keys invalidated during those writes
+        self._writes: dict[str, int] = {}
+        self._stale: set[str] = set()
+        self.subscribed = threading.Event()
+
+    def generation(self) -> int:
+        """Get the current generation, to pass to put() when the record has been read."""
+        return self._generation
+
+    def get(self, key: str) -> CachedRecord | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, record: dict[str, bytes], log: list[str] | None, generation: int) -> None:
+        """Cache a record read at 'generation'. Nothing is cached if anything was invalidated since then."""
+        if not self.subscribed.is_set() or (log is not None and len(log) > self.max_log_lines):
+            return
+        with self._lock:
+            if generation != self._generation or key in self._writes:
+                return
+            self._store(
+                key, CachedRecord(record, tuple(log) if log is not None else None, time.monotonic() + self.ttl)
+            )
+
+    def begin_write(self, key: str) -> CachedRecord | None:
+        """Take a record out of the cache while this process writes it. Pass the returned entry to end_write()."""
+        with self._lock:
+            self._generation += 1
+            if key in self._writes:  # Concurrent writes can be applied to the job store in any order
+                self._stale.add(key)
+            self._writes[key] = self._writes.get(key, 0) + 1
+            return self._entries.pop(key, None)
+
+    def end_write(
+        self, key: str, entry: CachedRecord | None, values: dict[str, bytes], log: Sequence[str], replace_log: bool
+    ) -> None:
+        """Put a record written by this process back in the cache, with the write applied to it the same way
+        JobStore.set_record() applied it to the stored record. Pass None as 'entry' if the write failed.
+        """
+        with self._lock:
+            self._writes[key] -= 1
+            stale = key in self._stale
+            if not self._writes[key]:
+                del self._writes[key]
+                self._stale.discard(key)
+            if entry is None or stale:
+                return
+            cached_log = entry.log
+            if replace_log:
+                cached_log = tuple(log)
+            elif cached_log is not None:
+                cached_log += tuple(log)
+            if cached_log is not None and len(cached_log) > self.max_log_lines:
+                return
+            self._store(key, entry._replace(record={**entry.record, **values}, log=cached_log))
+
+    def invalidate(self, *keys: str) -> None:
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                self._entries.pop(key, None)
+                if key in self._writes:
+                    self._stale.add(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._stale.update(self._writes)
+
+    def _store(self, key: str, entry: CachedRecord) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+
+def _listen_for_invalidations(cache: JobCache) -> None:
+    """Invalidate cached records when they are written by other processes, or deleted by any process.
+
+    Runs forever in a daemon thread.
+    """
+    client = redis.Redis(connection_pool=get_connection_pool(JOB_STORE_DB))
+    origin = get_job_store().origin  # type: ignore[attr-defined]
+    while True:
+        try:
+            with client.pubsub() as pubsub:
+                pubsub.subscribe(INVALIDATION_CHANNEL)
+                while True:
+                    message = pubsub.get_message(timeout=1.0)
+                    if not message:
+                        continue
+                    if message["type"] == "subscribe":
+                        # Invalidations published while not subscribed are lost, so start over with an empty cache
+                        cache.clear()
+                        cache.subscribed.set()
+                    elif message["type"] == "message":
+                        message_origin, operation, *keys = message["data"].decode().split()
+                        if message_origin != origin or operation == "deleted":
+                            cache.invalidate(*keys)
+        except Exception as error:
+            cache.subscribed.clear()
+            cache.clear()
+            logger.warning(f"Lost the subscription to job store invalidations, retrying: {error}")
+            time.sleep(1)
+
+
+_job_cache: JobCache | None = None
+_job_cache_lock = threading.Lock()
+
+
+def get_job_cache() -> JobCache | None:
+    """Get the process-wide job cache, or None if it is disabled by setting JOB_CACHE_SIZE to 0.
+
+    Jobs in the in-memory job store are not cached, as reading them is as fast as reading the cache.
+    """
+    global _job_cache
+    if not config.JOB_CACHE_SIZE or config.JOB_STORE_BACKEND != "redis":
+        return None
+    with _job_cache_lock:
+        if _job_cache is None:
+            _job_cache = JobCache(config.JOB_CACHE_SIZE, config.JOB_CACHE_TTL_SECONDS, config.JOB_CACHE_MAX_LOG_LINES)
+            threading.Thread(
+                target=_listen_for_invalidations, args=(_job_cache,), name="job-cache-invalidation", daemon=True
+            ).start()
+    return _job_cache
@@ -0,0 +1,131 @@
+import json
+from abc import ABC, abstractmethod
+from datetime import datetime
+from enum import Enum
+from typing import Any, Literal
+from uuid import UUID
+
+from config import config
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None  # type: ignore[assignment]
+
+
+class JobCodec(ABC):
+    """Encodes the values of the fields in a job store record.
+
+    Values are prefixed with the codec's 'tag', which identifies the codec and its version, so records written
+    with any codec can be read regardless of the configured codec. JSON values have no tag, as they were written
+    before codecs were introduced. A new version of a codec must use a new tag.
+    """
+
+    name: str
+    tag: bytes
+    # The pydantic serialization mode of the values passed to encode()
+    dump_mode: Literal["json", "python"] = "json"
+
+    @abstractmethod
+    def encode(self, value: Any) -> bytes:
+        """Encode a value, including the tag."""
+
+    @abstractmethod
+    def decode(self, data: bytes) -> Any:
+        """Decode a value, without the tag."""
+
+
+class JsonCodec(JobCodec):
+    """Plain JSON, readable by all versions of the job API. Uses orjson when it is installed."""
+
+    name = "json"
+    tag = b""
+
+    def encode(self, value: Any) -> bytes:
+        if orjson:
+            return orjson.dumps(value)  # type: ignore[no-any-return]
+        return json.dumps(value).encode()
+
+    def decode(self, data: bytes) -> Any:
+        if orjson:
+            return orjson.loads(data)
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    """JSON encoded by orjson from python values, skipping pydantic's JSON serialization of the job."""
+
+    name = "orjson"
+    dump_mode = "python"
+
+    def __init__(self):
+        if not orjson:
+            raise ImportError("The 'orjson' job store codec requires the orjson package")
+
+    def encode(self, value: Any) -> bytes:
+        return orjson.dumps(value)  # type: ignore[no-any-return]
+
+
+def _msgpack_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Can not encode {type(value).__name__} with msgpack")
+
+
+class MsgpackCodec(JobCodec):
+    """MessagePack, version 1. Datetimes and uids are stored as strings."""
+
+    name = "msgpack"
+    tag = b"\x01"
+    dump_mode = "python"
+
+    def __init__(self):
+        if not msgpack:
+            raise ImportError("The 'msgpack' job store codec requires the msgpack package")
+
+    def encode(self, value: Any) -> bytes:
+        return self.tag + msgpack.packb(value, default=_msgpack_default)  # type: ignore[union-attr,no-any-return]
+
+    def decode(self, data: bytes) -> Any:
+        return msgpack.unpackb(data)  # type: ignore[union-attr]
+
+
+CODECS: dict[str, type[JobCodec]] = {codec.name: codec for codec in (JsonCodec, OrjsonCodec, MsgpackCodec)}
+
+_json_codec = JsonCodec()
+_tagged_codecs: dict[int, JobCodec] = {}
+_codec: JobCodec | None = None
+
+
+def get_codec() -> JobCodec:
+    """Get the codec that new values are written with, as set by JOB_STORE_CODEC."""
+    global _codec
+    if _codec is None:
+        if config.JOB_STORE_CODEC not in CODECS:
+            raise ValueError(
+                f"Unknown job store codec '{config.JOB_STORE_CODEC}'. Supported codecs are: {', '.join(CODECS)}"
+            )
+        _codec = CODECS[config.JOB_STORE_CODEC]()
+    return _codec
+
+
+def decode_value(data: str | bytes) -> Any:
+    """Decode a value written by any codec. Values without a known tag are decoded as JSON."""
+    if isinstance(data, str):
+        data = data.encode()
+    tag = data[0] if data else None
+    for codec in CODECS.values():
+        if codec.tag and codec.tag[0] == tag:
+            if tag not in _tagged_codecs:
+                _tagged_codecs[tag] = codec()
+            return _tagged_codecs[tag].decode(data[1:])
+    return _json_codec.decode(data)
@@ -4,7 +4,8 @@ from enum import Enum
 from typing import Tuple
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+from starlette.concurrency import run_in_threadpool
 
 from services.dmss import get_document
 
@@ -44,6 +45,10 @@ class Job(BaseModel):
     token: str | None = None
     state: dict | None = None
     external_progress: bool = False
+    # When the job was last handed to its job handler's start(). Jobs waiting to be started do not have it.
+    dispatched: datetime | None = None
+    # When the status was last got by the job handler's refresh(), in the background of the scheduler's leader
+    refreshed: datetime | None = None
 
     # Fields that are not sendt to DMSS
     exclude_keys: dict = {
@@ -53,18 +58,41 @@ class Job(BaseModel):
         "token": True,  # nosec B105
         "state": True,
         "external_progress": True,
+        "dispatched": True,
+        "refreshed": True,
         "exclude_keys": True,
     }
 
+    # Log lines that have not been written to the job store yet
+    _new_log_lines: list = PrivateAttr(default_factory=list)
+    _log_replaced: bool = PrivateAttr(default=False)
+
     def append_log(self, log: list | str):
         if not isinstance(log, list):
             logs = log.split("\n")
             log = [line for line in logs if line]
+        self._new_log_lines.extend(log)
         if self.log:
             self.log.extend(log)
             return
 
-        self.log = log
+        self.log = list(log)
+
+    def set_log(self, log: list):
+        """Replace the log. If the new log continues the current one, it is only appended to."""
+        current_log = self.log or []
+        if log[: len(current_log)] == current_log:
+            self.append_log(log[len(current_log) :])
+            return
+        self.log = list(log)
+        self._new_log_lines = list(log)
+        self._log_replaced = True
+
+    def pop_log_changes(self) -> Tuple[list, bool]:
+        """Get the log lines added since the last call, and whether the log was replaced."""
+        changes = self._new_log_lines, self._log_replaced
+        self._new_log_lines, self._log_replaced = [], False
+        return changes
 
     def set_job_status(self, status: JobStatus):
         if status == self.status:
@@ -76,10 +104,31 @@ class Job(BaseModel):
 
 
 class JobHandlerInterface(ABC):
+    # Whether the handler can be kept and reused for later calls for the same job. The 'job' attribute is
+    # replaced with the latest version of the job before every reuse, so a reusable handler must not keep
+    # other state derived from the job, except from the job's uid and runner.
+    reusable: bool = False
+    # Whether the caller of progress() uses the log. If not, the handler can skip fetching it, and return None.
+    fetch_logs: bool = True
+    # Whether a job that is still starting JOB_START_TIMEOUT_SECONDS after it was handed to start() is failed,
+    # and removed from the backend with remove(). Leave it off if the backend can keep jobs queued for longer.
+    start_timeout: bool = False
+
     def __init__(self, job: Job, data_source: str):
         self.job = job
         self.data_source = data_source
 
+    @classmethod
+    def refresh(cls, jobs: list[Job]) -> dict[UUID, JobStatus]:
+        """Get the status of several starting or running jobs at once, if the backend can list them in one call.
+
+        Called periodically in a background thread with all active jobs of the handler's runner types, so their
+        status is kept up to date without calling progress() for each job. Jobs missing from the result are not
+        updated. Handlers can update the state of the jobs as well. The jobs that got a status have their 'refreshed'
+        field set, so progress() can use a recently refreshed status instead of getting it again.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def start(self) -> str:
         """Run or deploy a job or job service"""
@@ -105,6 +154,101 @@ class JobHandlerInterface(ABC):
         raise NotImplementedError
 
 
+class AsyncJobHandlerInterface(ABC):
+    """A job handler whose operations are coroutines.
+
+    The API awaits them on its event loop, so requests waiting for a slow backend do not hold a worker thread.
+    Operations run by the scheduler, or for bulk status requests, are run to completion in a new event loop
+    in a worker thread, so clients bound to one event loop should be created in the operation that uses them.
+    """
+
+    # See JobHandlerInterface.reusable, JobHandlerInterface.fetch_logs and JobHandlerInterface.start_timeout
+    reusable: bool = False
+    fetch_logs: bool = True
+    start_timeout: bool = False
+
+    def __init__(self, job: Job, data_source: str):
+        self.job = job
+        self.data_source = data_source
+
+    @classmethod
+    def refresh(cls, jobs: list[Job]) -> dict[UUID, JobStatus]:
+        """See JobHandlerInterface.refresh(). Called in a worker thread, without an event loop."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def start(self) -> str:
+        """Run or deploy a job or job service"""
+
+    async def remove(self) -> Tuple[JobStatus, str]:
+        """Terminate and cleanup all job related resources"""
+        raise NotImplementedError
+
+    async def progress(self) -> Tuple[JobStatus, None | list[str] | str, None | float]:
+        """Poll progress from the job instance"""
+        raise NotImplementedError
+
+    async def result(self) -> Tuple[str, bytes]:
+        """Returns a string for free text and the result of the job as a bytearray"""
+        raise NotImplementedError
+
+    async def setup_service(self, service_id: str) -> str:
+        """Start a persistent service"""
+        raise NotImplementedError
+
+    async def teardown_service(self, service_id: str) -> str:
+        """Teardown and cleanup a persistent service"""
+        raise NotImplementedError
+
+
+class SyncJobHandlerAdapter(AsyncJobHandlerInterface):
+    """Runs the operations of a synchronous job handler in a worker thread, so it can be awaited."""
+
+    def __init__(self, job_handler: JobHandlerInterface):
+        self.job_handler = job_handler
+        self.data_source = job_handler.data_source
+
+    @property  # type: ignore[override]
+    def job(self) -> Job:
+        return self.job_handler.job
+
+    @job.setter
+    def job(self, job: Job) -> None:
+        self.job_handler.job = job
+
+    @property  # type: ignore[override]
+    def fetch_logs(self) -> bool:
+        return self.job_handler.fetch_logs
+
+    @fetch_logs.setter
+    def fetch_logs(self, fetch_logs: bool) -> None:
+        self.job_handler.fetch_logs = fetch_logs
+
+    async def start(self) -> str:
+        return await run_in_threadpool(self.job_handler.start)
+
+    async def remove(self) -> Tuple[JobStatus, str]:
+        return await run_in_threadpool(self.job_handler.remove)
+
+    async def progress(self) -> Tuple[JobStatus, None | list[str] | str, None | float]:
+        return await run_in_threadpool(self.job_handler.progress)
+
+    async def result(self) -> Tuple[str, bytes]:
+        return await run_in_threadpool(self.job_handler.result)
+
+    async def setup_service(self, service_id: str) -> str:
+        return await run_in_threadpool(self.job_handler.setup_service, service_id)
+
+    async def teardown_service(self, service_id: str) -> str:
+        return await run_in_threadpool(self.job_handler.teardown_service, service_id)
+
+
+def as_async_job_handler(job_handler: JobHandlerInterface | AsyncJobHandlerInterface) -> AsyncJobHandlerInterface:
+    if isinstance(job_handler, AsyncJobHandlerInterface):
+        return job_handler
+    return SyncJobHandlerAdapter(job_handler)
+
+
 def dmss_sync(job: Job) -> Job:
     fetched: dict = get_document(job.dmss_id, 0, job.token)
     job_dict = job.model_dump(mode="json")
@@ -117,4 +261,7 @@ def dmss_sync(job: Job) -> Job:
     new_job = Job.model_validate(merged_kwargs)
     # For some reason, "token" does not survive the exporting and parsing...
     new_job.token = job.token
+    # The log is not stored in DMSS
+    new_job.log = job.log
+    new_job._new_log_lines, new_job._log_replaced = job.pop_log_changes()
     return new_job
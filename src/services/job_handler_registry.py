@@ -0,0 +1,176 @@
+import ast
+import importlib
+import importlib.util
+import pkgutil
+import sys
+import threading
+import traceback
+from importlib.metadata import entry_points
+from types import ModuleType
+from typing import Any, Iterable
+
+from config import config
+from restful.exceptions import NotImplementedException
+from services.job_handler_interface import (
+    AsyncJobHandlerInterface,
+    JobHandlerInterface,
+)
+from utils.logging import logger
+
+# Packages with one job handler module (folder) each
+HANDLER_PACKAGES = ("default_job_handlers", "job_handler_plugins")
+# Installed distributions can add job handler modules with entry points in this group
+ENTRY_POINT_GROUP = "dm_job.job_handlers"
+
+
+def _as_types(supported_type: Any) -> tuple[str, ...]:
+    return (supported_type,) if isinstance(supported_type, str) else tuple(supported_type)
+
+
+def _read_supported_types(module_name: str) -> tuple[str, ...] | None:
+    """Read the literal value of '_SUPPORTED_TYPE' from the source of a module, without importing it.
+
+    Returns None if the source is not available, or the value is not a literal.
+    """
+    spec = importlib.util.find_spec(module_name)
+    if spec is None or not spec.origin or not spec.origin.endswith(".py"):
+        return None
+    with open(spec.origin, "rb") as source:
+        tree = ast.parse(source.read(), spec.origin)
+    for node in tree.body:
+        if isinstance(node, ast.Assign):
+            targets = node.targets
+        elif isinstance(node, ast.AnnAssign) and node.value is not None:
+            targets = [node.target]
+        else:
+            continue
+        if any(isinstance(target, ast.Name) and target.id == "_SUPPORTED_TYPE" for target in targets):
+            try:
+                return _as_types(ast.literal_eval(node.value))  # type: ignore[arg-type]
+            except ValueError:
+                return None
+    return None
+
+
+class JobHandlerRegistry:
+    """Maps runner types to job handler classes.
+
+    A job handler module is a folder in one of the handler packages, or a module referenced by an entry point in
+    the ENTRY_POINT_GROUP group. The module must implement a class called "JobHandler" that inherits from the
+    JobHandlerInterface or the AsyncJobHandlerInterface class, and a global variable named '_SUPPORTED_TYPE' with
+    the runner type, or a tuple or list of runner types, that it handles.
+
+    The runner types are read from the source of the modules when the registry is loaded, and a module is only
+    imported when a job of one of its types is handled. So the dependencies of handlers that are never used,
+    like the Azure SDK, are not imported. Modules that do not assign a literal value to '_SUPPORTED_TYPE'
+    are imported when the registry is loaded.
+    If several modules handle the same runner type, the first one found is used.
+    """
+
+    def __init__(
+        self,
+        packages: Iterable[str] = HANDLER_PACKAGES,
+        entry_point_group: str | None = ENTRY_POINT_GROUP,
+        enabled: Iterable[str] | None = None,
+    ):
+        self.packages = tuple(packages)
+        self.entry_point_group = entry_point_group
+        # The names of the handler folders and entry points to use, or None to use all of them
+        self.enabled = set(enabled) if enabled else None
+        # Runner type -> the name of the module handling it
+        self._modules: dict[str, str] | None = None
+        # Runner type -> the handler class, for the modules that have been imported
+        self._handlers: dict[str, type[JobHandlerInterface | AsyncJobHandlerInterface]] = {}
+        # Modules imported before the registry was reloaded, which are re-imported when they are used again
+        self._stale: set[str] = set()
+        self._lock = threading.RLock()
+
+    def get(self, runner_type: str) -> type[JobHandlerInterface | AsyncJobHandlerInterface]:
+        """Get the job handler class for a runner type, importing its module if this is the first time."""
+        if handler := self._handlers.get(runner_type):
+            return handler
+        modules = self.load()
+        if runner_type not in modules:
+            raise NotImplementedException(f"No handler for a job of type '{runner_type}' is configured")
+        with self._lock:
+            if runner_type not in self._handlers:
+                self._register(self._import(modules[runner_type]), modules)
+            if handler := self._handlers.get(runner_type):
+                return handler
+        raise NotImplementedException(f"The handler module '{modules[runner_type]}' does not handle '{runner_type}'")
+
+    def runner_types(self) -> list[str]:
+        return list(self.load())
+
+    def load(self) -> dict[str, str]:
+        """Find the job handler modules, unless they are already found, and return the module per runner type."""
+        if self._modules is not None:
+            return self._modules
+        with self._lock:
+            if self._modules is None:
+                self._modules = self._find_modules()
+                logger.info(f"Registered job handlers for {len(self._modules)} runner types")
+            return self._modules
+
+    def reload(self) -> dict[str, str]:
+        """Find the job handler modules again. Modules that were already imported are re-imported when used."""
+        with self._lock:
+            self._stale.update(handler.__module__ for handler in self._handlers.values())
+            self._handlers = {}
+            self._modules = None
+            return self.load()
+
+    def _enabled(self, name: str) -> bool:
+        return self.enabled is None or name in self.enabled
+
+    def _find_modules(self) -> dict[str, str]:
+        module_names = []
+        for package_name in self.packages:
+            package = importlib.import_module(package_name)
+            for module_info in sorted(pkgutil.iter_modules(package.__path__), key=lambda info: info.name):
+                # Python modules can not start with "_"
+                if module_info.ispkg and module_info.name[0] != "_" and self._enabled(module_info.name):
+                    module_names.append(f"{package_name}.{module_info.name}")
+        if self.entry_point_group:
+            for entry_point in entry_points(group=self.entry_point_group):
+                if self._enabled(entry_point.name):
+                    module_names.append(entry_point.module)
+
+        modules: dict[str, str] = {}
+        for module_name in module_names:
+            runner_types = _read_supported_types(module_name)
+            if runner_types is None:
+                runner_types = _as_types(self._import(module_name)._SUPPORTED_TYPE)
+            for runner_type in runner_types:
+                if runner_type in modules:
+                    logger.warning(
+                        f"Both '{modules[runner_type]}' and '{module_name}' handle jobs of type "
+                        f"'{runner_type}'. Using '{modules[runner_type]}'"
+                    )
+                    continue
+                modules[runner_type] = module_name
+        return modules
+
+    def _import(self, module_name: str) -> ModuleType:
+        try:
+            if module_name in self._stale and module_name in sys.modules:
+                self._stale.discard(module_name)
+                return importlib.reload(sys.modules[module_name])
+            return importlib.import_module(module_name)
+        except ImportError as error:
+            traceback.print_exc()
+            raise ImportError(
+                f"Failed to import a job handler module: '{error}'"
+                + "Make sure the module has a '_init_.py' file, a 'JobHandler' class implementing "
+                + "the JobHandlerInterface, and a global variable named '_SUPPORTED_TYPE' "
+                + "with the string, tuple, or list value of the job type(s)."
+            )
+
+    def _register(self, module: ModuleType, modules: dict[str, str]) -> None:
+        """Register the handler class of an imported module, for the runner types the module is used for."""
+        for runner_type in _as_types(module._SUPPORTED_TYPE):
+            if modules.get(runner_type) == module.__name__:
+                self._handlers[runner_type] = module.JobHandler
+
+
+job_handler_registry = JobHandlerRegistry(enabled=config.ENABLED_JOB_HANDLERS)
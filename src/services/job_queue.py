@@ -0,0 +1,136 @@
+import threading
+from typing import NamedTuple
+
+import redis
+
+from config import config
+from services.job_store import SCHEDULER_DB, get_connection_pool
+
+# The Redis stream of jobs to start, and the consumer group of the workers reading it
+STREAM_KEY = "job-queue:start"
+CONSUMER_GROUP = "workers"
+
+
+class QueuedJob(NamedTuple):
+    message_id: str
+    job_uid: str
+    # 1 the first time the job is taken from the queue, and one more for every retry
+    attempt: int
+    # Whether the worker that took the job on its last attempt stopped before acknowledging it
+    abandoned: bool = False
+
+
+class JobQueue:
+    """A queue of jobs to start, in a Redis stream that is read by a consumer group of worker processes.
+
+    Each job is read by one worker, which acknowledges it with done() or gives it back with retry().
+    A job that is not acknowledged within 'claim_idle_seconds', because its worker stopped, is taken over by the
+    next worker reading the queue. A worker that takes longer to start a job must keep() it, more often than
+    that. A job is retried at most 'max_attempts' - 1 times. Thread-safe.
+    """
+
+    def __init__(self, client: redis.Redis, max_attempts: int = 3, claim_idle_seconds: float = 300):
+        self.client = client
+        self.max_attempts = max_attempts
+        self.claim_idle_ms = int(claim_idle_seconds * 1000)
+        self._group_created = False
+
+    def enqueue(self, job_uid: str, attempt: int = 1) -> str:
+        """Add a job to the queue, and return the id of its message."""
+        return self.client.xadd(STREAM_KEY, {"job_uid": job_uid, "attempt": attempt}).decode()  # type: ignore
+
+    def read(self, consumer: str, count: int = 1, block_ms: int = 2000) -> list[QueuedJob]:
+        """Take up to 'count' jobs from the queue for a worker, waiting up to 'block_ms' for a job to be added.
+
+        Jobs taken by workers that stopped before acknowledging them are retried first. Those that have used all
+        their attempts are returned as abandoned, for the worker to fail them, and acknowledge them with done().
+        """
+        self._create_group()
+        abandoned = []
+        for queued in self._claim_abandoned(consumer, count):
+            if queued.attempt >= self.max_attempts:
+                abandoned.append(queued)
+            else:
+                self.retry(queued)
+        if abandoned:
+            return abandoned
+        response: list = self.client.xreadgroup(  # type: ignore[assignment]
+            CONSUMER_GROUP, consumer, {STREAM_KEY: ">"}, count=count, block=block_ms
+        )
+        return [self._parse(message_id, fields) for _, messages in response or [] for message_id, fields in messages]
+
+    def done(self, queued: QueuedJob) -> None:
+        """Acknowledge a job, and remove it from the queue."""
+        with self.client.pipeline() as pipe:
+            pipe.xack(STREAM_KEY, CONSUMER_GROUP, queued.message_id)
+            pipe.xdel(STREAM_KEY, queued.message_id)
+            pipe.execute()
+
+    def retry(self, queued: QueuedJob) -> bool:
+        """Put a job back at the end of the queue, unless it has used all its attempts. Returns whether it was."""
+        if queued.attempt >= self.max_attempts:
+            self.done(queued)
+            return False
+        with self.client.pipeline() as pipe:
+            pipe.xadd(STREAM_KEY, {"job_uid": queued.job_uid, "attempt": queued.attempt + 1})
+            pipe.xack(STREAM_KEY, CONSUMER_GROUP, queued.message_id)
+            pipe.xdel(STREAM_KEY, queued.message_id)
+            pipe.execute()
+        return True
+
+    def keep(self, queued: QueuedJob, consumer: str) -> None:
+        """Reset the idle time of a job that a worker is still starting, so no other worker takes it over."""
+        self.client.xclaim(
+            STREAM_KEY, CONSUMER_GROUP, consumer, min_idle_time=0, message_ids=[queued.message_id], justid=True
+        )
+
+    def leave(self, consumer: str) -> None:
+        """Remove a stopped worker from the consumer group, unless it has jobs that are not acknowledged.
+
+        Those are retried by another worker once they have been idle for 'claim_idle_seconds'.
+        """
+        if not self.client.xpending_range(STREAM_KEY, CONSUMER_GROUP, "-", "+", 1, consumername=consumer):
+            self.client.xgroup_delconsumer(STREAM_KEY, CONSUMER_GROUP, consumer)
+
+    def _claim_abandoned(self, consumer: str, count: int) -> list[QueuedJob]:
+        _, messages, *_ = self.client.xautoclaim(
+            STREAM_KEY, CONSUMER_GROUP, consumer, min_idle_time=self.claim_idle_ms, start_id="0-0", count=count
+        )  # type: ignore[misc]
+        return [self._parse(message_id, fields)._replace(abandoned=True) for message_id, fields in messages if fields]
+
+    def _create_group(self) -> None:
+        if self._group_created:
+            return
+        try:
+            self.client.xgroup_create(STREAM_KEY, CONSUMER_GROUP, id="0", mkstream=True)
+        except redis.ResponseError as error:
+            if "BUSYGROUP" not in str(error):  # The group already exists
+                raise
+        self._group_created = True
+
+    @staticmethod
+    def _parse(message_id: bytes, fields: dict[bytes, bytes]) -> QueuedJob:
+        return QueuedJob(message_id.decode(), fields[b"job_uid"].decode(), int(fields[b"attempt"]))
+
+
+_job_queue: JobQueue | None = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """Get the process-wide job queue, in the scheduler's Redis database."""
+    global _job_queue
+    if config.JOB_STORE_BACKEND != "redis":
+        # The workers would start the jobs from job stores of their own, and not the ones the API stores jobs in
+        raise ValueError(
+            f"JOB_QUEUE requires JOB_STORE_BACKEND=redis, not '{config.JOB_STORE_BACKEND}', "
+            "so the workers share the job store"
+        )
+    with _job_queue_lock:
+        if _job_queue is None:
+            _job_queue = JobQueue(
+                redis.Redis(connection_pool=get_connection_pool(SCHEDULER_DB)),
+                config.JOB_QUEUE_MAX_ATTEMPTS,
+                config.JOB_QUEUE_CLAIM_IDLE_SECONDS,
+            )
+        return _job_queue
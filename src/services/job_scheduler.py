@@ -1,17 +1,143 @@
+import functools
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+import redis
+from apscheduler.executors.pool import ThreadPoolExecutor
+from apscheduler.jobstores.memory import MemoryJobStore
 from apscheduler.jobstores.redis import RedisJobStore
 from apscheduler.schedulers.background import BackgroundScheduler
 
 from config import config
+from services.job_store import SCHEDULER_DB, get_connection_pool
+from services.leader_election import LeaderElection
 
-jobstores = {
-    "redis_job_store": RedisJobStore(
-        db=6,  # DMSS is using 0-3
-        host=config.SCHEDULER_REDIS_HOST,
-        port=config.SCHEDULER_REDIS_PORT,
-        password=config.SCHEDULER_REDIS_PASSWORD,
-        ssl=config.SCHEDULER_REDIS_SSL,
+# The scheduler job store holding the scheduled runs of jobs. It is persistent when the job store is.
+JOBSTORE = "jobs"
+# The Redis key of the lease held by the process that runs the jobs in the shared job store
+LEADER_KEY = "job-scheduler:leader"
+_RENEW_JOB_ID = "renew-scheduler-leadership"
+# The executor renewing the lease, so it is renewed in time even when all the other threads are busy
+_LEADER_EXECUTOR = "leader-election"
+
+# Whether this process is a worker, see run_as_worker()
+_worker = False
+
+
+def runner_executor(name: str) -> str:
+    """The alias of the executor starting the jobs of a runner type or handler in SCHEDULER_RUNNER_EXECUTORS."""
+    return f"runner:{name}"
+
+
+class _LeaderJobStore(RedisJobStore):
+    """A Redis job store that every process can add jobs to, but whose jobs are only run by the elected leader."""
+
+    def __init__(self, election: LeaderElection, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.election = election
+
+    def get_due_jobs(self, now: datetime) -> list:
+        return super().get_due_jobs(now) if self.election.is_leader else []
+
+    def get_next_run_time(self) -> datetime | None:
+        return super().get_next_run_time() if self.election.is_leader else None
+
+
+def _on_leadership_change(leader: bool) -> None:
+    if leader:
+        scheduler.wakeup()  # Run the jobs that are due now
+
+
+# All the processes, in all the replicas of the API, share the job store when it is in Redis.
+# Only the leader runs its jobs, so each job is started once, while all of them serve the API.
+leader_election = (
+    LeaderElection(
+        redis.Redis(connection_pool=get_connection_pool(SCHEDULER_DB)),
+        LEADER_KEY,
+        config.SCHEDULER_LEADER_LEASE_SECONDS,
+        on_change=_on_leadership_change,
     )
+    if config.JOB_STORE_BACKEND == "redis"
+    else None
+)
+
+jobstores = {
+    JOBSTORE: (
+        _LeaderJobStore(leader_election, connection_pool=get_connection_pool(SCHEDULER_DB))
+        if leader_election
+        else MemoryJobStore()
+    ),
+}
+
+# Each executor is a bulkhead: the jobs of a runner type with its own executor can only use its threads,
+# so that at most that many of them are started at the same time, and they can not take the threads of others.
+executors = {
+    "default": ThreadPoolExecutor(config.SCHEDULER_MAX_WORKERS),
+    **{
+        runner_executor(name): ThreadPoolExecutor(int(max_workers))
+        for name, max_workers in config.SCHEDULER_RUNNER_EXECUTORS.items()
+    },
+    _LEADER_EXECUTOR: ThreadPoolExecutor(1),
 }
 
-scheduler = BackgroundScheduler(jobstores=jobstores, timezone="Etc/UTC")
+# Runs that were due while the leadership changed hands are still run by the new leader
+job_defaults = {"misfire_grace_time": config.SCHEDULER_LEADER_LEASE_SECONDS + config.SCHEDULER_LEADER_RENEW_SECONDS}
+
+scheduler = BackgroundScheduler(
+    jobstores=jobstores, executors=executors, job_defaults=job_defaults, timezone="Etc/UTC"
+)
 scheduler.start()
+
+if leader_election:
+    # Renewing the lease also wakes the scheduler, so the leader picks up the jobs added by other processes
+    scheduler.add_job(
+        leader_election.renew,
+        trigger="interval",
+        seconds=config.SCHEDULER_LEADER_RENEW_SECONDS,
+        next_run_time=datetime.now(timezone.utc),
+        id=_RENEW_JOB_ID,
+        executor=_LEADER_EXECUTOR,
+        replace_existing=True,
+        coalesce=True,
+        max_instances=1,
+    )
+
+
+def is_scheduler_leader() -> bool:
+    """Whether this process runs the jobs in the shared scheduler job store."""
+    return leader_election is None or leader_election.is_leader
+
+
+def leader_only(function: Callable[[], Any]) -> Callable[[], Any]:
+    """Wrap a periodic task that covers the jobs of all processes, so only the leader runs it."""
+
+    @functools.wraps(function)
+    def run_if_leader() -> Any:
+        return function() if is_scheduler_leader() else None
+
+    return run_if_leader
+
+
+def run_as_worker() -> None:
+    """Make this process a worker, which starts the jobs in the job queue.
+
+    Workers never run the jobs in the shared job store. Their other scheduled tasks still run.
+    """
+    global _worker
+    _worker = True
+    if leader_election:
+        scheduler.remove_job(_RENEW_JOB_ID)
+        leader_election.close()
+
+
+def starts_jobs() -> bool:
+    """Whether jobs are started in this process: by the workers if jobs are queued, or else by the leader."""
+    return _worker if config.JOB_QUEUE else is_scheduler_leader()
+
+
+def stop_scheduler() -> None:
+    """Stop running scheduled jobs in this process, and let another process take over the leadership right away."""
+    if scheduler.running:
+        scheduler.shutdown()
+    if leader_election:
+        leader_election.resign()
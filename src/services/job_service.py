@@ -1,17 +1,23 @@
 from __future__ import annotations
 
-import importlib
-import json
+import asyncio
+import contextvars
+import inspect
+import threading
 import traceback
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
-from pathlib import Path
-from typing import Callable, Tuple
+from itertools import batched
+from time import perf_counter, time
+from typing import Any, Callable, Iterable, Iterator, Tuple
 from uuid import UUID, uuid4
 
-import redis
 from apscheduler.jobstores.base import JobLookupError
 from apscheduler.schedulers.background import BackgroundScheduler
 from redis import AuthenticationError
+from starlette.concurrency import run_in_threadpool
 
 from config import config
 from domain_classes.progress import Progress
@@ -22,29 +28,56 @@ from restful.exceptions import (
 )
 from restful.responses import get_traceback
 from services.dmss import get_document, get_personal_access_token, update_document
+from services.job_cache import get_job_cache
+from services.job_codec import decode_value, get_codec
 
 # TODO: Authorization. The only level of authorization at this point is to allow all that
 #  can view the job entity to also run and delete the job.
 from services.job_handler_interface import (
+    AsyncJobHandlerInterface,
     Job,
     JobHandlerInterface,
     JobStatus,
+    as_async_job_handler,
     dmss_sync,
 )
-from services.job_scheduler import scheduler
+from services.job_handler_registry import job_handler_registry
+from services.job_queue import get_job_queue
+from services.job_scheduler import JOBSTORE, leader_only, runner_executor, scheduler
+from services.job_store import SCHEMA_VERSION, get_job_store
 from utils.logging import logger
 
-
-def get_job_store():
-    return redis.Redis(
-        host=config.SCHEDULER_REDIS_HOST,
-        port=config.SCHEDULER_REDIS_PORT,
-        db=5,  # DMSS is using 0-3
-        password=config.SCHEDULER_REDIS_PASSWORD,
-        ssl=config.SCHEDULER_REDIS_SSL,
-        socket_timeout=5,
-        socket_connect_timeout=5,
-    )
+# How many jobs to fetch from the job store per round-trip when loading jobs in bulk
+_BATCH_SIZE = 500
+
+# Shared by all bulk status requests, to bound the number of concurrent job handler progress() calls
+_status_executor: ThreadPoolExecutor | None = None
+_status_executor_lock = threading.Lock()
+
+# Reusable job handlers per job uid, least recently used first. A handler is taken out while it is used,
+# so it is never used by two threads at once.
+_job_handlers: OrderedDict[UUID, JobHandlerInterface | AsyncJobHandlerInterface] = OrderedDict()
+_job_handlers_lock = threading.Lock()
+
+# Fields of a job that are stored in the job store record. The log is stored separately.
+_STORED_FIELDS = tuple(field for field in Job.model_fields if field not in ("exclude_keys", "log"))
+# Fields of a job that are needed to schedule it
+_SCHEDULE_FIELDS = ("type", "dmss_id", "job_uid", "schedule")
+# Fields of a job that are updated when progress is reported. 'started' is written with 'status' to keep the
+# status index up to date.
+_PROGRESS_FIELDS = ("status", "started", "ended", "percentage", "external_progress")
+# Fields of a job that are updated when a job handler is polled for progress. Job handlers can update the state.
+_POLLED_FIELDS = (*_PROGRESS_FIELDS, "state")
+# Fields of a job that are set when it is started by its job handler, and those written with its status
+_START_FIELDS = ("dispatched", "state")
+_STARTED_FIELDS = (*_START_FIELDS, "status", "started", "ended")
+# The refresh() of the job handler interfaces, which job handlers that can not refresh jobs in bulk inherit
+_BASE_REFRESH = (
+    getattr(JobHandlerInterface.refresh, "__func__"),
+    getattr(AsyncJobHandlerInterface.refresh, "__func__"),
+)
+# Fields of a job that are returned when listing jobs
+_SUMMARY_FIELDS = ("job_uid", "dmss_id", "name", "label", "type", "status", "runner", "started", "ended", "percentage")
 
 
 def schedule_cron_job(job_scheduler: BackgroundScheduler, function: Callable, job: Job) -> str:
@@ -71,7 +104,7 @@ def schedule_cron_job(job_scheduler: BackgroundScheduler, function: Callable, jo
             day_of_week=day_of_week,
             id=str(job.job_uid),
             replace_existing=True,
-            jobstore="redis_job_store",
+            jobstore=JOBSTORE,
         )
         if datetime.fromisoformat(job.schedule["startDate"]) > datetime.now(timezone.utc):
             return f"Cron job successfully registered. Next run wil be after {datetime.fromisoformat(job.schedule['startDate'])}"
@@ -80,66 +113,388 @@ def schedule_cron_job(job_scheduler: BackgroundScheduler, function: Callable, jo
         raise BadRequestException(message=f"Failed to schedule cron job '{job.job_uid}'.", debug=str(e))
 
 
-def _get_job(job_uid: UUID) -> Job:
-    """Get a job from the job storage."""
+def _encode_job(job: Job, fields: Iterable[str] | None = None) -> dict[str, bytes]:
+    """Encode a job as a job store record, with one value per field encoded by the configured codec."""
+    codec = get_codec()
+    values = job.model_dump(mode=codec.dump_mode, include=set(fields or _STORED_FIELDS))
+    return {field: codec.encode(value) for field, value in values.items()}
+
+
+def _decode_job_fields(record: dict[str, bytes]) -> dict:
+    return {field: decode_value(value) for field, value in record.items()}
+
+
+def _job_from_record(values: dict, log: list[str]) -> Job:
+    """Create a job from its decoded fields and log lines.
+
+    The log lines are strings read from the job store, so they are assigned without validation, which would
+    otherwise dominate the time it takes to read a job with a long log.
+    """
+    job = Job(**values)
+    job.log = log
+    return job
+
+
+def _read_job(
+    job_uid: UUID, fields: Tuple[str, ...] = (), log_range: Tuple[int, int] | None = None
+) -> Tuple[dict, list[str], int]:
+    """Read the fields of a job, and optionally a range of its log, from the job storage.
+
+    Returns the decoded fields, the log lines and the total number of log lines.
+    Whole jobs are read through the job cache, which can also answer reads of some fields and part of the log.
+    """
+    key = str(job_uid)
+    job_cache = get_job_cache()
+    cached = job_cache.get(key) if job_cache else None
+    if cached and (log_range is None or cached.log is not None):
+        record = {field: value for field, value in cached.record.items() if not fields or field in fields}
+        if not log_range:
+            return _decode_job_fields(record), [], 0
+        start, end = log_range
+        return _decode_job_fields(record), list(cached.log[start : end + 1 or None]), len(cached.log)  # type: ignore
+
+    generation = job_cache.generation() if job_cache else 0
     try:
-        if raw_job := get_job_store().get(str(job_uid)):
-            return Job(**json.loads(raw_job.decode()))
+        if log_range:
+            record, log, log_length = get_job_store().get_record_and_log(key, fields, *log_range)
         else:
-            raise NotFoundException(f"No job with id '{job_uid}' is registered")
+            record, log, log_length = get_job_store().get_record(key, fields), [], 0
     except AuthenticationError:
         raise ValueError(
             "Tried to fetch a job from Redis but no password"
             + " was supplied. Make sure SCHEDULER_REDIS_PASSWORD is set."
         )
+    if not record:
+        raise NotFoundException(f"No job with id '{job_uid}' is registered")
+    if job_cache and not fields and log_range in (None, (0, -1)):
+        job_cache.put(key, record, log if log_range else None, generation)
+    return _decode_job_fields(record), log, log_length
+
+
+def _get_job_fields_and_log(
+    job_uid: UUID, *fields: str, offset: int = 0, limit: int | None = None, tail: int | None = None
+) -> Tuple[dict, list[str], int, int]:
+    """Get some fields of a job and a page of its log from the job storage.
+
+    Returns the fields, the log lines, the index of the first returned log line and the total number of log lines.
+    """
+    start, end = _log_range(offset, limit, tail)
+    values, log, log_length = _read_job(job_uid, fields, (start, end))
+    return values, log, _log_offset(start, log_length), log_length
+
 
+def _log_range(offset: int = 0, limit: int | None = None, tail: int | None = None) -> Tuple[int, int]:
+    """The first and last (inclusive) log line to return. Negative indexes count from the end of the log."""
+    if tail:
+        return -tail, -1
+    return offset, offset + limit - 1 if limit else -1
 
-def _set_job(job: Job):
-    return get_job_store().set(str(job.job_uid), job.model_dump_json())
 
+def _log_offset(start: int, log_length: int) -> int:
+    return max(log_length + start, 0) if start < 0 else min(start, log_length)
 
-def load_cron_jobs():
-    for key in get_job_store().scan_iter():
-        job = _get_job(UUID(key.decode()))
-        if job.schedule:
-            schedule_cron_job(scheduler, _run_job, job)
-            logger.info(f"Loaded and registered job '{job.job_uid}' from {config.SCHEDULER_REDIS_HOST}")
 
+def _page_log(
+    log: list[str], offset: int = 0, limit: int | None = None, tail: int | None = None
+) -> Tuple[list[str], int]:
+    """Get a page of a log that is already read, and the index of the first line in the page."""
+    start, end = _log_range(offset, limit, tail)
+    return log[start : end + 1 or None], _log_offset(start, len(log))
 
-def _get_job_handler(job: Job) -> JobHandlerInterface:
+
+def _get_job(job_uid: UUID, with_log: bool = True) -> Job:
+    """Get a job from the job storage. The whole log is included, unless 'with_log' is False."""
+    values, log, _ = _read_job(job_uid, log_range=(0, -1) if with_log else None)
+    return _job_from_record(values, log)
+
+
+def _set_job(job: Job, fields: Iterable[str] | None = None):
+    """Write a job to the job storage. If 'fields' is given, only those fields are written.
+
+    Log lines are appended to the stored log. The whole log is only written if it has been replaced.
+    A cached copy of the job is updated with the same changes.
+    """
+    key = str(job.job_uid)
+    values = _encode_job(job, fields)
+    new_log_lines, log_replaced = job.pop_log_changes()
+    job_cache = get_job_cache()
+    if not job_cache:
+        get_job_store().set_record(key, values, log=new_log_lines, replace_log=log_replaced)
+        return
+    cached = job_cache.begin_write(key)
+    written = False
+    try:
+        get_job_store().set_record(key, values, log=new_log_lines, replace_log=log_replaced)
+        written = True
+    finally:
+        job_cache.end_write(key, cached if written else None, values, new_log_lines, log_replaced)
+
+
+def migrate_job_store():
+    """Convert jobs stored by earlier versions of the job API to the current job store layout."""
+    if migrated := get_job_store().migrate_legacy_records():
+        logger.info(f"Migrated {migrated} jobs to job store schema version {SCHEMA_VERSION}")
+
+
+def load_cron_jobs() -> int:
+    """Register all scheduled jobs in the job store with the scheduler.
+
+    Only the jobs in the job store's set of scheduled jobs are read, in batches, and only the fields needed
+    to schedule them. Returns the number of jobs that were registered.
+    """
+    started = perf_counter()
+    job_store = get_job_store()
+    loaded = 0
+    for keys in batched(job_store.scan_scheduled(), _BATCH_SIZE):
+        for key, record in zip(keys, job_store.get_records(keys, _SCHEDULE_FIELDS)):
+            if not record:  # Removed while loading, or by an earlier version of the job API
+                job_store.set_scheduled(key, False)
+                continue
+            job = Job(**_decode_job_fields(record))
+            if not job.schedule:
+                job_store.set_scheduled(key, False)
+                continue
+            schedule_cron_job(scheduler, _start_scheduled_job, job)
+            loaded += 1
+    logger.info(
+        f"Loaded and registered {loaded} scheduled jobs from {config.SCHEDULER_REDIS_HOST} "
+        f"in {perf_counter() - started:.2f} seconds"
+    )
+    return loaded
+
+
+def compact_job_store() -> int:
+    """Remove finished jobs from the job store according to the retention policy.
+
+    The final state of a removed job is still available in its job entity in DMSS.
+    Returns the number of jobs that were removed.
+    """
+    started = perf_counter()
+    removed: int = get_job_store().compact(
+        ended_before=time() - config.JOB_RETENTION_SECONDS if config.JOB_RETENTION_SECONDS else None,
+        max_records=config.JOB_RETENTION_MAX_JOBS or None,
+        batch_size=_BATCH_SIZE,
+    )
+    logger.info(f"Removed {removed} finished jobs from the job store in {perf_counter() - started:.2f} seconds")
+    return removed
+
+
+def schedule_job_store_compaction() -> None:
+    """Run the job store compaction periodically, in the background of the scheduler's leader process."""
+    if not config.JOB_COMPACTION_INTERVAL_SECONDS:
+        return
+    scheduler.add_job(
+        leader_only(compact_job_store),
+        trigger="interval",
+        seconds=config.JOB_COMPACTION_INTERVAL_SECONDS,
+        id="compact-job-store",
+        replace_existing=True,
+        coalesce=True,
+        max_instances=1,
+    )
+
+
+def reconcile_starting_jobs() -> int:
+    """Poll the job handlers of started jobs that are still starting, so the jobs move on to running, completed
+    or failed also when nobody asks for their status. Job handlers can return from start() as soon as the job
+    is submitted to their backend, instead of waiting for it to run.
+
+    Jobs that are waiting for a scheduler thread or a worker to start them are skipped, and so are the jobs of
+    job handlers that can not be polled. Jobs of job handlers with a start timeout, that are still starting
+    JOB_START_TIMEOUT_SECONDS after they were handed to their job handler, are failed and removed.
+    Returns the number of jobs that are no longer starting.
+    """
+    job_store = get_job_store()
+    reconciled = 0
+    cursor = None
+    while True:
+        keys, cursor = job_store.list_records({"status": JobStatus.STARTING.value}, _BATCH_SIZE, cursor)
+        for key, (record, log, _) in zip(keys, job_store.get_records_and_logs(keys)):
+            if not record:
+                continue
+            values = _decode_job_fields(record)
+            if not values.get("dispatched") or values.get("external_progress"):
+                continue
+            try:
+                job = _reconcile_starting_job(_job_from_record(values, log))
+            except NotImplementedException:  # The job handler does not implement progress()
+                continue
+            except Exception as error:
+                logger.warning(f"Failed to poll the starting job '{key}': {error}")
+                continue
+            reconciled += job.status != JobStatus.STARTING
+        if not cursor:
+            return reconciled
+
+
+def _reconcile_starting_job(job: Job) -> Job:
+    if _start_timed_out(job):
+        try:
+            with _reused_job_handler(job) as job_handler:
+                _call_job_handler(job_handler, "remove")
+        except Exception as error:
+            logger.warning(f"Failed to remove the job '{job.job_uid}' that did not start: {error}")
+        progress = Progress(
+            status=JobStatus.FAILED,
+            logs=f"The job did not start within {config.JOB_START_TIMEOUT_SECONDS} seconds",
+            percentage=job.percentage,
+        )
+        return Job(**update_progress(job, progress, fields=_POLLED_FIELDS))
+    job = _poll_job_progress(job, fetch_logs=False)
+    if job.status != JobStatus.STARTING:
+        logger.info(f"Job '{job.job_uid}' is no longer starting, status: {job.status.value}")
+    return job
+
+
+def _start_timed_out(job: Job) -> bool:
+    """Whether a job of a job handler with a start timeout was handed to it longer than the timeout ago."""
+    if not job.dispatched or not job_handler_registry.get(job.runner["type"]).start_timeout:  # type: ignore[index]
+        return False
+    dispatched = job.dispatched.replace(tzinfo=job.dispatched.tzinfo or timezone.utc)
+    waited: timedelta = datetime.now(timezone.utc) - dispatched
+    return waited > timedelta(seconds=config.JOB_START_TIMEOUT_SECONDS)
+
+
+def schedule_job_reconciliation() -> None:
+    """Poll starting jobs periodically, in the background of the scheduler's leader process."""
+    if not config.JOB_RECONCILE_INTERVAL_SECONDS:
+        return
+    scheduler.add_job(
+        leader_only(reconcile_starting_jobs),
+        trigger="interval",
+        seconds=config.JOB_RECONCILE_INTERVAL_SECONDS,
+        id="reconcile-starting-jobs",
+        replace_existing=True,
+        coalesce=True,
+        max_instances=1,
+    )
+
+
+def refresh_active_jobs() -> int:
+    """Refresh the status of all starting and running jobs, for the job handlers that implement refresh().
+
+    Each of those job handlers gets the status of all its active jobs at once, instead of one job at a time
+    when the status of a job is asked for. Jobs with external progress tracking are not refreshed.
+    The time of the refresh is stored in the 'refreshed' field of each job the job handler got the status of.
+    Returns the number of jobs with a new status.
+    """
+    job_store = get_job_store()
+    refreshed = 0
+    for runner_type in job_handler_registry.runner_types():
+        handler_class = job_handler_registry.get(runner_type)
+        if getattr(handler_class.refresh, "__func__", None) in _BASE_REFRESH:
+            continue
+        keys: list[str] = []
+        for status in (JobStatus.STARTING, JobStatus.RUNNING):
+            cursor = None
+            while True:
+                page, cursor = job_store.list_records(
+                    {"runner": runner_type, "status": status.value}, _BATCH_SIZE, cursor
+                )
+                keys.extend(page)
+                if not cursor:
+                    break
+        jobs = []
+        for batch in batched(keys, _BATCH_SIZE):
+            for record, _, _ in job_store.get_records_and_logs(batch, log_range=None):
+                values = _decode_job_fields(record) if record else None
+                if values and not values.get("external_progress"):
+                    jobs.append(_job_from_record(values, []))
+        if not jobs:
+            continue
+        refreshed_at = datetime.now(timezone.utc)  # Before the statuses are got, so their age is not underestimated
+        try:
+            statuses = handler_class.refresh(jobs)
+        except Exception as error:
+            logger.warning(f"Failed to refresh the status of '{runner_type}' jobs: {error}")
+            continue
+        for job in jobs:
+            status = statuses.get(job.job_uid)
+            if status is None:
+                continue
+            # The time is stored with the status, so the job handler can use the status instead of getting it again
+            job.refreshed = refreshed_at
+            if status == job.status:
+                _set_job(job, ("refreshed",))
+                continue
+            progress = Progress(status=status, logs=None, percentage=job.percentage)
+            update_progress(job, progress, fields=(*_POLLED_FIELDS, "refreshed"))
+            refreshed += 1
+    return refreshed
+
+
+def schedule_job_status_refresh() -> None:
+    """Refresh the status of active jobs periodically, in the background of the scheduler's leader process."""
+    if not config.JOB_REFRESH_INTERVAL_SECONDS:
+        return
+    scheduler.add_job(
+        leader_only(refresh_active_jobs),
+        trigger="interval",
+        seconds=config.JOB_REFRESH_INTERVAL_SECONDS,
+        id="refresh-active-jobs",
+        replace_existing=True,
+        coalesce=True,
+        max_instances=1,
+    )
+
+
+def _start_executor(job: Job) -> str:
+    """The scheduler executor to start a job with: the executor of its runner type or handler, if it has one."""
+    runner_type: str = job.runner["type"]
+    handler_name = job_handler_registry.load().get(runner_type, "").rsplit(".", 1)[-1]
+    name = next((name for name in (runner_type, handler_name) if name in config.SCHEDULER_RUNNER_EXECUTORS), None)
+    executor: str = runner_executor(name) if name else "default"
+    return executor
+
+
+def _get_job_handler(job: Job) -> JobHandlerInterface | AsyncJobHandlerInterface:
     """Get the job handler for a job.
 
     Job handlers must be placed in the "default_job_handlers" or the "job_handler_plugins" folder in the
-    repository src folder.
+    repository src folder, or be registered with an entry point (see JobHandlerRegistry).
     Each job handler have a folder with at least one file: __init__.py
-    This __init__ file must implement a class called "JobHandler" that inherits from the JobHandlerInterface class.
+    This __init__ file must implement a class called "JobHandler" that inherits from the JobHandlerInterface class,
+    or from the AsyncJobHandlerInterface class.
 
     The runner type in the job entity (job.runner["type"]) decides what job handler to fetch.
-    Also, the runner type must be equal to the '_SUPPORTED_TYPE' inside the job handler's __init__ file.
+    Also, the runner type must be equal to, or one of, the '_SUPPORTED_TYPE' inside the job handler's __init__ file.
     """
     data_source_id = job.dmss_id.split("/", 1)[0]  # TODO use split_absolute_ref() to do this splitting.
+    return job_handler_registry.get(job.runner["type"])(job, data_source_id)
 
-    job_handler_directories = []
-    for handler_location in ("default_job_handlers", "job_handler_plugins"):
-        for file in Path(handler_location).iterdir():
-            if file.is_dir() and file.name[0] != "_":  # Python modules can not start with "_"
-                job_handler_directories.append(str(file).replace("/", "."))
 
-    try:
-        modules = [importlib.import_module(module) for module in job_handler_directories]
-        for job_handler_module in modules:
-            if job.runner["type"] == job_handler_module._SUPPORTED_TYPE:
-                return job_handler_module.JobHandler(job, data_source_id)
-    except ImportError as error:
-        traceback.print_exc()
-        raise ImportError(
-            f"Failed to import a job handler module: '{error}'"
-            + "Make sure the module has a '_init_.py' file, a 'JobHandler' class implementing "
-            + "the JobHandlerInterface, and a global variable named '_SUPPORTED_TYPE' "
-            + "with the string, tuple, or list value of the job type(s)."
-        )
+@contextmanager
+def _reused_job_handler(job: Job) -> Iterator[JobHandlerInterface | AsyncJobHandlerInterface]:
+    """Get the job handler for a job, reusing the last handler used for the job if it is reusable.
+
+    The handler is kept for reuse when the block exits, unless an exception was raised.
+    """
+    with _job_handlers_lock:
+        job_handler = _job_handlers.pop(job.job_uid, None)
+    if job_handler is not None and type(job_handler) is job_handler_registry.get(job.runner["type"]):
+        job_handler.job = job
+    else:
+        job_handler = _get_job_handler(job)
+    yield job_handler
+    if job_handler.reusable and config.JOB_HANDLER_CACHE_SIZE:
+        with _job_handlers_lock:
+            _job_handlers[job.job_uid] = job_handler
+            while len(_job_handlers) > config.JOB_HANDLER_CACHE_SIZE:
+                _job_handlers.popitem(last=False)
+
+
+def _call_job_handler(job_handler: JobHandlerInterface | AsyncJobHandlerInterface, operation: str) -> Any:
+    """Call an operation of a job handler from a thread without a running event loop.
+
+    The operations of asynchronous job handlers are run to completion in a new event loop.
+    """
+    result = getattr(job_handler, operation)()
+    return asyncio.run(result) if inspect.iscoroutine(result) else result
 
-    raise NotImplementedException(f"No handler for a job of type '{job.runner['type']}' is configured")
+
+async def _await_job_handler(job_handler: JobHandlerInterface | AsyncJobHandlerInterface, operation: str) -> Any:
+    """Await an operation of a job handler. The operations of synchronous job handlers are run in a worker thread."""
+    return await getattr(as_async_job_handler(job_handler), operation)()
 
 
 def _run_job(job_uid: UUID) -> str:
@@ -149,8 +504,9 @@ def _run_job(job_uid: UUID) -> str:
     try:
         job_handler = _get_job_handler(job)
         job.started = datetime.now(timezone.utc).replace(microsecond=0)
+        job.dispatched = job.started
         try:
-            message = job_handler.start()
+            message = _call_job_handler(job_handler, "start")
 
         except Exception as error:
             print(traceback.format_exc())
@@ -170,14 +526,66 @@ def _run_job(job_uid: UUID) -> str:
             # Fetch the updated entity before merging data
             job = dmss_sync(job)
         job.append_log(message)
+        fields: Iterable[str] | None = None  # The recurring job is written as a whole, as it was synced from DMSS
+        if job.type != config.RECURRING_JOB:
+            job, fields = _with_reported_progress(job)
         update_document(
             job.dmss_id, job.model_dump_json(by_alias=True, exclude_none=True, exclude=job.exclude_keys), job.token
         )  # Update in DMSS with status etc.
 
-        _set_job(job)
+        _set_job(job, fields)
         return message  # type: ignore
 
 
+def _with_reported_progress(job: Job) -> Tuple[Job, Iterable[str]]:
+    """Get a job that was just started by its job handler, with the progress reported while it was starting, and
+    the fields to write.
+
+    Unless the stored job is still starting, its progress was reported, and only the fields the start sets are
+    written to it. Otherwise the status is written as well.
+    """
+    stored = _get_job(job.job_uid, with_log=False)
+    if stored.status == JobStatus.STARTING:
+        return job, _STARTED_FIELDS
+    stored.state, stored.dispatched = job.state, job.dispatched
+    stored._new_log_lines, stored._log_replaced = job.pop_log_changes()
+    return stored, _START_FIELDS
+
+
+def _start_scheduled_job(job_uid: str) -> None:
+    """Run a scheduled job now, in this process or, if jobs are queued, in a worker process."""
+    if config.JOB_QUEUE:
+        get_job_queue().enqueue(job_uid)
+    else:
+        _run_job(UUID(job_uid))
+
+
+def run_queued_job(job_uid: str, retried: bool = False) -> None:
+    """Start a job taken from the job queue, in a worker process.
+
+    A job that is retried, because its worker stopped or failed while starting it, is only started again if it
+    is still starting, so a job that was started is not started twice. Scheduled jobs are always run.
+    """
+    if retried:
+        job = _get_job(UUID(job_uid), with_log=False)
+        if not job.schedule and job.status != JobStatus.STARTING:
+            logger.info(f"Not retrying the start of job '{job_uid}', which is {job.status.value}")
+            return
+    _run_job(UUID(job_uid))
+
+
+def fail_queued_job(job_uid: str, message: str) -> None:
+    """Mark a job taken from the job queue as failed, after all the attempts to start it failed.
+
+    Only a job that is still starting is failed. Scheduled jobs are run again at their next scheduled time.
+    """
+    job = _get_job(UUID(job_uid), with_log=False)
+    if job.schedule or job.status != JobStatus.STARTING:
+        return
+    logger.error(f"Job '{job_uid}' failed: {message}")
+    update_progress(job, Progress(status=JobStatus.FAILED, logs=message, percentage=job.percentage))
+
+
 def register_job(dmss_id: str, token: str | None = None) -> Tuple[str, str, JobStatus]:
     """Register and start a job.
 
@@ -219,62 +627,243 @@ def register_job(dmss_id: str, token: str | None = None) -> Tuple[str, str, JobS
         job.set_job_status(JobStatus.REGISTERED)
         schedule_response = schedule_cron_job(
             scheduler,
-            _run_job,
+            _start_scheduled_job,
             job,
         )
     else:
-        # Add a 5second delay on every job we run.
-        # This is so that the JobService can update job state in
-        # DMSS, before we get a race with the job itself trying to update it's state.
         logger.debug(f"Starting job '{dmss_id}")
-        in_5_seconds = datetime.now(timezone.utc) + timedelta(seconds=5)
         job.set_job_status(JobStatus.STARTING)
-        scheduled_job = scheduler.add_job(
-            func=_run_job,
-            next_run_time=in_5_seconds,
-            args=[job.job_uid],
-            jobstore="redis_job_store",
-            id=str(job.job_uid),
-        )
-        schedule_response = (
-            f"Job starting in 5 seconds: {scheduled_job.next_run_time} {scheduled_job.next_run_time.tzinfo}"
-        )
+        schedule_response = f"Job starting: {datetime.now(timezone.utc).replace(microsecond=0)}"
 
     job.append_log(schedule_response)
     result = str(job.job_uid), schedule_response, job.status
 
     _set_job(job)
+    if job.schedule:
+        get_job_store().set_scheduled(str(job.job_uid))
     update_document(
         job.dmss_id, job.model_dump_json(by_alias=True, exclude_none=True, exclude=job.exclude_keys), token=job.token
     )
+    if not job.schedule:
+        # The job is only started once its registration is written to the job store and DMSS.
+        # Otherwise the registration could overwrite the state written by the job as it starts.
+        _dispatch_job(job)
     return result
 
 
-def status_job(job_uid: UUID) -> Tuple[JobStatus, list[str], float]:
+def _dispatch_job(job: Job) -> None:
+    """Start a registered job right away, in a scheduler thread or a worker process.
+
+    The job fails if it can not be scheduled or queued.
+    """
+    try:
+        if config.JOB_QUEUE:
+            get_job_queue().enqueue(str(job.job_uid))
+            return
+        scheduler.add_job(
+            func=_run_job,
+            args=[job.job_uid],
+            jobstore=JOBSTORE,
+            executor=_start_executor(job),
+            # The start is never skipped, even if no process is the leader for a while
+            misfire_grace_time=None,
+            id=str(job.job_uid),
+        )
+    except Exception as error:
+        logger.error(f"Failed to schedule the start of job '{job.job_uid}': {error}")
+        job.set_job_status(JobStatus.FAILED)
+        job.append_log(f"Failed to schedule the start of the job: {error}")
+        _set_job(job)
+        update_document(
+            job.dmss_id,
+            job.model_dump_json(by_alias=True, exclude_none=True, exclude=job.exclude_keys),
+            token=job.token,
+        )
+        raise
+
+
+def status_job(
+    job_uid: UUID, offset: int = 0, limit: int | None = None, tail: int | None = None
+) -> Tuple[JobStatus, list[str], float | None, int, int]:
     """Get the status for an existing job.
 
     The result of the job is fetched by using the progress() function in the job handler for the given job.
     Return the logs and status which the job pushed (external progress tracking), if the job implements 'update_job_progress'.
     If the job does not implement progress tracking, the job handler tries to evaluate the status of the job.
+
+    Only the page of the log given by 'offset' and 'limit', or the last 'tail' lines, is returned. The index of the
+    first returned log line and the total number of log lines are returned as well.
     """
-    job = _get_job(job_uid)
-    if job.external_progress:  # Progress/Status is controlled externally
-        return job.status, job.log, job.percentage
+    progress, log, log_offset, log_length = _get_job_fields_and_log(
+        job_uid, "external_progress", "status", "percentage", offset=offset, limit=limit, tail=tail
+    )
+    if progress.get("external_progress"):  # Progress/Status is controlled externally
+        return JobStatus(progress["status"]), log, progress.get("percentage"), log_offset, log_length
+
+    updated_job = _poll_job_progress(_get_job(job_uid))
+    full_log = updated_job.log or []
+    log, log_offset = _page_log(full_log, offset, limit, tail)
+    return updated_job.status, log, updated_job.percentage, log_offset, len(full_log)
+
+
+async def status_job_async(
+    job_uid: UUID, offset: int = 0, limit: int | None = None, tail: int | None = None
+) -> Tuple[JobStatus, list[str], float | None, int, int]:
+    """Get the status for an existing job, like status_job().
+
+    The job handler is awaited, so no worker thread is held while waiting for the job's backend.
+    """
+    progress, log, log_offset, log_length = await run_in_threadpool(
+        _get_job_fields_and_log,
+        job_uid,
+        "external_progress",
+        "status",
+        "percentage",
+        offset=offset,
+        limit=limit,
+        tail=tail,
+    )
+    if progress.get("external_progress"):  # Progress/Status is controlled externally
+        return JobStatus(progress["status"]), log, progress.get("percentage"), log_offset, log_length
 
+    updated_job = await _poll_job_progress_async(await run_in_threadpool(_get_job, job_uid))
+    full_log = updated_job.log or []
+    log, log_offset = _page_log(full_log, offset, limit, tail)
+    return updated_job.status, log, updated_job.percentage, log_offset, len(full_log)
+
+
+def status_jobs(
+    job_uids: Iterable[UUID], tail: int = 0
+) -> dict[UUID, Tuple[JobStatus, list[str], float | None, int, int] | Exception]:
+    """Get the status for several existing jobs.
+
+    All jobs are read from the job store in one round-trip. The job handlers of jobs without external progress
+    tracking are polled concurrently, by at most BULK_STATUS_MAX_WORKERS threads shared by all requests.
+    Only the last 'tail' log lines of each job are returned.
+
+    The status of each job is returned like in status_job(). If the status of a job could not be fetched,
+    the exception that was raised for that job is returned instead.
+    """
+    job_uids = list(dict.fromkeys(job_uids))
+    job_store = get_job_store()
+    records = job_store.get_records_and_logs(
+        (str(job_uid) for job_uid in job_uids), log_range=(-tail, -1) if tail else None
+    )
+
+    results: dict[UUID, Tuple[JobStatus, list[str], float | None, int, int] | Exception] = {}
+    jobs_to_poll: dict[UUID, dict] = {}
+    for job_uid, (record, log, log_length) in zip(job_uids, records):
+        if not record:
+            results[job_uid] = NotFoundException(f"No job with id '{job_uid}' is registered")
+            continue
+        values = _decode_job_fields(record)
+        if values.get("external_progress"):  # Progress/Status is controlled externally
+            log_offset = _log_offset(-tail, log_length) if tail else log_length
+            results[job_uid] = JobStatus(values["status"]), log, values.get("percentage"), log_offset, log_length
+        else:
+            jobs_to_poll[job_uid] = values
+
+    full_logs = job_store.get_logs(str(job_uid) for job_uid in jobs_to_poll)
+    polls: dict[UUID, Future] = {}
+    for (job_uid, values), full_log in zip(jobs_to_poll.items(), full_logs):
+        # Run in a copy of the request context, so that the job handlers see the same context as in status_job()
+        polls[job_uid] = _get_status_executor().submit(
+            contextvars.copy_context().run, _poll_job_progress, _job_from_record(values, full_log), bool(tail)
+        )
+
+    for job_uid, poll in polls.items():
+        try:
+            updated_job = poll.result()
+            full_log = updated_job.log or []
+            log, log_offset = _page_log(full_log, tail=tail) if tail else ([], len(full_log))
+            results[job_uid] = updated_job.status, log, updated_job.percentage, log_offset, len(full_log)
+        except Exception as error:
+            logger.warning(f"Failed to get the status of job '{job_uid}': {error}")
+            results[job_uid] = error
+    return {job_uid: results[job_uid] for job_uid in job_uids}
+
+
+def _get_status_executor() -> ThreadPoolExecutor:
+    global _status_executor
+    with _status_executor_lock:
+        if _status_executor is None:
+            _status_executor = ThreadPoolExecutor(
+                max_workers=config.BULK_STATUS_MAX_WORKERS, thread_name_prefix="job-status"
+            )
+        return _status_executor
+
+
+def _poll_job_progress(job: Job, fetch_logs: bool = True) -> Job:
+    """Get the progress of a job from its job handler, and store it.
+
+    If 'fetch_logs' is False, the job handler can skip fetching the log, and the stored log is kept.
+    """
     try:
-        job_handler = _get_job_handler(job)
-        status, log, percentage = job_handler.progress()
+        with _reused_job_handler(job) as job_handler:
+            job_handler.fetch_logs = fetch_logs
+            status, log, percentage = _call_job_handler(job_handler, "progress")
+    except NotImplementedError:
+        raise NotImplementedException(
+            message="The job handler does not support the operation",
+            debug="The job handler does not implement the 'progress' method",
+        )
+    return _store_polled_progress(job, status, log, percentage)
+
+
+async def _poll_job_progress_async(job: Job) -> Job:
+    try:
+        with _reused_job_handler(job) as job_handler:
+            job_handler.fetch_logs = True
+            status, log, percentage = await _await_job_handler(job_handler, "progress")
     except NotImplementedError:
         raise NotImplementedException(
             message="The job handler does not support the operation",
             debug="The job handler does not implement the 'progress' method",
         )
+    return await run_in_threadpool(_store_polled_progress, job, status, log, percentage)
+
+
+def _store_polled_progress(job: Job, status: JobStatus, log: None | list[str] | str, percentage: float | None) -> Job:
     if job.schedule:
         job = dmss_sync(job)  # New runs might have been added and/or updated since last sync
-    updated_job = Job(
-        **update_progress(job, progress=Progress(status=status, logs=log, percentage=percentage), overwrite_log=True)
+    return Job(
+        **update_progress(
+            job,
+            progress=Progress(status=status, logs=log, percentage=percentage),
+            overwrite_log=True,
+            fields=_POLLED_FIELDS,
+        )
     )
-    return updated_job.status, updated_job.log, updated_job.percentage
+
+
+def list_jobs(
+    status: JobStatus | None = None,
+    runner_type: str | None = None,
+    data_source: str | None = None,
+    started_after: datetime | None = None,
+    started_before: datetime | None = None,
+    cursor: str | None = None,
+    limit: int = 50,
+) -> Tuple[list[dict], str | None]:
+    """List the registered jobs matching all the given filters, most recently started first.
+
+    The jobs are looked up in the job store indexes, so only one page of jobs is read.
+    Returns the decoded summary fields of the jobs, and a cursor for the next page.
+    """
+    indexes = {"status": status.value if status else None, "runner": runner_type, "data-source": data_source}
+    try:
+        keys, next_cursor = get_job_store().list_records(
+            {name: value for name, value in indexes.items() if value},
+            limit,
+            cursor,
+            started_after.timestamp() if started_after else None,
+            started_before.timestamp() if started_before else None,
+        )
+    except ValueError:
+        raise BadRequestException(message="Invalid cursor", debug=f"Could not parse the cursor '{cursor}'")
+    records = get_job_store().get_records(keys, _SUMMARY_FIELDS)
+    # A job can be removed between reading the index and reading the job
+    return [_decode_job_fields(record) for record in records if record], next_cursor
 
 
 def remove_job(job_uid: UUID) -> Tuple[str, str]:
@@ -286,19 +875,38 @@ def remove_job(job_uid: UUID) -> Tuple[str, str]:
     job = _get_job(job_uid)
     job_handler = _get_job_handler(job)
     try:
-        job_status, remove_message = job_handler.remove()
+        job_status, remove_message = _call_job_handler(job_handler, "remove")
+    except NotImplementedError:
+        remove_message = "The job handler does not support the operation"
+        job_status = JobStatus.REMOVED
+    return _remove_job_record(job, job_status, remove_message)
+
+
+async def remove_job_async(job_uid: UUID) -> Tuple[str, str]:
+    """Remove an existing job, like remove_job(), awaiting the job handler."""
+    job = await run_in_threadpool(_get_job, job_uid)
+    job_handler = _get_job_handler(job)
+    try:
+        job_status, remove_message = await _await_job_handler(job_handler, "remove")
     except NotImplementedError:
         remove_message = "The job handler does not support the operation"
         job_status = JobStatus.REMOVED
+    return await run_in_threadpool(_remove_job_record, job, job_status, remove_message)
 
+
+def _remove_job_record(job: Job, job_status: JobStatus, remove_message: str) -> Tuple[str, str]:
     job.set_job_status(job_status)
     update_document(
         job.dmss_id, job.model_dump_json(by_alias=True, exclude_none=True, exclude=job.exclude_keys), job.token
     )
-    get_job_store().delete(str(job_uid))
+    get_job_store().delete_record(str(job.job_uid))
+    if job_cache := get_job_cache():
+        job_cache.invalidate(str(job.job_uid))
+    with _job_handlers_lock:
+        _job_handlers.pop(job.job_uid, None)
 
     try:
-        scheduler.remove_job(str(job_uid))
+        scheduler.remove_job(str(job.job_uid))
     except JobLookupError:
         pass
     job.append_log(remove_message)
@@ -310,12 +918,10 @@ def get_job_result(job_uid: UUID) -> Tuple[str, bytes]:
 
     The result() function in the job's job handler is used.
     """
-    job = _get_job(job_uid)
-    if not job.status.COMPLETED:
-        raise BadRequestException("The job has not yet completed")
+    job = _get_completed_job(job_uid)
     job_handler = _get_job_handler(job)
     try:
-        result, result_bytes = job_handler.result()  # type: ignore
+        result, result_bytes = _call_job_handler(job_handler, "result")
         job.append_log(result)
         return result, result_bytes
     except NotImplementedError:
@@ -325,25 +931,53 @@ def get_job_result(job_uid: UUID) -> Tuple[str, bytes]:
         )
 
 
-def update_progress_from_uid(job_uid: UUID, progress: Progress, overwrite_log: bool, external: bool):
+async def get_job_result_async(job_uid: UUID) -> Tuple[str, bytes]:
+    """Get result from an existing job, like get_job_result(), awaiting the job handler."""
+    job = await run_in_threadpool(_get_completed_job, job_uid)
+    job_handler = _get_job_handler(job)
+    try:
+        result, result_bytes = await _await_job_handler(job_handler, "result")
+        job.append_log(result)
+        return result, result_bytes
+    except NotImplementedError:
+        raise NotImplementedException(
+            message="The job handler does not support the operation",
+            debug="The job handler does not implement the 'result' method",
+        )
+
+
+def _get_completed_job(job_uid: UUID) -> Job:
     job = _get_job(job_uid)
+    if not job.status.COMPLETED:
+        raise BadRequestException("The job has not yet completed")
+    return job
+
+
+def update_progress_from_uid(job_uid: UUID, progress: Progress, overwrite_log: bool, external: bool):
+    job = _get_job(job_uid, with_log=overwrite_log)  # Appending log lines does not require the current log
     if job.schedule:
         job = dmss_sync(job)
     return update_progress(job, progress, overwrite_log, external)
 
 
-def update_progress(job: Job, progress: Progress, overwrite_log: bool = False, external: bool = False) -> dict:
+def update_progress(
+    job: Job,
+    progress: Progress,
+    overwrite_log: bool = False,
+    external: bool = False,
+    fields: Iterable[str] = _PROGRESS_FIELDS,
+) -> dict:
     job.external_progress = external or job.external_progress
     if progress.percentage is not None:
         job.percentage = progress.percentage
     if progress.logs:
         if overwrite_log:
-            job.log = progress.logs if isinstance(progress.logs, list) else [progress.logs]
+            job.set_log(progress.logs if isinstance(progress.logs, list) else [progress.logs])
         else:
             job.append_log(progress.logs)
     if progress.status:
         job.set_job_status(progress.status)
-    _set_job(job)
+    _set_job(job, fields)
     update_document(
         job.dmss_id,
         job.model_dump_json(
@@ -0,0 +1,770 @@
+import hashlib
+import heapq
+import json
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime
+from itertools import batched
+from typing import Any, Iterable, Iterator, Mapping, Sequence
+from uuid import uuid4
+
+import redis
+
+from config import config
+from services.job_codec import decode_value
+from services.job_handler_interface import JobStatus
+from utils.string_helpers import split_address
+
+JOB_STORE_DB = 5  # DMSS is using 0-3
+SCHEDULER_DB = 6
+
+# Bumped when the layout of the job store changes. Version 1 stored each job as a JSON string,
+# version 2 stored each job as a hash with one JSON encoded value per field.
+# Version 3 keeps the log lines of a job in a separate list, version 4 keeps a set of the scheduled jobs
+# version 5 keeps the indexes used to list jobs and version 6 keeps a set of the names of those indexes.
+SCHEMA_VERSION = 6
+SCHEMA_VERSION_KEY = "job-store:schema-version"
+SCHEDULED_KEY = "job-store:scheduled"
+
+# Records are indexed by status, runner type and data source in sorted sets scored by the time the job was started.
+# All records are in the 'started' index.
+INDEX_PREFIX = "job-store:index"
+STARTED_INDEX_KEY = f"{INDEX_PREFIX}:started"
+# Set of the keys of all other indexes, so records can be removed from them without scanning the database
+INDEX_NAMES_KEY = "job-store:indexes"
+# Fields of a record that decide which indexes it is in
+INDEXED_FIELDS = ("status", "runner", "dmss_id", "started")
+# Records with these statuses can be removed by the retention policy
+FINISHED_STATUSES = (JobStatus.COMPLETED, JobStatus.FAILED)
+# Keys of written and deleted records are published on this channel as "<origin> <written|deleted> <key> ...",
+# where the origin identifies the job store instance that wrote them
+INVALIDATION_CHANNEL = "job-store:invalidated"
+# How long the intersection of several indexes is kept, so the following pages of a listing can reuse it
+_QUERY_TTL = 60
+
+_pools: dict[int, redis.BlockingConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_connection_pool(db: int) -> redis.BlockingConnectionPool:
+    """Get the process-wide connection pool for a Redis database.
+
+    Connections are reused across requests and threads, so frequent job store operations (status polls,
+    progress updates, ...) do not pay for a new TCP/TLS handshake every time.
+    When all connections are in use, callers wait up to SCHEDULER_REDIS_POOL_TIMEOUT seconds for one to be released.
+    """
+    with _pools_lock:
+        if db not in _pools:
+            connection_kwargs: dict = {
+                "host": config.SCHEDULER_REDIS_HOST,
+                "port": config.SCHEDULER_REDIS_PORT,
+                "db": db,
+                "password": config.SCHEDULER_REDIS_PASSWORD,
+                "socket_timeout": 5,
+                "socket_connect_timeout": 5,
+                "socket_keepalive": True,
+                "health_check_interval": config.SCHEDULER_REDIS_HEALTH_CHECK_INTERVAL,
+            }
+            if config.SCHEDULER_REDIS_SSL:
+                connection_kwargs["connection_class"] = redis.SSLConnection
+            _pools[db] = redis.BlockingConnectionPool(
+                max_connections=config.SCHEDULER_REDIS_MAX_CONNECTIONS,
+                timeout=config.SCHEDULER_REDIS_POOL_TIMEOUT,
+                **connection_kwargs,
+            )
+        return _pools[db]
+
+
+def log_key(key: str) -> str:
+    """Key of the list holding the log lines of a record."""
+    return f"{key}:log"
+
+
+def index_key(name: str, value: str) -> str:
+    """Key of the sorted set holding the records with 'value' in the 'name' index."""
+    return f"{INDEX_PREFIX}:{name}:{value}"
+
+
+def _timestamp(value: str | bytes | None) -> float:
+    """Get the timestamp of an encoded datetime. A missing datetime is treated as the start of time."""
+    decoded = decode_value(value) if value else None
+    return datetime.fromisoformat(decoded).timestamp() if decoded else 0.0
+
+
+def record_indexes(values: Mapping[str, str | bytes]) -> tuple[dict[str, str], float | None]:
+    """Get the indexes of a record from (some of) its encoded fields, and its score in those indexes.
+
+    The score is the time the job was started, and is None if the 'started' field is not among the values.
+    """
+    decoded = {field: decode_value(values[field]) for field in INDEXED_FIELDS if field in values}
+    indexes = {}
+    if decoded.get("status"):
+        indexes["status"] = decoded["status"]
+    if isinstance(decoded.get("runner"), dict) and decoded["runner"].get("type"):
+        indexes["runner"] = decoded["runner"]["type"]
+    if decoded.get("dmss_id"):
+        indexes["data-source"] = split_address(decoded["dmss_id"])[1]
+    if "started" not in decoded:
+        return indexes, None
+    return indexes, _timestamp(values["started"])
+
+
+def _queue_index_update(pipe: redis.client.Pipeline, key: str, values: dict[str, str | bytes]) -> None:
+    """Add a record to the indexes of the given values. A record is only in the index of its current status."""
+    indexes, score = record_indexes(values)
+    if score is None:
+        return
+    pipe.zadd(STARTED_INDEX_KEY, {key: score})
+    for name, value in indexes.items():
+        if name == "status":
+            for status in JobStatus:
+                if status.value != value:
+                    pipe.zrem(index_key(name, status.value), key)
+        pipe.zadd(index_key(name, value), {key: score})
+        pipe.sadd(INDEX_NAMES_KEY, index_key(name, value))
+
+
+def _is_wrong_type(error: redis.ResponseError) -> bool:
+    return str(error).startswith("WRONGTYPE")
+
+
+def _queue_record_read(pipe: redis.client.Pipeline, key: str, fields: Sequence[str] | None) -> None:
+    if fields:
+        pipe.hmget(key, list(fields))
+    else:
+        pipe.hgetall(key)
+
+
+def _parse_record(result: dict | list, fields: Sequence[str] | None) -> dict[str, bytes] | None:
+    if not fields:
+        return {field.decode(): value for field, value in result.items()} if result else None  # type: ignore
+    if not any(result):
+        return None
+    return {field: value for field, value in zip(fields, result) if value is not None}
+
+
+def _decode_keys(keys: Any) -> list[str]:
+    return [key.decode() for key in keys]
+
+
+def _decode_entries(entries: Any) -> list[tuple[str, float]]:
+    """Decode the members of a sorted set range read with scores."""
+    return [(member.decode(), score) for member, score in entries]
+
+
+def _format_cursor(score: float, key: str) -> str:
+    return f"{score!r}:{key}"
+
+
+def _parse_cursor(cursor: str) -> tuple[float, str]:
+    score, key = cursor.rsplit(":", 1)
+    return float(score), key
+
+
+class JobStore(ABC):
+    """The storage of the registered jobs.
+
+    Jobs are stored as records under their job uid, with one encoded value per field, so single fields can be read
+    and written without transferring the whole job. The log lines of a job are kept in an append-only list next to
+    the record. Records are indexed by status, runner type, data source and the time the job was started.
+    """
+
+    @abstractmethod
+    def scan_records(self, count: int = 1000) -> Iterator[str]:
+        """Iterate over the keys of all job records."""
+
+    def get_record(self, key: str, fields: Sequence[str] | None = None) -> dict[str, bytes] | None:
+        """Get a record, or only the given fields of it. Returns None if there is no record with that key."""
+        return self.get_records([key], fields)[0]
+
+    def get_record_and_log(
+        self, key: str, fields: Sequence[str] | None = None, start: int = 0, end: int = -1
+    ) -> tuple[dict[str, bytes] | None, list[str], int]:
+        """Get a record, the log lines from 'start' to 'end' and the total number of log lines.
+
+        Both 'start' and 'end' are inclusive. Negative indexes count from the end of the log.
+        """
+        return self.get_records_and_logs([key], fields, (start, end))[0]
+
+    @abstractmethod
+    def get_records(self, keys: Iterable[str], fields: Sequence[str] | None = None) -> list[dict[str, bytes] | None]:
+        """Get several records. Missing records are returned as None."""
+
+    @abstractmethod
+    def get_records_and_logs(
+        self, keys: Iterable[str], fields: Sequence[str] | None = None, log_range: tuple[int, int] | None = (0, -1)
+    ) -> list[tuple[dict[str, bytes] | None, list[str], int]]:
+        """Get several records, a range of their log lines and their total number of log lines.
+
+        The range is inclusive, and negative indexes count from the end of the log. If 'log_range' is None,
+        no log lines are returned. Missing records are returned as None.
+        """
+
+    @abstractmethod
+    def get_logs(self, keys: Iterable[str]) -> list[list[str]]:
+        """Get the whole logs of several records."""
+
+    @abstractmethod
+    def set_record(
+        self, key: str, values: dict[str, str | bytes], log: Sequence[str] = (), replace_log: bool = False
+    ) -> None:
+        """Set one or more fields of a record, leaving the other fields untouched.
+
+        The 'log' lines are appended to the record's log, or replace it if 'replace_log' is set.
+        The indexes of the record are updated when the 'started' field is written, so it must be written
+        together with any other indexed field. Everything is written atomically.
+        """
+
+    def delete_record(self, key: str) -> int:
+        """Delete a record and its log, and remove it from all indexes."""
+        return self.delete_records([key])
+
+    @abstractmethod
+    def delete_records(self, keys: Iterable[str]) -> int:
+        """Delete several records and their logs, and remove them from all indexes.
+
+        Returns the number of deleted keys, including the logs.
+        """
+
+    @abstractmethod
+    def list_records(
+        self,
+        indexes: dict[str, str],
+        limit: int,
+        cursor: str | None = None,
+        started_after: float | None = None,
+        started_before: float | None = None,
+    ) -> tuple[list[str], str | None]:
+        """Several indexes are intersected in a temporary sorted set, which is reused for the following pages."""
+
+    @abstractmethod
+    def compact(self, ended_before: float | None, max_records: int | None, batch_size: int = 500) -> int:
+        """Delete finished records that ended before 'ended_before', and the oldest finished records when there
+        are more than 'max_records' records. Scheduled records are never deleted.
+
+        Returns the number of deleted records.
+        """
+
+    @abstractmethod
+    def set_scheduled(self, key: str, scheduled: bool = True) -> None:
+        """Add a record to, or remove it from, the set of scheduled jobs."""
+
+    @abstractmethod
+    def scan_scheduled(self, count: int = 1000) -> Iterator[str]:
+        """Iterate over the keys of the scheduled jobs."""
+
+    @abstractmethod
+    def migrate_legacy_records(self) -> int:
+        """Convert all records written by earlier versions of the job store to the current layout.
+
+        Returns the number of converted records.
+        """
+
+    @abstractmethod
+    def flush(self) -> None:
+        """Delete everything in the job store."""
+
+
+class RedisJobStore(JobStore):
+    """A job store in a Redis database.
+
+    Records are hashes, logs are lists and indexes are sorted sets. Keys that are not job records contain a ':'.
+    The multi-key methods send all keys in a single round-trip. Written and deleted keys are published on the
+    invalidation channel, so other processes can invalidate their copies of the records.
+    """
+
+    def __init__(self, client: redis.Redis):
+        self.client = client
+        self.origin = uuid4().hex
+
+    def scan_records(self, count: int = 1000) -> Iterator[str]:
+        for key in self.client.scan_iter(count=count):
+            if b":" not in key:
+                yield key.decode()
+
+    def get_record(self, key: str, fields: Sequence[str] | None = None) -> dict[str, bytes] | None:
+        record, _, _ = self._read(key, fields)
+        return record
+
+    def get_record_and_log(
+        self, key: str, fields: Sequence[str] | None = None, start: int = 0, end: int = -1
+    ) -> tuple[dict[str, bytes] | None, list[str], int]:
+        return self._read(key, fields, (start, end))
+
+    def _read(
+        self, key: str, fields: Sequence[str] | None, log_range: tuple[int, int] | None = None, retry: bool = True
+    ) -> tuple[dict[str, bytes] | None, list[str], int]:
+        with self.client.pipeline(transaction=False) as pipe:
+            _queue_record_read(pipe, key, fields)
+            if log_range:
+                pipe.lrange(log_key(key), *log_range)
+                pipe.llen(log_key(key))
+            results = pipe.execute(raise_on_error=False)
+
+        if retry and isinstance(results[0], redis.ResponseError) and _is_wrong_type(results[0]):
+            self.migrate_legacy_record(key)
+            return self._read(key, fields, log_range, retry=False)
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        record = _parse_record(results[0], fields)
+        if not log_range:
+            return record, [], 0
+        return record, [line.decode() for line in results[1]], results[2]
+
+    def get_records(self, keys: Iterable[str], fields: Sequence[str] | None = None) -> list[dict[str, bytes] | None]:
+        keys = list(keys)
+        if not keys:
+            return []
+        with self.client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                _queue_record_read(pipe, key, fields)
+            results = pipe.execute(raise_on_error=False)
+
+        records: list[dict[str, bytes] | None] = []
+        for key, result in zip(keys, results):
+            if isinstance(result, redis.ResponseError) and _is_wrong_type(result):
+                records.append(self.get_record(key, fields))
+            elif isinstance(result, Exception):
+                raise result
+            else:
+                records.append(_parse_record(result, fields))
+        return records
+
+    def get_records_and_logs(
+        self, keys: Iterable[str], fields: Sequence[str] | None = None, log_range: tuple[int, int] | None = (0, -1)
+    ) -> list[tuple[dict[str, bytes] | None, list[str], int]]:
+        keys = list(keys)
+        if not keys:
+            return []
+        with self.client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                _queue_record_read(pipe, key, fields)
+                if log_range:
+                    pipe.lrange(log_key(key), *log_range)
+                pipe.llen(log_key(key))
+            results = pipe.execute(raise_on_error=False)
+
+        step = 3 if log_range else 2
+        records: list[tuple[dict[str, bytes] | None, list[str], int]] = []
+        for i, key in enumerate(keys):
+            record_result, *log_results = results[i * step : (i + 1) * step]
+            if isinstance(record_result, redis.ResponseError) and _is_wrong_type(record_result):
+                record, log, log_length = self._read(key, fields, log_range or (0, -1))
+                records.append((record, log if log_range else [], log_length))
+                continue
+            for result in (record_result, *log_results):
+                if isinstance(result, Exception):
+                    raise result
+            log = [line.decode() for line in log_results[0]] if log_range else []
+            records.append((_parse_record(record_result, fields), log, log_results[-1]))
+        return records
+
+    def get_logs(self, keys: Iterable[str]) -> list[list[str]]:
+        keys = list(keys)
+        if not keys:
+            return []
+        with self.client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.lrange(log_key(key), 0, -1)
+            return [[line.decode() for line in log] for log in pipe.execute()]
+
+    def set_record(
+        self, key: str, values: dict[str, str | bytes], log: Sequence[str] = (), replace_log: bool = False
+    ) -> None:
+        """Everything is written in one transaction, which also publishes the key on the invalidation channel."""
+        if not (values or log or replace_log):
+            return
+        with self.client.pipeline() as pipe:
+            if values:
+                pipe.hset(key, mapping=values)  # type: ignore[arg-type]
+                _queue_index_update(pipe, key, values)
+            if replace_log:
+                pipe.delete(log_key(key))
+            if log:
+                pipe.rpush(log_key(key), *log)
+            pipe.publish(INVALIDATION_CHANNEL, f"{self.origin} written {key}")
+            pipe.execute()
+
+    def delete_records(self, keys: Iterable[str]) -> int:
+        keys = list(keys)
+        if not keys:
+            return 0
+        indexes: dict[str, list[str]] = {}
+        for key, record in zip(keys, self.get_records(keys, INDEXED_FIELDS)):
+            for name, value in record_indexes(record or {})[0].items():
+                indexes.setdefault(index_key(name, value), []).append(key)
+        with self.client.pipeline() as pipe:
+            pipe.delete(*keys, *[log_key(key) for key in keys])
+            pipe.srem(SCHEDULED_KEY, *keys)
+            pipe.zrem(STARTED_INDEX_KEY, *keys)
+            for index, members in indexes.items():
+                pipe.zrem(index, *members)
+            pipe.publish(INVALIDATION_CHANNEL, f"{self.origin} deleted {' '.join(keys)}")
+            deleted, *_ = pipe.execute()
+        return deleted  # type: ignore[no-any-return]
+
+    def list_records(
+        self,
+        indexes: dict[str, str],
+        limit: int,
+        cursor: str | None = None,
+        started_after: float | None = None,
+        started_before: float | None = None,
+    ) -> tuple[list[str], str | None]:
+        """Several indexes are intersected in a temporary sorted set, which is reused for the following pages."""
+        keys = sorted(index_key(name, value) for name, value in indexes.items()) or [STARTED_INDEX_KEY]
+        source = keys[0]
+        if len(keys) > 1:
+            source = f"{INDEX_PREFIX}:query:{hashlib.sha256('|'.join(keys).encode()).hexdigest()}"
+            # The first page of a listing intersects the indexes again, so it never gets an outdated intersection
+            if not cursor or not self.client.exists(source):
+                with self.client.pipeline() as pipe:
+                    pipe.zinterstore(source, keys, aggregate="MAX")
+                    pipe.expire(source, _QUERY_TTL)
+                    pipe.execute()
+
+        max_score = started_before if started_before is not None else float("inf")
+        min_score = started_after if started_after is not None else float("-inf")
+        ties = 0
+        if cursor:
+            cursor_score, cursor_key = _parse_cursor(cursor)
+            max_score = min(max_score, cursor_score)
+            ties = self.client.zcount(source, cursor_score, cursor_score)  # type: ignore[assignment]
+        entries = _decode_entries(
+            self.client.zrevrangebyscore(source, max_score, min_score, start=0, num=limit + ties + 1, withscores=True)
+        )
+        if cursor:
+            entries = [(key, score) for key, score in entries if score < cursor_score or key < cursor_key]
+        page = entries[:limit]
+        next_cursor = _format_cursor(page[-1][1], page[-1][0]) if len(entries) > limit else None
+        return [key for key, _ in page], next_cursor
+
+    def compact(self, ended_before: float | None, max_records: int | None, batch_size: int = 500) -> int:
+        """Keys of missing records found while compacting are also removed from the indexes."""
+        deleted = 0
+        if ended_before is not None:
+            for status in FINISHED_STATUSES:
+                # A job ends after it is started, so only records started before 'ended_before' are candidates
+                offset = 0
+                while keys := _decode_keys(
+                    self.client.zrangebyscore(
+                        index_key("status", status.value), "-inf", ended_before, start=offset, num=batch_size
+                    )
+                ):
+                    records = self._unscheduled_records(keys, ("status", "ended"))
+                    expired = [
+                        key
+                        for key, record in zip(keys, records)
+                        if record and _timestamp(record.get("ended")) <= ended_before
+                    ]
+                    missing = self._prune_indexes([key for key, record in zip(keys, records) if record == {}])
+                    self.delete_records(expired)
+                    deleted += len(expired)
+                    offset += len(keys) - len(expired) - missing
+
+        excess = self.client.zcard(STARTED_INDEX_KEY) - max_records if max_records else 0  # type: ignore[operator]
+        if excess > 0:
+            oldest = heapq.merge(
+                *[
+                    _decode_entries(
+                        self.client.zrange(index_key("status", status.value), 0, excess - 1, withscores=True)
+                    )
+                    for status in FINISHED_STATUSES
+                ],
+                key=lambda entry: entry[1],
+            )
+            keys = [key for key, _ in oldest]
+            records = self._unscheduled_records(keys, ("status",))
+            self._prune_indexes([key for key, record in zip(keys, records) if record == {}])
+            excess_keys = [key for key, record in zip(keys, records) if record]
+            deleted += len(excess_keys[:excess])
+            for batch in batched(excess_keys[:excess], batch_size):
+                self.delete_records(batch)
+        return deleted
+
+    def _unscheduled_records(self, keys: list[str], fields: Sequence[str]) -> list[dict[str, bytes] | None]:
+        """Get the given fields of several records. Scheduled records are returned as None,
+        and missing records as an empty dict.
+        """
+        if not keys:
+            return []
+        scheduled = self.client.smismember(SCHEDULED_KEY, keys)  # type: ignore[arg-type]
+        records = self.get_records(keys, fields)
+        return [
+            None if is_scheduled else record or {} for record, is_scheduled in zip(records, scheduled)  # type: ignore
+        ]
+
+    def _prune_indexes(self, keys: list[str]) -> int:
+        """Remove keys of missing records from all indexes. Returns the number of removed keys."""
+        if not keys:
+            return 0
+        with self.client.pipeline(transaction=False) as pipe:
+            pipe.zrem(STARTED_INDEX_KEY, *keys)
+            for index in self.client.sscan_iter(INDEX_NAMES_KEY, count=1000):
+                pipe.zrem(index, *keys)
+            pipe.execute()
+        return len(keys)
+
+    def set_scheduled(self, key: str, scheduled: bool = True) -> None:
+        if scheduled:
+            self.client.sadd(SCHEDULED_KEY, key)
+        else:
+            self.client.srem(SCHEDULED_KEY, key)
+
+    def scan_scheduled(self, count: int = 1000) -> Iterator[str]:
+        for key in self.client.sscan_iter(SCHEDULED_KEY, count=count):
+            yield key.decode()
+
+    def index_records(self, batch_size: int = 500) -> int:
+        """Add all records to their indexes, and the records with a 'schedule' to the set of scheduled jobs.
+
+        Returns the number of scheduled records.
+        """
+        scheduled = 0
+        for keys in batched(self.scan_records(), batch_size):
+            records = self.get_records(keys, ("schedule", *INDEXED_FIELDS))
+            with self.client.pipeline(transaction=False) as pipe:
+                for key, record in zip(keys, records):
+                    if not record:
+                        continue
+                    _queue_index_update(pipe, key, {"started": "null", **record})
+                    if "schedule" in record and decode_value(record["schedule"]):
+                        pipe.sadd(SCHEDULED_KEY, key)
+                        scheduled += 1
+                pipe.execute()
+        return scheduled
+
+    def migrate_legacy_record(self, key: str) -> bool:
+        """Convert a record written by an earlier version of the job store to the current layout.
+
+        Schema version 1 stored the record as a JSON string, and version 2 stored the log as a field of the record.
+        Returns False if the record did not need to be converted, or if it was modified while being converted.
+        """
+        with self.client.pipeline() as pipe:
+            try:
+                pipe.watch(key)
+                key_type = pipe.type(key)
+                if key_type == b"string":
+                    legacy_record: dict = json.loads(pipe.get(key))  # type: ignore[arg-type]
+                    log = legacy_record.pop("log", None) or []
+                    values = {field: json.dumps(value) for field, value in legacy_record.items()}
+                elif key_type == b"hash" and (legacy_log := pipe.hget(key, "log")) is not None:
+                    log = json.loads(legacy_log) or []  # type: ignore[arg-type]
+                    values = {}
+                else:
+                    return False
+                pipe.multi()
+                if values:
+                    pipe.delete(key)
+                    pipe.hset(key, mapping=values)
+                else:
+                    pipe.hdel(key, "log")
+                pipe.delete(log_key(key))
+                if log:
+                    pipe.rpush(log_key(key), *[str(line) for line in log])
+                if values and legacy_record.get("schedule"):
+                    pipe.sadd(SCHEDULED_KEY, key)
+                if values:
+                    _queue_index_update(pipe, key, {"started": "null", **values})
+                pipe.execute()
+            except redis.WatchError:
+                return False
+        return True
+
+    def migrate_legacy_records(self) -> int:
+        """Records written as JSON strings by older versions of the job API are also converted when they are read,
+        so this only needs to run once per job store.
+        """
+        if self.client.get(SCHEMA_VERSION_KEY) == str(SCHEMA_VERSION).encode():
+            return 0
+        migrated = 0
+        for key in self.scan_records():
+            if self.migrate_legacy_record(key):
+                migrated += 1
+        self.index_records()
+        self.client.set(SCHEMA_VERSION_KEY, SCHEMA_VERSION)
+        return migrated
+
+    def flush(self) -> None:
+        self.client.flushdb()
+
+
+def _log_slice(log: list[str], start: int, end: int) -> list[str]:
+    """Get the log lines from 'start' to 'end', inclusive, like LRANGE does."""
+    return log[start : end + 1 or None] if end >= -len(log) else []
+
+
+class InMemoryJobStore(JobStore):
+    """A job store in the memory of this process, for single-node deployments and tests.
+
+    Everything is lost when the process stops. The records, logs and indexes are kept in the same form as in
+    the Redis job store, so both behave the same.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._records: dict[str, dict[str, bytes]] = {}
+        self._logs: dict[str, list[str]] = {}
+        self._scheduled: set[str] = set()
+        self._indexes: dict[str, dict[str, float]] = {}
+
+    def scan_records(self, count: int = 1000) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._records))
+
+    def get_records(self, keys: Iterable[str], fields: Sequence[str] | None = None) -> list[dict[str, bytes] | None]:
+        with self._lock:
+            return [self._get_record(key, fields) for key in keys]
+
+    def _get_record(self, key: str, fields: Sequence[str] | None) -> dict[str, bytes] | None:
+        record = self._records.get(key, {})
+        if fields:
+            record = {field: record[field] for field in fields if field in record}
+        return dict(record) or None
+
+    def get_records_and_logs(
+        self, keys: Iterable[str], fields: Sequence[str] | None = None, log_range: tuple[int, int] | None = (0, -1)
+    ) -> list[tuple[dict[str, bytes] | None, list[str], int]]:
+        with self._lock:
+            return [
+                (
+                    self._get_record(key, fields),
+                    _log_slice(self._logs.get(key, []), *log_range) if log_range else [],
+                    len(self._logs.get(key, [])),
+                )
+                for key in keys
+            ]
+
+    def get_logs(self, keys: Iterable[str]) -> list[list[str]]:
+        with self._lock:
+            return [list(self._logs.get(key, [])) for key in keys]
+
+    def set_record(
+        self, key: str, values: dict[str, str | bytes], log: Sequence[str] = (), replace_log: bool = False
+    ) -> None:
+        with self._lock:
+            if values:
+                self._records.setdefault(key, {}).update(
+                    {field: value.encode() if isinstance(value, str) else value for field, value in values.items()}
+                )
+                self._index(key, values)
+            if replace_log:
+                self._logs.pop(key, None)
+            if log:
+                self._logs.setdefault(key, []).extend(log)
+
+    def _index(self, key: str, values: Mapping[str, str | bytes]) -> None:
+        indexes, score = record_indexes(values)
+        if score is None:
+            return
+        self._indexes.setdefault(STARTED_INDEX_KEY, {})[key] = score
+        for name, value in indexes.items():
+            if name == "status":
+                for status in JobStatus:
+                    self._indexes.get(index_key(name, status.value), {}).pop(key, None)
+            self._indexes.setdefault(index_key(name, value), {})[key] = score
+
+    def delete_records(self, keys: Iterable[str]) -> int:
+        deleted = 0
+        with self._lock:
+            for key in keys:
+                deleted += (self._records.pop(key, None) is not None) + (self._logs.pop(key, None) is not None)
+                self._scheduled.discard(key)
+                for index in self._indexes.values():
+                    index.pop(key, None)
+        return deleted
+
+    def list_records(
+        self,
+        indexes: dict[str, str],
+        limit: int,
+        cursor: str | None = None,
+        started_after: float | None = None,
+        started_before: float | None = None,
+    ) -> tuple[list[str], str | None]:
+        cursor_score, cursor_key = _parse_cursor(cursor) if cursor else (float("inf"), "")
+        with self._lock:
+            keys = [index_key(name, value) for name, value in indexes.items()] or [STARTED_INDEX_KEY]
+            members = dict(self._indexes.get(keys[0], {}))
+            for key in keys[1:]:
+                index = self._indexes.get(key, {})
+                members = {member: max(score, index[member]) for member, score in members.items() if member in index}
+        entries = sorted(
+            (
+                (member, score)
+                for member, score in members.items()
+                if (started_after is None or score >= started_after)
+                and (started_before is None or score <= started_before)
+                and (not cursor or score < cursor_score or (score == cursor_score and member < cursor_key))
+            ),
+            key=lambda entry: (entry[1], entry[0]),
+            reverse=True,
+        )
+        page = entries[:limit]
+        next_cursor = _format_cursor(page[-1][1], page[-1][0]) if len(entries) > limit else None
+        return [key for key, _ in page], next_cursor
+
+    def compact(self, ended_before: float | None, max_records: int | None, batch_size: int = 500) -> int:
+        with self._lock:
+            finished = sorted(
+                (
+                    (score, key)
+                    for status in FINISHED_STATUSES
+                    for key, score in self._indexes.get(index_key("status", status.value), {}).items()
+                    if key not in self._scheduled
+                ),
+            )
+            expired = [
+                key
+                for _, key in finished
+                if ended_before is not None and _timestamp(self._records.get(key, {}).get("ended")) <= ended_before
+            ]
+            self.delete_records(expired)
+            excess = len(self._indexes.get(STARTED_INDEX_KEY, {})) - max_records if max_records else 0
+            oldest = [key for _, key in finished if key not in expired][: max(excess, 0)]
+            self.delete_records(oldest)
+        return len(expired) + len(oldest)
+
+    def set_scheduled(self, key: str, scheduled: bool = True) -> None:
+        with self._lock:
+            if scheduled:
+                self._scheduled.add(key)
+            else:
+                self._scheduled.discard(key)
+
+    def scan_scheduled(self, count: int = 1000) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._scheduled))
+
+    def migrate_legacy_records(self) -> int:
+        return 0
+
+    def flush(self) -> None:
+        with self._lock:
+            self._records.clear()
+            self._logs.clear()
+            self._scheduled.clear()
+            self._indexes.clear()
+
+
+_job_store: JobStore | None = None
+
+
+def get_job_store() -> JobStore:
+    """Get the process-wide job store, as set by JOB_STORE_BACKEND.
+
+    The Redis job store is backed by the shared connection pool.
+    """
+    global _job_store
+    if _job_store is None:
+        match config.JOB_STORE_BACKEND:
+            case "redis":
+                _job_store = RedisJobStore(redis.Redis(connection_pool=get_connection_pool(JOB_STORE_DB)))
+            case "memory":
+                _job_store = InMemoryJobStore()
+            case _:
+                raise ValueError(
+                    f"Unknown job store backend '{config.JOB_STORE_BACKEND}'. Supported backends are: redis, memory"
+                )
+    return _job_store
@@ -0,0 +1,103 @@
+import threading
+import uuid
+from time import monotonic
+from typing import Callable
+
+import redis
+
+from utils.logging import logger
+
+
+class LeaderElection:
+    """Elects one process, out of all the processes sharing a Redis database, as the leader.
+
+    The leader holds a lease, a Redis key with its token that expires after 'lease_seconds'. renew() must be called
+    regularly, well within the lease, to keep it. When the leader stops renewing, because it stopped or lost its
+    connection to Redis, the lease expires and the next process calling renew() takes over.
+    A process stops counting itself as the leader a 'safety_margin' fraction of the lease before the lease it last
+    renewed expires, even if renew() is not called in time, so two processes never act as the leader at once.
+    'on_change' is called with the new leadership of this process whenever it changes. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        key: str,
+        lease_seconds: float,
+        on_change: Callable[[bool], None] | None = None,
+        safety_margin: float = 0.2,
+    ):
+        self.client = client
+        self.key = key
+        self.lease_ms = int(lease_seconds * 1000)
+        self.on_change = on_change
+        self.safety_margin = safety_margin
+        self.token = uuid.uuid4().hex
+        self._is_leader = False
+        # When this process stops counting itself as the leader, unless it renews the lease before then
+        self._leader_until = 0.0
+        self._closed = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_leader(self) -> bool:
+        return self._is_leader and monotonic() < self._leader_until
+
+    def renew(self) -> bool:
+        """Extend the lease if this process holds it, or take it if no process does. Returns the leadership."""
+        with self._lock:
+            if self._closed:
+                return False
+            renewed = monotonic()
+            try:
+                leader = self._extend() or bool(self.client.set(self.key, self.token, nx=True, px=self.lease_ms))
+            except redis.RedisError as error:
+                # The lease can not be renewed, so another process may take it over when it expires
+                logger.warning(f"Failed to renew the leadership lease '{self.key}': {error}")
+                leader = False
+            if leader:
+                self._leader_until = renewed + self.lease_ms / 1000 * (1 - self.safety_margin)
+            self._set_leader(leader)
+            return leader
+
+    def resign(self) -> None:
+        """Give up the lease, if this process holds it, so another process can take over right away."""
+        with self._lock:
+            if not self._is_leader:
+                return
+            try:
+                self._if_leader(lambda pipe: pipe.delete(self.key))
+            except redis.RedisError as error:
+                logger.warning(f"Failed to give up the leadership lease '{self.key}': {error}")
+            self._set_leader(False)
+
+    def close(self) -> None:
+        """Give up the lease, and never take it again."""
+        with self._lock:
+            self._closed = True
+        self.resign()
+
+    def _extend(self) -> bool:
+        return self._if_leader(lambda pipe: pipe.pexpire(self.key, self.lease_ms))
+
+    def _if_leader(self, command: Callable[[redis.client.Pipeline], object]) -> bool:
+        """Run a command in a transaction, if the lease is held by this process. Returns whether it was run."""
+        with self.client.pipeline() as pipe:
+            try:
+                pipe.watch(self.key)
+                if pipe.get(self.key) != self.token.encode():
+                    return False
+                pipe.multi()
+                command(pipe)
+                pipe.execute()
+                return True
+            except redis.WatchError:  # The lease expired, and was taken by another process
+                return False
+
+    def _set_leader(self, leader: bool) -> None:
+        if leader == self._is_leader:
+            return
+        self._is_leader = leader
+        logger.info(f"{'Became' if leader else 'No longer'} the leader for '{self.key}'")
+        if self.on_change:
+            self.on_change(leader)
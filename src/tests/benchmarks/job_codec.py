@@ -0,0 +1,66 @@
+"""Micro-benchmark of the job store codecs.
+
+Compares the time to encode and decode a job record, and its size, for jobs with small and large logs.
+Run from the src folder with: python -m tests.benchmarks.job_codec
+"""
+
+import timeit
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from services.job_codec import CODECS, JobCodec, decode_value
+from services.job_handler_interface import Job, JobStatus
+from services.job_service import _STORED_FIELDS, _job_from_record
+
+ROUNDS = 2000
+
+
+def _job(log_lines: int) -> Job:
+    return Job(
+        type="dmss://WorkflowDS/Blueprints/Job",
+        dmss_id="DataSource/$4483c9b0-d505-46c9-a157-94c79f4d7a6a",
+        uid=uuid4(),
+        name="simulation",
+        status=JobStatus.RUNNING,
+        started=datetime.now(timezone.utc).replace(microsecond=0),
+        runner={"type": "dmss://WorkflowDS/Blueprints/AzureContainer", "image": "datamodelingtool.azurecr.io/sima"},
+        application_input={"type": "dmss://DataSource/Blueprints/Input", "cases": [{"value": i} for i in range(20)]},
+        log=[f"{i:06d} Step {i} of the simulation completed in 1.25 seconds" for i in range(log_lines)],
+        percentage=0.5,
+        token="x" * 1000,
+    )
+
+
+def _encode(codec: JobCodec, job: Job) -> dict[str, bytes]:
+    values = job.model_dump(mode=codec.dump_mode, include=set(_STORED_FIELDS))
+    return {field: codec.encode(value) for field, value in values.items()}
+
+
+def _decode(record: dict[str, bytes], log: list[str]) -> Job:
+    return _job_from_record({field: decode_value(value) for field, value in record.items()}, log)
+
+
+def main():
+    print(f"{'codec':<10}{'log lines':>10}{'encode µs':>12}{'decode µs':>12}{'record bytes':>14}{'log bytes':>11}")
+    for log_lines in (10, 10_000):
+        job = _job(log_lines)
+        # Log lines are stored as plain strings in a list next to the record, regardless of the codec
+        log_bytes = sum(len(line.encode()) for line in job.log)  # type: ignore[union-attr]
+        for name, codec_class in CODECS.items():
+            try:
+                codec = codec_class()
+            except ImportError as error:
+                print(f"{name:<10}{error}")
+                continue
+            record = _encode(codec, job)
+            encode_time = timeit.timeit(lambda: _encode(codec, job), number=ROUNDS) / ROUNDS
+            decode_time = timeit.timeit(lambda: _decode(record, job.log), number=ROUNDS) / ROUNDS  # type: ignore
+            record_bytes = sum(len(value) for value in record.values())
+            print(
+                f"{name:<10}{log_lines:>10}{encode_time * 1e6:>12.1f}{decode_time * 1e6:>12.1f}"
+                f"{record_bytes:>14}{log_bytes:>11}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest import mock
+
+from azure.core.exceptions import ResourceNotFoundError
+
+from job_handler_plugins import azure_container_instances
+from services.azure_reaper import ContainerGroupReaper
+
+
+def _container(finish_time: datetime | None):
+    current_state = SimpleNamespace(state="Terminated" if finish_time else "Running", finish_time=finish_time)
+    return SimpleNamespace(name="job", instance_view=SimpleNamespace(current_state=current_state))
+
+
+class TestContainerGroupReaper(unittest.TestCase):
+    def test_queued_groups_are_deleted_once(self):
+        client = mock.Mock()
+        reaper = ContainerGroupReaper(max_workers=2)
+        reaper.delete(client, "rg", "job-1")
+        reaper.delete(client, "rg", "job-1")
+        reaper.delete(client, "rg", "job-2")
+        assert reaper.reap() == 2
+        assert sorted(call.args[1] for call in client.container_groups.begin_delete.call_args_list) == [
+            "job-1",
+            "job-2",
+        ]
+        assert reaper.reap() == 0
+
+    def test_failed_deletions_are_retried(self):
+        client = mock.Mock()
+        client.container_groups.begin_delete.side_effect = [RuntimeError("throttled"), mock.Mock()]
+        reaper = ContainerGroupReaper(max_workers=1)
+        reaper.delete(client, "rg", "job-1")
+        assert reaper.reap() == 0
+        assert reaper.pending() == 1
+        assert reaper.reap() == 1
+        assert reaper.pending() == 0
+
+    def test_deleted_groups_count_as_deleted(self):
+        client = mock.Mock()
+        client.container_groups.begin_delete.side_effect = ResourceNotFoundError("gone")
+        reaper = ContainerGroupReaper(max_workers=1)
+        reaper.delete(client, "rg", "job-1")
+        assert reaper.reap() == 1
+
+    def test_gives_up_after_max_attempts(self):
+        client = mock.Mock()
+        client.container_groups.begin_delete.side_effect = RuntimeError("forbidden")
+        reaper = ContainerGroupReaper(max_workers=1, max_attempts=2)
+        reaper.delete(client, "rg", "job-1")
+        reaper.reap()
+        reaper.reap()
+        assert reaper.pending() == 0
+        assert client.container_groups.begin_delete.call_count == 2
+
+
+class TestSweepEndedContainerGroups(unittest.TestCase):
+    def test_only_job_groups_that_ended_before_the_retention_are_swept(self):
+        long_ago = datetime.now(timezone.utc) - timedelta(days=1)
+        groups = {
+            "ended": (["dm-job-uid"], [_container(long_ago)]),
+            "just-ended": (["dm-job-uid"], [_container(datetime.now(timezone.utc))]),
+            "running": (["dm-job-batch"], [_container(long_ago), _container(None)]),
+            "not-a-job": ([], [_container(long_ago)]),
+        }
+        client = mock.Mock()
+        client.container_groups.list_by_resource_group.return_value = [
+            SimpleNamespace(name=name, tags=dict.fromkeys(tags, "")) for name, (tags, _) in groups.items()
+        ]
+        client.container_groups.get.side_effect = lambda _, name: SimpleNamespace(containers=groups[name][1])
+        reaper = ContainerGroupReaper(max_workers=1)
+        with (
+            mock.patch.object(azure_container_instances, "_get_aci_client", return_value=client),
+            mock.patch.object(azure_container_instances, "get_container_group_reaper", return_value=reaper),
+        ):
+            assert azure_container_instances.sweep_ended_container_groups() == 1
+        reaper.reap()
+        client.container_groups.begin_delete.assert_called_once_with(mock.ANY, "ended")
+
+    def test_only_the_leader_sweeps(self):
+        with mock.patch.object(azure_container_instances.scheduler, "add_job") as add_job:
+            azure_container_instances.schedule_container_group_maintenance()
+        (sweep,) = [call.args[0] for call in add_job.call_args_list if call.kwargs["id"] == "sweep-container-groups"]
+        with (
+            mock.patch.object(azure_container_instances, "_get_aci_client") as get_aci_client,
+            mock.patch("services.job_scheduler.is_scheduler_leader", return_value=False),
+        ):
+            sweep()
+        get_aci_client.assert_not_called()
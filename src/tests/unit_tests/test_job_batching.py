@@ -0,0 +1,79 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest import mock
+from uuid import uuid4
+
+from job_handler_plugins.azure_container_instances import JobHandler
+from job_handler_plugins.azure_container_instances.batching import JobBatcher
+from services.azure_reaper import get_container_group_reaper
+from services.job_handler_interface import Job, JobStatus
+
+
+def _container(name: str, state: str, exit_code: int | None = None):
+    current_state = SimpleNamespace(state=state, exit_code=exit_code, finish_time=None)
+    return SimpleNamespace(name=name, instance_view=SimpleNamespace(current_state=current_state, events=[]))
+
+
+class TestJobBatcher(unittest.TestCase):
+    def test_jobs_started_together_share_a_batch(self):
+        submitted = []
+        batcher = JobBatcher(3, 5, 4, 16, lambda name, key, items: submitted.append((name, key, list(items))))
+        with ThreadPoolExecutor(3) as executor:
+            names = list(executor.map(lambda item: batcher.add("image", item, 1, 1), ["a", "b", "c"]))
+        assert len(set(names)) == 1
+        assert len(submitted) == 1
+        assert sorted(submitted[0][2]) == ["a", "b", "c"]
+
+    def test_batches_are_limited_by_resources(self):
+        submitted = []
+        batcher = JobBatcher(3, 0.1, 4, 16, lambda name, key, items: submitted.append(list(items)))
+        with ThreadPoolExecutor(2) as executor:
+            names = list(executor.map(lambda item: batcher.add("image", item, 3, 1), ["a", "b"]))
+        assert names[0] != names[1]
+        assert sorted(submitted) == [["a"], ["b"]]
+
+    def test_submit_errors_are_raised_for_every_job(self):
+        def submit(name, key, items):
+            raise ValueError("quota")
+
+        batcher = JobBatcher(2, 5, 4, 16, submit)
+        with ThreadPoolExecutor(2) as executor:
+            futures = [executor.submit(batcher.add, "image", item, 1, 1) for item in ("a", "b")]
+        for future in futures:
+            assert isinstance(future.exception(), ValueError)
+
+
+class TestSharedContainerGroup(unittest.TestCase):
+    def _handler(self, container: str) -> JobHandler:
+        job = Job(
+            type="Job",
+            dmss_id="DataSource/$1",
+            uid=uuid4(),
+            status=JobStatus.RUNNING,
+            runner={"name": "runner"},
+            state={"container_group": "batch-1", "container": container},
+        )
+        handler = JobHandler(job, "DataSource")
+        handler._aci_client = mock.Mock()
+        handler.fetch_logs = False
+        handler._aci_client.container_groups.get.return_value = SimpleNamespace(
+            provisioning_state="Succeeded",
+            containers=[_container("job-1", "Terminated", 0), _container("job-2", "Running")],
+        )
+        return handler
+
+    def test_status_is_tracked_per_container(self):
+        assert self._handler("job-1").progress()[0] == JobStatus.COMPLETED
+        assert self._handler("job-2").progress()[0] == JobStatus.RUNNING
+
+    def test_shared_group_is_kept_while_other_jobs_run(self):
+        handler = self._handler("job-1")
+        assert handler.remove()[0] == JobStatus.REMOVED
+        handler._aci_client.container_groups.begin_delete.assert_not_called()
+
+    def test_shared_group_is_deleted_right_away_once_other_jobs_ended(self):
+        handler = self._handler("job-2")
+        assert handler.remove()[0] == JobStatus.REMOVED
+        handler._aci_client.container_groups.begin_delete.assert_called_once_with(mock.ANY, "batch-1", polling=False)
+        assert get_container_group_reaper().pending() == 0
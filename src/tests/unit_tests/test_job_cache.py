@@ -0,0 +1,71 @@
+import time
+import unittest
+from uuid import uuid4
+
+import redis
+
+from config import config
+from services.job_cache import JobCache, get_job_cache
+from services.job_handler_interface import Job, JobStatus
+from services.job_service import _get_job, _set_job
+from services.job_store import JOB_STORE_DB, RedisJobStore, get_connection_pool
+
+
+def _subscribed_cache(max_size: int = 10) -> JobCache:
+    cache = JobCache(max_size=max_size, ttl=60, max_log_lines=3)
+    cache.subscribed.set()
+    return cache
+
+
+class TestJobCache(unittest.TestCase):
+    def test_least_recently_used_records_are_evicted(self):
+        cache = _subscribed_cache(max_size=2)
+        for key in ("a", "b"):
+            cache.put(key, {"status": b'"running"'}, None, cache.generation())
+        cache.get("a")
+        cache.put("c", {"status": b'"running"'}, None, cache.generation())
+        assert cache.get("b") is None
+        assert cache.get("a") and cache.get("c")
+
+    def test_records_read_before_an_invalidation_are_not_cached(self):
+        cache = _subscribed_cache()
+        generation = cache.generation()
+        cache.invalidate("a")
+        cache.put("a", {"status": b'"running"'}, None, generation)
+        assert cache.get("a") is None
+        # Long logs are not cached
+        cache.put("a", {"status": b'"running"'}, ["1", "2", "3", "4"], cache.generation())
+        assert cache.get("a") is None
+
+    def test_writes_are_applied_to_cached_records(self):
+        cache = _subscribed_cache()
+        cache.put("a", {"status": b'"running"', "percentage": b"0.1"}, ["1"], cache.generation())
+        cache.end_write("a", cache.begin_write("a"), {"percentage": b"0.5"}, ["2"], False)
+        assert cache.get("a")[:2] == ({"status": b'"running"', "percentage": b"0.5"}, ("1", "2"))  # type: ignore
+        cache.end_write("a", cache.begin_write("a"), {}, ["3"], True)
+        assert cache.get("a").log == ("3",)  # type: ignore
+
+        # A record invalidated while it is written is not cached
+        entry = cache.begin_write("a")
+        cache.invalidate("a")
+        cache.end_write("a", entry, {}, ["4"], False)
+        assert cache.get("a") is None
+
+    @unittest.skipIf(config.JOB_STORE_BACKEND != "redis", "Only jobs in the Redis job store are cached")
+    def test_writes_by_other_processes_invalidate_cached_jobs(self):
+        job_cache = get_job_cache()
+        assert job_cache and job_cache.subscribed.wait(5)
+        job = Job(
+            type="dmss://WorkflowDS/Blueprints/Job", dmss_id="DataSource/$1", uid=uuid4(), status=JobStatus.RUNNING
+        )
+        _set_job(job)
+        _get_job(job.job_uid)
+        assert job_cache.get(str(job.job_uid))
+
+        other_process = RedisJobStore(redis.Redis(connection_pool=get_connection_pool(JOB_STORE_DB)))
+        other_process.set_record(str(job.job_uid), {"status": '"completed"'})
+        for _ in range(50):
+            if job_cache.get(str(job.job_uid)) is None:
+                break
+            time.sleep(0.1)
+        assert _get_job(job.job_uid).status == JobStatus.COMPLETED
@@ -0,0 +1,41 @@
+import json
+import unittest
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from services import job_codec
+from services.job_codec import CODECS, decode_value
+from services.job_handler_interface import Job, JobStatus
+
+
+def _installed(codec: str) -> bool:
+    """Whether the package a codec requires is installed. The json codec needs none."""
+    return getattr(job_codec, codec, True) is not None
+
+
+class TestJobCodec(unittest.TestCase):
+    def test_round_trip(self):
+        job = Job(
+            type="dmss://WorkflowDS/Blueprints/Job",
+            dmss_id="DataSource/$1",
+            uid=uuid4(),
+            status=JobStatus.RUNNING,
+            started=datetime(2024, 1, 1, tzinfo=timezone.utc),
+            runner={"type": "Docker"},
+        )
+        for name, codec_class in CODECS.items():
+            if not _installed(name):
+                continue
+            codec = codec_class()
+            values = job.model_dump(mode=codec.dump_mode, exclude={"exclude_keys"})
+            decoded = {field: decode_value(codec.encode(value)) for field, value in values.items()}
+            assert Job(**decoded) == job, codec.name
+
+    def test_json_values_are_read_by_all_versions(self):
+        # Values written before codecs were introduced, and by the json codec, are plain JSON
+        assert decode_value(json.dumps({"cron": "* * * * *"})) == {"cron": "* * * * *"}
+        assert json.loads(CODECS["json"]().encode({"a": [1, None]})) == {"a": [1, None]}
+
+    @unittest.skipUnless(_installed("msgpack"), "msgpack is not installed")
+    def test_msgpack_values_are_read_by_all_codecs(self):
+        assert decode_value(CODECS["msgpack"]().encode("running")) == "running"
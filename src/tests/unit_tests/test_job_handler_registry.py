@@ -0,0 +1,149 @@
+import asyncio
+import subprocess  # nosec
+import sys
+import unittest
+from importlib.metadata import EntryPoint
+from pathlib import Path
+from typing import Tuple
+from unittest import mock
+from uuid import uuid4
+
+import default_job_handlers.local_shell as local_shell
+import default_job_handlers.recurring_job as recurring_job
+import job_handler_plugins.reverse_description as reverse_description
+from restful.exceptions import NotImplementedException
+from services.job_handler_interface import (
+    AsyncJobHandlerInterface,
+    Job,
+    JobHandlerInterface,
+    JobStatus,
+)
+from services.job_handler_registry import JobHandlerRegistry, job_handler_registry
+from services.job_service import (
+    _await_job_handler,
+    _call_job_handler,
+    _reused_job_handler,
+)
+
+
+class TestJobHandlerRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = JobHandlerRegistry(packages=("default_job_handlers",), entry_point_group=None)
+
+    def test_every_supported_type_is_registered(self):
+        assert self.registry.get(recurring_job._SUPPORTED_TYPE) is recurring_job.JobHandler
+        assert isinstance(local_shell._SUPPORTED_TYPE, tuple)
+        for runner_type in local_shell._SUPPORTED_TYPE:
+            assert self.registry.get(runner_type) is local_shell.JobHandler
+
+    def test_unknown_type(self):
+        with self.assertRaises(NotImplementedException):
+            self.registry.get("dmss://WorkflowDS/Blueprints/Unknown")
+
+    def test_modules_are_imported_once(self):
+        with mock.patch.object(self.registry, "_find_modules", wraps=self.registry._find_modules) as find_modules:
+            self.registry.get(recurring_job._SUPPORTED_TYPE)
+            self.registry.get(recurring_job._SUPPORTED_TYPE)
+            assert find_modules.call_count == 1
+            self.registry.reload()
+            assert find_modules.call_count == 2
+        assert self.registry.get(recurring_job._SUPPORTED_TYPE) is recurring_job.JobHandler
+
+    def test_enabled_handlers(self):
+        registry = JobHandlerRegistry(
+            packages=("job_handler_plugins",), entry_point_group=None, enabled=["reverse_description"]
+        )
+        assert registry.runner_types() == [reverse_description._SUPPORTED_TYPE]
+        assert not registry._handlers  # Handler modules are imported when they are first used
+        assert registry.get(reverse_description._SUPPORTED_TYPE) is reverse_description.JobHandler
+        with self.assertRaises(NotImplementedException):
+            registry.get("dmss://WorkflowDS/Blueprints/Radix")
+
+    def test_entry_points(self):
+        entry_point = EntryPoint(
+            name="reverse_description",
+            value="job_handler_plugins.reverse_description:JobHandler",
+            group="dm_job.job_handlers",
+        )
+        with mock.patch("services.job_handler_registry.entry_points", return_value=[entry_point]):
+            registry = JobHandlerRegistry(packages=(), entry_point_group="dm_job.job_handlers")
+            assert registry.get(reverse_description._SUPPORTED_TYPE) is reverse_description.JobHandler
+
+    def test_startup_does_not_import_handler_dependencies(self):
+        code = (
+            "import app; from services.job_handler_registry import job_handler_registry; job_handler_registry.load()"
+        )
+        result = subprocess.run(  # nosec
+            [sys.executable, "-X", "importtime", "-c", code],
+            cwd=Path(__file__).parents[2],
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+        assert result.returncode == 0, result.stderr
+        imported = {
+            line.rsplit("|", 1)[1].strip() for line in result.stderr.splitlines() if line.startswith("import time:")
+        }
+        assert "services.job_handler_registry" in imported
+        for module in ("azure.identity", "azure.mgmt.containerinstance", "azure.monitor.opentelemetry", "docker"):
+            assert module not in imported, f"'{module}' is imported when the API starts"
+
+
+class _ReusableJobHandler(JobHandlerInterface):
+    reusable = True
+
+    def start(self) -> str:
+        return "started"
+
+
+class TestReusedJobHandler(unittest.TestCase):
+    def test_handler_is_reused_for_the_same_job(self):
+        job = Job(type="Job", dmss_id="DataSource/$1", uid=uuid4(), status=JobStatus.RUNNING, runner={"type": "Test"})
+        with mock.patch.object(job_handler_registry, "get", return_value=_ReusableJobHandler):
+            with _reused_job_handler(job) as first:
+                pass
+            newer_job = job.model_copy(update={"percentage": 0.5})
+            with _reused_job_handler(newer_job) as second:
+                assert second is first
+                assert second.job is newer_job
+            with self.assertRaises(RuntimeError), _reused_job_handler(job) as third:
+                raise RuntimeError()
+            with _reused_job_handler(job) as fourth:  # Handlers are not kept if they failed
+                assert fourth is not third
+
+
+class _AsyncJobHandler(AsyncJobHandlerInterface):
+    async def start(self) -> str:
+        return "started"
+
+    async def progress(self) -> Tuple[JobStatus, None | list[str] | str, None | float]:
+        await asyncio.sleep(0)
+        return JobStatus.RUNNING, ["async"], 0.5
+
+
+class _SyncJobHandler(JobHandlerInterface):
+    def start(self) -> str:
+        return "started"
+
+    def progress(self) -> Tuple[JobStatus, None | list[str] | str, None | float]:
+        return JobStatus.COMPLETED, ["sync"], 1.0
+
+
+class TestAsyncJobHandler(unittest.TestCase):
+    def setUp(self):
+        self.job = Job(type="Job", dmss_id="DataSource/$1", uid=uuid4(), status=JobStatus.RUNNING, runner={})
+
+    def test_async_handler_called_from_a_thread(self):
+        assert _call_job_handler(_AsyncJobHandler(self.job, "DataSource"), "progress") == (
+            JobStatus.RUNNING,
+            ["async"],
+            0.5,
+        )
+        with self.assertRaises(NotImplementedError):
+            _call_job_handler(_AsyncJobHandler(self.job, "DataSource"), "remove")
+
+    def test_sync_handler_awaited(self):
+        job_handler = _SyncJobHandler(self.job, "DataSource")
+        assert asyncio.run(_await_job_handler(job_handler, "progress")) == (JobStatus.COMPLETED, ["sync"], 1.0)
+        with self.assertRaises(NotImplementedError):
+            asyncio.run(_await_job_handler(job_handler, "remove"))
@@ -0,0 +1,69 @@
+import unittest
+from unittest import mock
+from uuid import uuid4
+
+from job_handler_plugins.azure_container_instances import JobHandler, _new_log_lines
+from services.job_handler_interface import Job
+
+
+class TestJobLog(unittest.TestCase):
+    def setUp(self):
+        self.job = Job(type="dmss://WorkflowDS/Blueprints/Job", dmss_id="DataSource/$1", uid=uuid4(), log=["a"])
+
+    def test_only_new_lines_are_written(self):
+        self.job.append_log("b\nc")
+        assert self.job.log == ["a", "b", "c"]
+        assert self.job.pop_log_changes() == (["b", "c"], False)
+        assert self.job.pop_log_changes() == ([], False)
+
+    def test_set_log_that_continues_the_current_log(self):
+        self.job.set_log(["a", "b"])
+        assert self.job.log == ["a", "b"]
+        assert self.job.pop_log_changes() == (["b"], False)
+
+    def test_set_log_that_replaces_the_current_log(self):
+        self.job.set_log(["x"])
+        assert self.job.log == ["x"]
+        assert self.job.pop_log_changes() == (["x"], True)
+
+
+class TestIncrementalContainerLog(unittest.TestCase):
+    def test_new_lines_after_the_overlap(self):
+        assert _new_log_lines(["a", "b", "c"], ["b", "c", "d"], 3) == ["d"]
+        assert _new_log_lines(["a", "b", "c"], ["c", "c", "d"], 3) == ["c", "d"]
+        assert _new_log_lines(["a", "b", "c"], ["a", "b", "c"], 3) == []
+
+    def test_whole_log_in_the_tail(self):
+        assert _new_log_lines(["a", "b"], ["a", "b", "c"], 10) == ["c"]
+        assert _new_log_lines(["a", "x"], ["a", "b", "c"], 10) is None
+
+    def test_repeated_lines(self):
+        # The tail overlaps the log in two ways, so the number of new lines is unknown
+        assert _new_log_lines(["a", "b", "a", "b"], ["a", "b", "a", "b"], 4) is None
+        assert _new_log_lines(["x", "progress", "progress"], ["progress", "progress"], 2) is None
+        assert _new_log_lines(["a", "b", "a", "b"], ["a", "b", "a", "b", "a", "b"], 10) == ["a", "b"]
+
+    def test_tail_without_overlap(self):
+        assert _new_log_lines(["a", "b"], ["d", "e", "f"], 3) is None
+
+    @mock.patch("config.config.AZURE_LOG_TAIL_LINES", 2)
+    def test_only_the_tail_is_fetched_after_the_first_poll(self):
+        job = Job(type="Job", dmss_id="DataSource/$1", uid=uuid4(), runner={"name": "job_1"})
+        handler = JobHandler(job, "DataSource")
+        handler._aci_client = mock.Mock()
+        list_logs = handler._aci_client.containers.list_logs
+
+        list_logs.return_value.content = "a\nb\nc\n"
+        assert handler._fetch_log() == ["a", "b", "c"]
+        assert list_logs.call_args.kwargs["tail"] is None
+
+        job.log = ["a", "b", "c"]
+        list_logs.return_value.content = "c\nd\n"
+        assert handler._fetch_log() == ["a", "b", "c", "d"]
+        assert list_logs.call_args.kwargs["tail"] == 2
+        assert job.state["log_lines"] == 4
+
+        job.log = ["a", "b", "c", "d"]
+        list_logs.side_effect = [mock.Mock(content="x\ny\n"), mock.Mock(content="a\nb\nc\nd\nx\ny\n")]
+        assert handler._fetch_log() == ["a", "b", "c", "d", "x", "y"]
+        assert list_logs.call_args.kwargs["tail"] is None
@@ -0,0 +1,119 @@
+import time
+import unittest
+from unittest import mock
+from uuid import uuid4
+
+import redis
+
+import worker
+from services.job_handler_interface import Job, JobStatus
+from services.job_queue import STREAM_KEY, JobQueue, get_job_queue
+from services.job_service import _get_job, _set_job, run_queued_job
+from services.job_store import SCHEDULER_DB, get_connection_pool
+
+
+def _queue(max_attempts: int = 3, claim_idle_seconds: float = 300) -> JobQueue:
+    client = redis.Redis(connection_pool=get_connection_pool(SCHEDULER_DB))
+    client.delete(STREAM_KEY)
+    return JobQueue(client, max_attempts, claim_idle_seconds)
+
+
+class TestJobQueue(unittest.TestCase):
+    def test_each_job_is_read_once(self):
+        queue = _queue()
+        queue.enqueue("job-1")
+        queue.enqueue("job-2")
+        first, second = queue.read("worker-1", block_ms=10), queue.read("worker-2", block_ms=10)
+        assert [queued.job_uid for queued in first + second] == ["job-1", "job-2"]
+        assert queue.read("worker-3", block_ms=10) == []
+        for queued in first + second:
+            queue.done(queued)
+        assert queue.client.xlen(STREAM_KEY) == 0
+
+    def test_jobs_are_retried_until_they_have_used_all_attempts(self):
+        queue = _queue(max_attempts=2)
+        queue.enqueue("job-1")
+        (queued,) = queue.read("worker-1", block_ms=10)
+        assert queue.retry(queued)
+        (queued,) = queue.read("worker-1", block_ms=10)
+        assert queued.attempt == 2
+        assert not queue.retry(queued)
+        assert queue.client.xlen(STREAM_KEY) == 0
+
+    def test_jobs_of_stopped_workers_are_retried_by_others(self):
+        queue = _queue(claim_idle_seconds=0)
+        queue.enqueue("job-1")
+        (abandoned,) = queue.read("worker-1", block_ms=10)
+        (queued,) = queue.read("worker-2", block_ms=10)
+        assert (queued.job_uid, queued.attempt) == (abandoned.job_uid, 2)
+
+    def test_jobs_that_are_kept_are_not_retried_by_others(self):
+        queue = _queue(claim_idle_seconds=0.2)
+        queue.enqueue("job-1")
+        (queued,) = queue.read("worker-1", block_ms=10)
+        time.sleep(0.15)
+        queue.keep(queued, "worker-1")
+        time.sleep(0.1)
+        assert queue.read("worker-2", block_ms=10) == []
+
+    @mock.patch("config.config.JOB_STORE_BACKEND", "memory")
+    def test_the_queue_requires_a_shared_job_store(self):
+        with self.assertRaises(ValueError):
+            get_job_queue()
+
+
+class TestWorker(unittest.TestCase):
+    def test_failed_starts_are_retried(self):
+        queue = _queue()
+        queue.enqueue("job-1")
+        (queued,) = queue.read("worker-1", block_ms=10)
+        with mock.patch.object(worker, "run_queued_job", side_effect=ConnectionError("DMSS is unavailable")):
+            worker.start(queue, queued, "worker-1")
+        (retried,) = queue.read("worker-1", block_ms=10)
+        with mock.patch.object(worker, "run_queued_job") as run_queued:
+            worker.start(queue, retried, "worker-1")
+        run_queued.assert_called_once_with("job-1", retried=True)
+        assert queue.client.xlen(STREAM_KEY) == 0
+
+    @mock.patch("services.job_service.update_document")
+    def test_jobs_are_failed_once_they_have_used_all_attempts(self, update_document):
+        job = Job(type="Job", dmss_id="DataSource/$1", uid=uuid4(), status=JobStatus.STARTING, runner={"type": "Any"})
+        _set_job(job)
+        queue = _queue(max_attempts=1)
+        queue.enqueue(str(job.job_uid))
+        (queued,) = queue.read("worker-1", block_ms=10)
+        with mock.patch.object(worker, "run_queued_job", side_effect=ConnectionError("DMSS is unavailable")):
+            worker.start(queue, queued, "worker-1")
+
+        assert queue.client.xlen(STREAM_KEY) == 0
+        job = _get_job(job.job_uid)
+        assert job.status == JobStatus.FAILED
+        assert job.log and "DMSS is unavailable" in job.log[-1]
+
+    @mock.patch("services.job_service.update_document")
+    def test_jobs_abandoned_on_their_last_attempt_are_failed(self, update_document):
+        job = Job(type="Job", dmss_id="DataSource/$1", uid=uuid4(), status=JobStatus.STARTING, runner={"type": "Any"})
+        _set_job(job)
+        queue = _queue(max_attempts=1, claim_idle_seconds=0)
+        queue.enqueue(str(job.job_uid))
+        queue.read("worker-1", block_ms=10)  # The worker stops before it acknowledges the job
+
+        (abandoned,) = queue.read("worker-2", block_ms=10)
+        assert abandoned.abandoned
+        with mock.patch.object(worker, "run_queued_job") as run_queued:
+            worker.start(queue, abandoned, "worker-2")
+        run_queued.assert_not_called()
+
+        assert queue.client.xlen(STREAM_KEY) == 0
+        job = _get_job(job.job_uid)
+        assert job.status == JobStatus.FAILED
+        assert job.log and "worker starting it stopped" in job.log[-1]
+
+    def test_retried_jobs_that_were_started_are_not_started_again(self):
+        job = Job(type="Job", dmss_id="DataSource/$1", uid=uuid4(), status=JobStatus.RUNNING, runner={"type": "Any"})
+        _set_job(job)
+        with mock.patch("services.job_service._run_job") as run_job:
+            run_queued_job(str(job.job_uid), retried=True)
+            run_job.assert_not_called()
+            run_queued_job(str(job.job_uid))
+            run_job.assert_called_once_with(job.job_uid)
@@ -0,0 +1,205 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Tuple
+from unittest import mock
+from uuid import UUID, uuid4
+
+from azure.core.exceptions import ResourceNotFoundError
+
+from job_handler_plugins.azure_container_instances import JobHandler as AzureJobHandler
+from restful.exceptions import NotFoundException
+from services.job_handler_interface import Job, JobHandlerInterface, JobStatus
+from services.job_handler_registry import job_handler_registry
+from services.job_service import (
+    _get_job,
+    _set_job,
+    reconcile_starting_jobs,
+    refresh_active_jobs,
+)
+from services.job_store import get_job_store
+
+
+class _ProvisionedJobHandler(JobHandlerInterface):
+    start_timeout = True
+    removed: list[UUID] = []
+
+    def start(self) -> str:
+        return "started"
+
+    def remove(self) -> Tuple[JobStatus, str]:
+        self.removed.append(self.job.job_uid)
+        return JobStatus.REMOVED, "removed"
+
+    def progress(self) -> Tuple[JobStatus, None | list[str] | str, None | float]:
+        self.job.state = {"provisioned": True}
+        return JobStatus.RUNNING, ["running"], None
+
+
+class _QueuedJobHandler(JobHandlerInterface):
+    """A job handler whose backend can keep jobs queued for a long time."""
+
+    def start(self) -> str:
+        return "started"
+
+    def progress(self) -> Tuple[JobStatus, None | list[str] | str, None | float]:
+        return JobStatus.STARTING, None, None
+
+
+class _UnpolledJobHandler(_QueuedJobHandler):
+    def progress(self) -> Tuple[JobStatus, None | list[str] | str, None | float]:
+        raise NotImplementedError
+
+
+class _ListingJobHandler(_ProvisionedJobHandler):
+    @classmethod
+    def refresh(cls, jobs: list[Job]) -> dict[UUID, JobStatus]:
+        return {job.job_uid: JobStatus.COMPLETED if job.name == "done" else job.status for job in jobs if job.name}
+
+
+def _starting_job(
+    dispatched: datetime | None,
+    status: JobStatus = JobStatus.STARTING,
+    name: str | None = None,
+    runner_type: str = "Provisioned",
+) -> Job:
+    job = Job(
+        type="Job",
+        dmss_id="DataSource/$1",
+        uid=uuid4(),
+        name=name,
+        status=status,
+        # Registered long ago, so only the time the job was handed to its job handler decides when it times out
+        started=datetime.now(timezone.utc) - timedelta(days=2),
+        dispatched=dispatched,
+        runner={"type": runner_type},
+    )
+    _set_job(job)
+    return job
+
+
+class TestJobReconciliation(unittest.TestCase):
+    def setUp(self):
+        get_job_store().flush()
+
+    @mock.patch("services.job_service.update_document")
+    def test_starting_jobs_are_polled(self, update_document):
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        provisioned = _starting_job(now)
+        timed_out = _starting_job(now - timedelta(days=1))
+        not_dispatched = _starting_job(None)
+        queued = _starting_job(now - timedelta(days=1), runner_type="Queued")
+        unpolled = _starting_job(now - timedelta(days=1), runner_type="Unpolled")
+        handlers = {
+            "Provisioned": _ProvisionedJobHandler,
+            "Queued": _QueuedJobHandler,
+            "Unpolled": _UnpolledJobHandler,
+        }
+        with (
+            mock.patch.object(job_handler_registry, "get", side_effect=handlers.get),
+            mock.patch("services.job_service.logger") as logger,
+        ):
+            assert reconcile_starting_jobs() == 2
+        logger.warning.assert_not_called()
+
+        job = _get_job(provisioned.job_uid)
+        assert job.status == JobStatus.RUNNING
+        assert job.state == {"provisioned": True}
+        assert job.log == ["running"]
+        job = _get_job(timed_out.job_uid)
+        assert job.status == JobStatus.FAILED
+        assert job.log and "did not start" in job.log[-1]
+        assert _ProvisionedJobHandler.removed == [timed_out.job_uid]
+        assert _get_job(not_dispatched.job_uid).status == JobStatus.STARTING
+        # Only the job handlers with a start timeout have their jobs failed when they do not start in time
+        assert _get_job(queued.job_uid).status == JobStatus.STARTING
+        assert _get_job(unpolled.job_uid).status == JobStatus.STARTING
+        assert update_document.call_count == 3
+
+
+class TestJobStatusRefresh(unittest.TestCase):
+    def setUp(self):
+        get_job_store().flush()
+
+    @mock.patch("services.job_service.update_document")
+    def test_active_jobs_are_refreshed_in_bulk(self, update_document):
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        done = _starting_job(now, JobStatus.RUNNING, name="done")
+        running = _starting_job(now, JobStatus.RUNNING, name="running")
+        unlisted = _starting_job(now, JobStatus.RUNNING)
+        with (
+            mock.patch.object(job_handler_registry, "runner_types", return_value=["Provisioned"]),
+            mock.patch.object(job_handler_registry, "get", return_value=_ListingJobHandler),
+        ):
+            assert refresh_active_jobs() == 1
+
+        job = _get_job(done.job_uid)
+        assert job.status == JobStatus.COMPLETED and job.refreshed
+        job = _get_job(running.job_uid)
+        assert job.status == JobStatus.RUNNING and job.refreshed
+        job = _get_job(unlisted.job_uid)
+        assert job.status == JobStatus.RUNNING and not job.refreshed
+        assert update_document.call_count == 1
+
+    @mock.patch("services.job_service.update_document")
+    def test_handlers_without_refresh_are_skipped(self, update_document):
+        _starting_job(datetime.now(timezone.utc), JobStatus.RUNNING, name="done")
+        with (
+            mock.patch.object(job_handler_registry, "runner_types", return_value=["Provisioned"]),
+            mock.patch.object(job_handler_registry, "get", return_value=_ProvisionedJobHandler),
+        ):
+            assert refresh_active_jobs() == 0
+        update_document.assert_not_called()
+
+    @mock.patch("config.config.JOB_REFRESH_INTERVAL_SECONDS", 30)
+    def test_azure_progress_uses_a_recently_refreshed_status(self):
+        job = Job(type="Job", dmss_id="DataSource/$1", uid=uuid4(), status=JobStatus.RUNNING, runner={"name": "job"})
+        handler = AzureJobHandler(job, "DataSource")
+        handler._aci_client = mock.Mock()
+        handler.fetch_logs = False
+
+        job.refreshed = datetime.now(timezone.utc) - timedelta(seconds=10)
+        assert handler.progress()[0] == JobStatus.RUNNING
+        handler._aci_client.container_groups.get.assert_not_called()
+
+        # The status is out of date once the leader has missed two refreshes, so it is got from Azure
+        job.refreshed = datetime.now(timezone.utc) - timedelta(seconds=90)
+        handler._aci_client.container_groups.get.side_effect = ResourceNotFoundError()
+        with self.assertRaises(NotFoundException):
+            handler.progress()
+
+    @mock.patch("config.config.AZURE_REFRESH_MAX_REQUESTS", 1)
+    def test_azure_refresh_gets_the_state_of_containers_missing_from_the_listing(self):
+        def job(name: str) -> Job:
+            return Job(
+                type="Job", dmss_id="DataSource/$1", uid=uuid4(), status=JobStatus.STARTING, runner={"name": name}
+            )
+
+        def group(name: str, provisioning_state: str, state: str | None = None):
+            # Only a container group that is got on its own has an instance view
+            return SimpleNamespace(
+                name=name,
+                provisioning_state=provisioning_state,
+                instance_view=SimpleNamespace(state=state) if state else None,
+            )
+
+        failed, creating, running, not_got = job("failed"), job("creating"), job("running"), job("not-got")
+        running.refreshed = datetime.now(timezone.utc) - timedelta(minutes=5)
+        not_got.refreshed = datetime.now(timezone.utc)
+        client = mock.Mock()
+        client.container_groups.list_by_resource_group.return_value = [
+            group("failed", "Failed"),
+            group("creating", "Creating"),
+            group("running", "Succeeded"),
+            group("not-got", "Succeeded"),
+        ]
+        client.container_groups.get.side_effect = lambda _, name: group(name, "Succeeded", "Running")
+        with mock.patch("job_handler_plugins.azure_container_instances._get_aci_client", return_value=client):
+            statuses = AzureJobHandler.refresh([failed, creating, running, not_got])
+
+        assert statuses == {
+            failed.job_uid: JobStatus.FAILED,
+            creating.job_uid: JobStatus.STARTING,
+            running.job_uid: JobStatus.RUNNING,
+        }
+        client.container_groups.get.assert_called_once_with(mock.ANY, "running")
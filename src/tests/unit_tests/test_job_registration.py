@@ -0,0 +1,98 @@
+import json
+import unittest
+from unittest import mock
+from uuid import UUID
+
+from config import config
+from domain_classes.progress import Progress
+from services.job_handler_interface import JobHandlerInterface, JobStatus
+from services.job_handler_registry import job_handler_registry
+from services.job_service import (
+    _get_job,
+    register_job,
+    scheduler,
+    update_progress_from_uid,
+)
+from services.job_store import get_job_store
+
+
+class _FastJobHandler(JobHandlerInterface):
+    def start(self) -> str:
+        self.job.set_job_status(JobStatus.RUNNING)
+        return "started"
+
+
+class _ReportingJobHandler(JobHandlerInterface):
+    def start(self) -> str:
+        # The job reports its progress before start() returns
+        progress = Progress(status=JobStatus.COMPLETED, logs="done", percentage=100)
+        update_progress_from_uid(self.job.job_uid, progress, overwrite_log=False, external=True)
+        self.job.state = {"container": "job-1"}
+        return "started"
+
+
+class TestJobRegistration(unittest.TestCase):
+    def setUp(self):
+        get_job_store().flush()
+
+    @mock.patch("services.job_service.get_personal_access_token", return_value="token")
+    @mock.patch("services.job_service.get_document")
+    @mock.patch("services.job_service.update_document")
+    def test_registration_does_not_overwrite_a_job_that_starts_right_away(
+        self, update_document, get_document, get_personal_access_token
+    ):
+        get_document.return_value = {"type": config.JOB, "runner": {"type": "Fast"}}
+        written_statuses = []
+        update_document.side_effect = lambda dmss_id, data, *args, **kwargs: written_statuses.append(
+            json.loads(data)["status"]
+        )
+
+        def start_right_away(func, args, next_run_time=None, **kwargs):
+            # The job is started before add_job() returns, like a scheduler thread that is faster than the API
+            assert next_run_time is None
+            func(*args)
+
+        with (
+            mock.patch.object(job_handler_registry, "get", return_value=_FastJobHandler),
+            mock.patch.object(scheduler, "add_job", side_effect=start_right_away),
+        ):
+            job_uid, _, status = register_job("DataSource/$1")
+
+        assert status == JobStatus.STARTING
+        assert written_statuses == [JobStatus.STARTING.value, JobStatus.RUNNING.value]
+        assert _get_job(UUID(job_uid)).status == JobStatus.RUNNING
+
+    @mock.patch("services.job_service.get_personal_access_token", return_value="token")
+    @mock.patch("services.job_service.get_document")
+    @mock.patch("services.job_service.update_document")
+    def test_jobs_are_queued_for_workers(self, update_document, get_document, get_personal_access_token):
+        get_document.return_value = {"type": config.JOB, "runner": {"type": "Fast"}}
+        with (
+            mock.patch.object(config, "JOB_QUEUE", True),
+            mock.patch.object(job_handler_registry, "get", return_value=_FastJobHandler),
+            mock.patch("services.job_service.get_job_queue") as get_job_queue,
+            mock.patch.object(scheduler, "add_job") as add_job,
+        ):
+            job_uid, _, _ = register_job("DataSource/$1")
+        get_job_queue.return_value.enqueue.assert_called_once_with(job_uid)
+        add_job.assert_not_called()
+
+    @mock.patch("services.job_service.get_personal_access_token", return_value="token")
+    @mock.patch("services.job_service.get_document")
+    @mock.patch("services.job_service.update_document")
+    def test_progress_reported_while_a_job_starts_is_kept(
+        self, update_document, get_document, get_personal_access_token
+    ):
+        get_document.return_value = {"type": config.JOB, "runner": {"type": "Reporting"}}
+        with (
+            mock.patch.object(job_handler_registry, "get", return_value=_ReportingJobHandler),
+            mock.patch.object(scheduler, "add_job", side_effect=lambda func, args, **kwargs: func(*args)),
+        ):
+            job_uid, _, _ = register_job("DataSource/$1")
+
+        job = _get_job(UUID(job_uid))
+        assert (job.status, job.percentage) == (JobStatus.COMPLETED, 100)
+        assert job.state == {"container": "job-1"}
+        assert job.dispatched
+        assert job.log[-2:] == ["done", "started"]
+        assert json.loads(update_document.call_args.args[1])["status"] == JobStatus.COMPLETED.value
@@ -0,0 +1,35 @@
+import unittest
+from unittest import mock
+from uuid import uuid4
+
+from config import config
+from services.job_handler_interface import Job, JobStatus
+from services.job_scheduler import runner_executor
+from services.job_service import _start_executor
+
+
+def _job(runner_type: str) -> Job:
+    return Job(
+        type="Job",
+        dmss_id="DataSource/$1",
+        uid=uuid4(),
+        status=JobStatus.STARTING,
+        runner={"type": runner_type},
+    )
+
+
+class TestRunnerExecutors(unittest.TestCase):
+    def test_jobs_are_started_by_the_executor_of_their_runner_type(self):
+        executors = {"dmss://WorkflowDS/Blueprints/Radix": 2}
+        with mock.patch.object(config, "SCHEDULER_RUNNER_EXECUTORS", executors):
+            assert _start_executor(_job("dmss://WorkflowDS/Blueprints/Radix")) == runner_executor(
+                "dmss://WorkflowDS/Blueprints/Radix"
+            )
+            assert _start_executor(_job("dmss://WorkflowDS/Blueprints/Shell")) == "default"
+
+    def test_jobs_are_started_by_the_executor_of_their_handler(self):
+        with mock.patch.object(config, "SCHEDULER_RUNNER_EXECUTORS", {"azure_container_instances": 4}):
+            assert _start_executor(_job("dmss://WorkflowDS/Blueprints/AzureContainer")) == runner_executor(
+                "azure_container_instances"
+            )
+            assert _start_executor(_job("dmss://WorkflowDS/Blueprints/Unknown")) == "default"
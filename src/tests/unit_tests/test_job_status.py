@@ -0,0 +1,90 @@
+import threading
+import unittest
+from typing import Tuple
+from unittest import mock
+from uuid import UUID, uuid4
+
+from restful.exceptions import NotFoundException
+from services.job_handler_interface import Job, JobHandlerInterface, JobStatus
+from services.job_handler_registry import job_handler_registry
+from services.job_service import _set_job, status_job, status_jobs
+
+
+class _PolledJobHandler(JobHandlerInterface):
+    # The uid of each polled job, whether its log was fetched and the name of the polling thread
+    polls: list[Tuple[UUID, bool, str]] = []
+
+    def start(self) -> str:
+        return "started"
+
+    def progress(self) -> Tuple[JobStatus, None | list[str] | str, None | float]:
+        self.polls.append((self.job.job_uid, self.fetch_logs, threading.current_thread().name))
+        if self.job.name == "unreachable":
+            raise ConnectionError("The backend is unreachable")
+        return JobStatus.RUNNING, [*(self.job.log or []), "polled"] if self.fetch_logs else None, 0.5
+
+
+def _externally_tracked_job(log: list[str]) -> Job:
+    job = Job(
+        type="dmss://WorkflowDS/Blueprints/Job",
+        dmss_id="DataSource/$1",
+        uid=uuid4(),
+        status=JobStatus.RUNNING,
+        external_progress=True,
+    )
+    job.append_log(log)
+    _set_job(job)
+    return job
+
+
+def _polled_job(log: list[str], name: str | None = None) -> Job:
+    job = Job(
+        type="dmss://WorkflowDS/Blueprints/Job",
+        dmss_id="DataSource/$1",
+        uid=uuid4(),
+        name=name,
+        status=JobStatus.RUNNING,
+        runner={"type": "Polled"},
+    )
+    job.append_log(log)
+    _set_job(job)
+    return job
+
+
+class TestJobStatus(unittest.TestCase):
+    def test_log_pages(self):
+        job = _externally_tracked_job(["a", "b", "c", "d"])
+        assert status_job(job.job_uid) == (JobStatus.RUNNING, ["a", "b", "c", "d"], None, 0, 4)
+        assert status_job(job.job_uid, offset=1, limit=2) == (JobStatus.RUNNING, ["b", "c"], None, 1, 4)
+        assert status_job(job.job_uid, tail=3) == (JobStatus.RUNNING, ["b", "c", "d"], None, 1, 4)
+        assert status_job(job.job_uid, offset=4) == (JobStatus.RUNNING, [], None, 4, 4)
+
+    def test_bulk_status(self):
+        job = _externally_tracked_job(["a", "b"])
+        missing_uid = uuid4()
+        result = status_jobs([job.job_uid, missing_uid], tail=1)
+        assert result[job.job_uid] == (JobStatus.RUNNING, ["b"], None, 1, 2)
+        assert isinstance(result[missing_uid], NotFoundException)
+
+    @mock.patch("services.job_service.update_document")
+    def test_bulk_status_of_polled_jobs(self, update_document):
+        polled = _polled_job(["a", "b"])
+        unreachable = _polled_job(["a"], name="unreachable")
+        tracked = _externally_tracked_job(["a"])
+        _PolledJobHandler.polls.clear()
+        with (
+            mock.patch.object(job_handler_registry, "get", return_value=_PolledJobHandler),
+            mock.patch("services.job_service.logger"),
+        ):
+            result = status_jobs([polled.job_uid, unreachable.job_uid, tracked.job_uid], tail=1)
+            # One job failing to be polled does not fail the others
+            assert result[polled.job_uid] == (JobStatus.RUNNING, ["polled"], 0.5, 2, 3)
+            assert isinstance(result[unreachable.job_uid], ConnectionError)
+            assert result[tracked.job_uid] == (JobStatus.RUNNING, ["a"], None, 0, 1)
+            # Logs are only fetched by the job handlers when log lines are requested
+            assert status_jobs([polled.job_uid])[polled.job_uid] == (JobStatus.RUNNING, [], 0.5, 3, 3)
+        assert sorted((job_uid, fetch_logs) for job_uid, fetch_logs, _ in _PolledJobHandler.polls) == sorted(
+            [(polled.job_uid, True), (unreachable.job_uid, True), (polled.job_uid, False)]
+        )
+        # The job handlers are polled on the executor shared by all requests
+        assert all(thread.startswith("job-status") for _, _, thread in _PolledJobHandler.polls)
@@ -0,0 +1,142 @@
+import json
+import unittest
+from datetime import datetime, timezone
+
+import redis
+
+from services.job_store import (
+    JOB_STORE_DB,
+    InMemoryJobStore,
+    JobStore,
+    RedisJobStore,
+    get_connection_pool,
+    get_job_store,
+)
+
+
+class JobStoreTests:
+    """Tests that all job store backends must pass."""
+
+    store: JobStore
+
+    def test_record_fields(self):
+        store = self.store
+        store.set_record("record", {"status": '"running"', "percentage": "0.5"})
+        store.set_record("record", {"percentage": "0.7"})
+        assert store.get_record("record") == {"status": b'"running"', "percentage": b"0.7"}
+        assert store.get_record("record", ["status"]) == {"status": b'"running"'}
+        assert store.get_record("missing") is None
+        assert store.get_records(["missing", "record"], ["percentage"]) == [None, {"percentage": b"0.7"}]
+
+    def test_log_is_appended(self):
+        store = self.store
+        store.set_record("record", {"status": '"running"'}, log=["a", "b"])
+        store.set_record("record", {}, log=["c"])
+        assert store.get_record_and_log("record") == ({"status": b'"running"'}, ["a", "b", "c"], 3)
+        assert store.get_record_and_log("record", ["status"], -2, -1) == ({"status": b'"running"'}, ["b", "c"], 3)
+        store.set_record("record", {}, log=["d"], replace_log=True)
+        assert store.get_record_and_log("record", ["status"]) == ({"status": b'"running"'}, ["d"], 1)
+        assert store.delete_record("record") == 2
+
+    def test_compaction(self):
+        store = self.store
+
+        def record(status: str, started: str, ended: str | None = None, schedule: str = "null"):
+            return {
+                "status": json.dumps(status),
+                "started": json.dumps(started),
+                "ended": json.dumps(ended),
+                "schedule": schedule,
+            }
+
+        store.set_record("old-completed", record("completed", "2024-01-01T00:00:00Z", "2024-01-01T01:00:00Z"))
+        store.set_record("old-failed", record("failed", "2024-01-01T00:00:00Z", "2024-01-03T00:00:00Z"))
+        store.set_record("old-running", record("running", "2024-01-01T00:00:00Z"))
+        store.set_record("new-completed", record("completed", "2024-01-04T00:00:00Z", "2024-01-04T01:00:00Z"))
+        store.set_record(
+            "old-scheduled",
+            record("completed", "2024-01-01T00:00:00Z", "2024-01-01T01:00:00Z", '{"cron": "* * * * *"}'),
+        )
+        store.set_scheduled("old-scheduled")
+
+        assert store.compact(ended_before=datetime(2024, 1, 2, tzinfo=timezone.utc).timestamp(), max_records=None) == 1
+        assert store.get_record("old-completed") is None
+        assert store.list_records({"status": "completed"}, 10)[0] == ["new-completed", "old-scheduled"]
+
+        # The oldest finished records are removed first
+        assert store.compact(ended_before=None, max_records=3) == 1
+        assert sorted(store.list_records({}, 10)[0]) == ["new-completed", "old-running", "old-scheduled"]
+
+    def test_listings_with_several_indexes_are_up_to_date(self):
+        store = self.store
+
+        def record(status: str, started: str):
+            return {"status": json.dumps(status), "runner": json.dumps({"type": "R"}), "started": json.dumps(started)}
+
+        store.set_record("a", record("running", "2024-01-01T00:00:00Z"))
+        store.set_record("c", record("running", "2024-01-03T00:00:00Z"))
+        assert store.list_records({"status": "running", "runner": "R"}, 10)[0] == ["c", "a"]
+
+        store.set_record("b", record("running", "2024-01-02T00:00:00Z"))
+        store.set_record("a", {"status": json.dumps("completed")})
+        keys, cursor = store.list_records({"status": "running", "runner": "R"}, 1)
+        assert keys == ["c"]
+        assert store.list_records({"status": "running", "runner": "R"}, 1, cursor)[0] == ["b"]
+
+
+class TestRedisJobStore(JobStoreTests, unittest.TestCase):
+    store: RedisJobStore
+
+    def setUp(self):
+        self.store = RedisJobStore(redis.Redis(connection_pool=get_connection_pool(JOB_STORE_DB)))
+        self.store.flush()
+
+    def test_connection_pool_is_shared(self):
+        assert get_connection_pool(JOB_STORE_DB) is get_connection_pool(JOB_STORE_DB)
+        assert get_job_store() is get_job_store()
+        assert self.store.client.connection_pool is get_connection_pool(JOB_STORE_DB)
+
+    def test_scheduled_jobs(self):
+        store = self.store
+        store.set_record("scheduled", {"schedule": '{"cron": "* * * * *"}'})
+        store.set_record("not-scheduled", {"schedule": "null"})
+        assert store.index_records() == 1
+        assert list(store.scan_scheduled()) == ["scheduled"]
+        store.delete_record("scheduled")
+        assert list(store.scan_scheduled()) == []
+
+    def test_legacy_records_are_migrated(self):
+        store = self.store
+        store.client.set("legacy-1", json.dumps({"status": "running", "log": ["a", "b"]}))
+        store.client.set("legacy-2", json.dumps({"status": "completed", "percentage": 1.0}))
+        store.client.hset("legacy-3", mapping={"status": '"failed"', "log": '["c"]'})
+        # Records stored as JSON strings are migrated when read
+        assert store.get_record_and_log("legacy-1") == ({"status": b'"running"'}, ["a", "b"], 2)
+        assert store.migrate_legacy_records() == 2
+        assert store.get_record_and_log("legacy-2") == ({"status": b'"completed"', "percentage": b"1.0"}, [], 0)
+        assert store.get_record_and_log("legacy-3") == ({"status": b'"failed"'}, ["c"], 1)
+        assert store.migrate_legacy_records() == 0
+
+    def test_missing_records_are_pruned_from_indexes(self):
+        store = self.store
+        for key in ("missing", "kept"):
+            store.set_record(
+                key,
+                {
+                    "status": '"completed"',
+                    "runner": '{"type": "test"}',
+                    "started": '"2024-01-01T00:00:00Z"',
+                    "ended": '"2024-01-03T00:00:00Z"',
+                },
+            )
+        # Records removed without updating the indexes are pruned from them when compaction finds them
+        store.client.delete("missing")
+        assert store.compact(ended_before=datetime(2024, 1, 2, tzinfo=timezone.utc).timestamp(), max_records=None) == 0
+        assert store.list_records({}, 10)[0] == ["kept"]
+        assert store.list_records({"status": "completed"}, 10)[0] == ["kept"]
+        assert store.list_records({"runner": "test"}, 10)[0] == ["kept"]
+
+
+class TestInMemoryJobStore(JobStoreTests, unittest.TestCase):
+    def setUp(self):
+        self.store = InMemoryJobStore()
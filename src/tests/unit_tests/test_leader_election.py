@@ -0,0 +1,53 @@
+import time
+import unittest
+from unittest import mock
+
+import redis
+
+from services import job_scheduler
+from services.job_store import SCHEDULER_DB, get_connection_pool
+from services.leader_election import LeaderElection
+
+
+def _election(key: str, lease_seconds: float = 10, on_change=None) -> LeaderElection:
+    return LeaderElection(
+        redis.Redis(connection_pool=get_connection_pool(SCHEDULER_DB)), key, lease_seconds, on_change
+    )
+
+
+class TestLeaderElection(unittest.TestCase):
+    def test_one_process_is_the_leader(self):
+        first, second = _election("test:leader:one"), _election("test:leader:one")
+        assert first.renew()
+        assert not second.renew()
+        assert first.renew()
+        first.resign()
+        assert not first.is_leader
+        assert second.renew()
+        assert not first.renew()
+
+    def test_another_process_takes_over_when_the_lease_expires(self):
+        changes = []
+        first = _election("test:leader:expiry", lease_seconds=0.05, on_change=changes.append)
+        second = _election("test:leader:expiry", lease_seconds=0.05)
+        assert first.renew()
+        time.sleep(0.1)
+        assert not first.is_leader  # Without renewing, before another process takes over
+        assert second.renew()
+        assert not first.renew()
+        assert changes == [True, False]
+
+    def test_leadership_is_lost_when_redis_is_unavailable(self):
+        election = _election("test:leader:unavailable")
+        assert election.renew()
+        with mock.patch.object(election.client, "pipeline", side_effect=redis.ConnectionError("unavailable")):
+            assert not election.renew()
+        assert not election.is_leader
+
+    def test_leader_only_tasks_are_skipped_by_other_processes(self):
+        task = mock.Mock(return_value=1)
+        with mock.patch.object(job_scheduler, "is_scheduler_leader", return_value=False):
+            assert job_scheduler.leader_only(task)() is None
+        with mock.patch.object(job_scheduler, "is_scheduler_leader", return_value=True):
+            assert job_scheduler.leader_only(task)() == 1
+        task.assert_called_once()
@@ -0,0 +1,75 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from restful.exceptions import BadRequestException
+from services.job_handler_interface import Job, JobStatus
+from services.job_service import _set_job, list_jobs
+from services.job_store import get_job_store
+
+_START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _register(minutes: int, status: JobStatus, runner_type: str, dmss_id: str = "DataSource/$1") -> Job:
+    job = Job(
+        type="dmss://WorkflowDS/Blueprints/Job",
+        dmss_id=dmss_id,
+        uid=uuid4(),
+        status=status,
+        runner={"type": runner_type},
+        started=_START + timedelta(minutes=minutes),
+    )
+    _set_job(job)
+    return job
+
+
+def _uids(jobs: list[dict]) -> list[str]:
+    return [job["job_uid"] for job in jobs]
+
+
+class TestListJobs(unittest.TestCase):
+    def setUp(self):
+        get_job_store().flush()
+
+    def test_filters(self):
+        first = _register(1, JobStatus.RUNNING, "Docker")
+        second = _register(2, JobStatus.COMPLETED, "Docker", "OtherDataSource/$2")
+        third = _register(3, JobStatus.RUNNING, "AzureContainer")
+
+        assert _uids(list_jobs()[0]) == [str(third.job_uid), str(second.job_uid), str(first.job_uid)]
+        assert _uids(list_jobs(status=JobStatus.RUNNING)[0]) == [str(third.job_uid), str(first.job_uid)]
+        assert _uids(list_jobs(status=JobStatus.RUNNING, runner_type="Docker")[0]) == [str(first.job_uid)]
+        assert _uids(list_jobs(data_source="OtherDataSource")[0]) == [str(second.job_uid)]
+        assert _uids(list_jobs(started_after=_START + timedelta(minutes=2))[0]) == [
+            str(third.job_uid),
+            str(second.job_uid),
+        ]
+
+    def test_status_index_follows_status(self):
+        job = _register(1, JobStatus.RUNNING, "Docker")
+        job.set_job_status(JobStatus.COMPLETED)
+        _set_job(job, ("status", "started"))
+        assert list_jobs(status=JobStatus.RUNNING)[0] == []
+        assert _uids(list_jobs(status=JobStatus.COMPLETED)[0]) == [str(job.job_uid)]
+        get_job_store().delete_record(str(job.job_uid))
+        assert list_jobs()[0] == []
+        assert list_jobs(status=JobStatus.COMPLETED)[0] == []
+
+    def test_pages(self):
+        # Jobs started at the same time are paged by uid
+        jobs = [_register(minutes, JobStatus.RUNNING, "Docker") for minutes in (1, 2, 2, 2, 3)]
+        uids: list[str] = []
+        cursor = None
+        while True:
+            page, cursor = list_jobs(cursor=cursor, limit=2)
+            uids += _uids(page)
+            if not cursor:
+                break
+        assert sorted(uids) == sorted(str(job.job_uid) for job in jobs)
+        assert len(uids) == len(jobs)
+        assert uids[0] == str(jobs[-1].job_uid)
+        assert uids[-1] == str(jobs[0].job_uid)
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(BadRequestException):
+            list_jobs(cursor="not-a-cursor")
@@ -0,0 +1,33 @@
+import unittest
+from unittest import mock
+from uuid import uuid4
+
+from azure.core.exceptions import ResourceNotFoundError
+
+from job_handler_plugins import omnia_classic_azure_container_instances as omnia_classic
+from services.job_handler_interface import Job, JobStatus
+
+
+class TestOmniaClassicJobHandler(unittest.TestCase):
+    def setUp(self):
+        job = Job(type="Job", dmss_id="DataSource/$1", uid=uuid4(), runner={"name": "Runner"})
+        self.handler = omnia_classic.JobHandler(job, "DataSource")
+        self.deployer, self.aci_client = mock.Mock(), mock.Mock()
+        self.aci_client.containers.list_logs.side_effect = ResourceNotFoundError("not found")
+        patcher = mock.patch.object(omnia_classic, "_get_clients", return_value=(self.deployer, self.aci_client))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_template_is_read_once_and_copied(self):
+        template = omnia_classic._load_template()
+        template["resources"] = []
+        assert omnia_classic._load_template()["resources"]
+        assert omnia_classic._read_template.cache_info().misses == 1
+
+    def test_starting_while_deploying(self):
+        self.deployer.get_state.return_value = ("Running", None)
+        assert self.handler.progress()[0] == JobStatus.STARTING
+
+    def test_failed_deployment(self):
+        self.deployer.get_state.return_value = ("Failed", "Quota exceeded")
+        assert self.handler.progress()[:2] == (JobStatus.FAILED, "Quota exceeded")
@@ -0,0 +1,134 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest import mock
+from uuid import uuid4
+
+from job_handler_plugins import azure_container_instances
+from job_handler_plugins.azure_container_instances.warm_pool import (
+    WARM_POOL_CREATED_TAG,
+    WARM_POOL_OWNER_TAG,
+    WARM_POOL_TAG,
+    WarmPool,
+)
+from services.azure_reaper import get_container_group_reaper
+from services.job_handler_interface import Job, JobStatus
+
+
+def _group(name: str, state: str | None, tags: dict | None = None):
+    # The listing of the container groups does not include their instance view. Getting a group does.
+    instance_view = SimpleNamespace(state=state) if state else None
+    return SimpleNamespace(name=name, provisioning_state="Succeeded", instance_view=instance_view, tags=tags)
+
+
+def _warm_tags(pool: WarmPool, owner: str, created: datetime) -> dict:
+    return {WARM_POOL_TAG: pool.key, WARM_POOL_OWNER_TAG: owner, WARM_POOL_CREATED_TAG: created.isoformat()}
+
+
+class TestWarmPool(unittest.TestCase):
+    def test_groups_are_claimed_once_they_are_ready(self):
+        pool = WarmPool("registry/image:1", cpu=1, memory=2, size=2, idle_seconds=60)
+        pool.add("warm-1")
+        pool.add("warm-2")
+        assert pool.missing() == 0
+        assert pool.claim() is None
+        pool.ready("warm-1")
+        assert pool.claim() == "warm-1"
+        assert pool.claim() is None
+        assert pool.missing() == 1
+
+    def test_expired_groups_are_not_claimed(self):
+        pool = WarmPool("registry/image:1", cpu=1, memory=2, size=1, idle_seconds=0)
+        pool.add("warm-1")
+        pool.ready("warm-1")
+        assert pool.claim() is None
+
+    def test_refill(self):
+        pool = WarmPool("registry/image:1", cpu=1, memory=2, size=3, idle_seconds=60)
+        for name in ("warm-claimed", "warm-ready", "warm-failed", "warm-new"):
+            pool.add(name)
+        pool.ready("warm-claimed")
+        assert pool.claim() == "warm-claimed"
+        now = datetime.now(timezone.utc)
+        states = {"warm-ready": "Running", "warm-failed": "Failed"}
+        client = mock.Mock()
+        client.container_groups.list_by_resource_group.return_value = [
+            _group(name, None, _warm_tags(pool, owner, created))
+            for name, owner, created in [
+                ("warm-claimed", "me", now),
+                ("warm-ready", "me", now),
+                ("warm-failed", "me", now),
+                ("warm-expired", "me", now),
+                ("warm-other", "other", now),
+                ("warm-old", "other", now - timedelta(days=1)),
+            ]
+        ] + [_group("job-1", None)]
+        client.container_groups.get.side_effect = lambda _, name: _group(name, states[name])
+        with (
+            mock.patch.object(azure_container_instances, "_warm_pools", {pool.key: pool}),
+            mock.patch.object(azure_container_instances, "_get_aci_client", return_value=client),
+            mock.patch.object(azure_container_instances, "_warm_pool_owner", return_value="me"),
+            mock.patch.object(azure_container_instances, "starts_jobs", return_value=True),
+        ):
+            azure_container_instances.refill_warm_pools()
+        get_container_group_reaper().reap()
+
+        assert pool.idle() == ["warm-ready"]
+        assert pool.claimed() == ["warm-claimed"]
+        deleted = sorted(call.args[1] for call in client.container_groups.begin_delete.call_args_list)
+        assert deleted == ["warm-expired", "warm-failed", "warm-old"]
+        assert client.container_groups.begin_create_or_update.call_count == 1
+        tags = client.container_groups.begin_create_or_update.call_args.args[2].tags
+        assert (tags[WARM_POOL_TAG], tags[WARM_POOL_OWNER_TAG]) == (pool.key, "me")
+        assert pool.missing() == 0
+
+    def test_pools_are_only_filled_by_processes_that_start_jobs(self):
+        pool = WarmPool("registry/image:1", cpu=1, memory=2, size=1, idle_seconds=60)
+        client = mock.Mock()
+        with (
+            mock.patch.object(azure_container_instances, "_warm_pools", {pool.key: pool}),
+            mock.patch.object(azure_container_instances, "_get_aci_client", return_value=client),
+            mock.patch.object(azure_container_instances, "starts_jobs", return_value=False),
+        ):
+            azure_container_instances.refill_warm_pools()
+        client.container_groups.begin_create_or_update.assert_not_called()
+        assert pool.missing() == 1
+
+
+class TestWarmStart(unittest.TestCase):
+    def test_jobs_started_in_a_warm_group_are_tracked_by_their_container(self):
+        pool = WarmPool("registry/image:1", cpu=2, memory=2, size=1, idle_seconds=60)
+        pool.add("warm-1")
+        pool.ready("warm-1")
+        runner = {"name": "job_1", "image": {"registryName": "registry", "imageName": "image", "version": "1"}}
+        job = Job(type="Job", dmss_id="DataSource/$1", uid=uuid4(), status=JobStatus.STARTING, runner=runner)
+        client = mock.Mock()
+        with mock.patch.object(azure_container_instances, "_warm_pools", {pool.key: pool}):
+            handler = azure_container_instances.JobHandler(job, "DataSource")
+            handler._aci_client = client
+            handler.start()
+
+        name, group = client.container_groups.begin_create_or_update.call_args.args[1:3]
+        assert name == "warm-1"
+        assert group.containers[0].name == "job-1"
+        assert job.state["container_group"] == "warm-1"
+        assert job.state["container"] == "job-1"
+
+        # A job handler created later for the job gets the log of the job's container in the warm group
+        job.status = JobStatus.RUNNING
+        handler = azure_container_instances.JobHandler(job, "DataSource")
+        handler._aci_client = client
+        client.containers.list_logs.return_value = SimpleNamespace(content="line 1")
+        assert handler._fetch_log() == ["line 1"]
+        client.containers.list_logs.assert_called_once_with(mock.ANY, "warm-1", "job-1", tail=None)
+
+    def test_reused_handlers_use_the_containers_of_the_latest_job(self):
+        job = Job(
+            type="Job", dmss_id="DataSource/$1", uid=uuid4(), status=JobStatus.STARTING, runner={"name": "job_1"}
+        )
+        handler = azure_container_instances.JobHandler(job, "DataSource")
+        assert (handler.azure_valid_container_name, handler.container_name) == ("job-1", "job-1")
+
+        # The job was started in a warm container group by another process
+        handler.job = job.model_copy(update={"state": {"container_group": "warm-1", "container": "job-1"}})
+        assert (handler.azure_valid_container_name, handler.container_name) == ("warm-1", "job-1")
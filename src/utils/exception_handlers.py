@@ -4,12 +4,12 @@ from starlette import status
 from starlette.requests import Request
 from starlette.responses import JSONResponse
 
-from job_handler_plugins.azure_container_instances import (
+from restful.responses import ErrorResponse
+from services.azure_errors import (
     AzureHandlerAuthError,
     AzureHandlerConfigError,
     AzureHandlerProvisionError,
 )
-from restful.responses import ErrorResponse
 
 
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
@@ -0,0 +1,106 @@
+import os
+import signal
+import socket
+import threading
+
+from config import config
+from restful.exceptions import NotFoundException
+from services.job_handler_registry import job_handler_registry
+from services.job_queue import JobQueue, QueuedJob, get_job_queue
+from services.job_scheduler import run_as_worker
+from services.job_service import fail_queued_job, run_queued_job
+from utils.logging import logger
+
+
+def start(queue: JobQueue, queued: QueuedJob, consumer: str) -> None:
+    """Start a job from the queue. It is retried if starting it fails, and failed once it has used all its attempts.
+    A job abandoned by a worker that stopped while starting it is failed as well, if that was its last attempt.
+
+    While the job is starting, it is kept by the worker, so it is not taken over by another worker however long
+    starting it takes.
+    """
+    if queued.abandoned:
+        _fail(queued, f"Gave up starting the job after {queued.attempt} attempts. The worker starting it stopped")
+        queue.done(queued)
+        return
+    started = threading.Event()
+    threading.Thread(target=_keep, args=(queue, queued, consumer, started), daemon=True).start()
+    try:
+        run_queued_job(queued.job_uid, retried=queued.attempt > 1)
+    except NotFoundException:
+        logger.warning(f"Job '{queued.job_uid}' was removed before it was started")
+    except Exception as error:
+        logger.error(f"Failed to start job '{queued.job_uid}' (attempt {queued.attempt}): {error}")
+        if not queue.retry(queued):
+            _fail(queued, f"Gave up starting the job after {queued.attempt} attempts. The last one failed: {error}")
+        return
+    finally:
+        started.set()
+    queue.done(queued)
+
+
+def _keep(queue: JobQueue, queued: QueuedJob, consumer: str, started: threading.Event) -> None:
+    while not started.wait(config.JOB_QUEUE_CLAIM_IDLE_SECONDS / 3):
+        try:
+            queue.keep(queued, consumer)
+        except Exception as error:
+            logger.warning(f"Failed to keep job '{queued.job_uid}' while it is starting: {error}")
+
+
+def _fail(queued: QueuedJob, message: str) -> None:
+    try:
+        fail_queued_job(queued.job_uid, message)
+    except Exception as error:  # The job is left starting
+        logger.error(f"Failed to mark job '{queued.job_uid}' as failed: {error}")
+
+
+def consume(queue: JobQueue, consumer: str, stopping: threading.Event) -> None:
+    """Start the jobs in the queue, one at a time, until 'stopping' is set."""
+    while not stopping.is_set():
+        try:
+            for queued in queue.read(consumer):
+                start(queue, queued, consumer)
+        except Exception as error:
+            # Jobs that were not acknowledged are retried by a worker once they have been idle for a while
+            logger.warning(f"Failed to use the job queue: {error}")
+            stopping.wait(5)
+    queue.leave(consumer)
+
+
+def run():
+    """Start the jobs in the job queue, with JOB_QUEUE_WORKER_THREADS threads, until the process is stopped.
+
+    Run as many worker processes as needed. Each job is started by one of them.
+    """
+    queue = get_job_queue()
+    # The API processes run the scheduled jobs, and add them to the queue. Workers only start them.
+    run_as_worker()
+    job_handler_registry.load()
+    if config.AZURE_WARM_POOL:
+        # The workers keep the warm pools of Azure container groups filled, as they start the jobs
+        from job_handler_plugins.azure_container_instances import (
+            schedule_container_group_maintenance,
+        )
+
+        schedule_container_group_maintenance()
+    stopping = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stopping.set())
+    signal.signal(signal.SIGINT, lambda *_: stopping.set())
+
+    name = f"{socket.gethostname()}-{os.getpid()}"
+    threads = [
+        threading.Thread(target=consume, args=(queue, f"{name}-{index}", stopping), name=f"job-worker-{index}")
+        for index in range(config.JOB_QUEUE_WORKER_THREADS)
+    ]
+    for thread in threads:
+        thread.start()
+    logger.info(f"Job worker '{name}' started with {len(threads)} threads")
+    while not stopping.wait(1):
+        pass
+    logger.info(f"Job worker '{name}' is stopping, after the jobs it is starting")
+    for thread in threads:
+        thread.join()
+
+
+if __name__ == "__main__":
+    run()